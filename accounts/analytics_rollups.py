@@ -0,0 +1,205 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .hll import HyperLogLog, merge_sketches
+from .models import (
+    AnalyticsDailyRollup,
+    AnalyticsEvent,
+    AnalyticsHourlyRollup,
+    AnalyticsRollupCursor,
+    AnalyticsSearchRollup,
+    AnalyticsSessionRollup,
+)
+
+SEARCH_EVENT_NAMES = ["search_performed", "notice_search"]
+ALL_EVENTS = "*"
+CURSOR_PK = 1
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _increment(model, count_field: str, lookup: dict, amount: int) -> None:
+    if not model.objects.filter(**lookup).update(**{count_field: F(count_field) + amount}):
+        model.objects.create(**lookup, **{count_field: amount})
+
+
+def _fold_sketch(model, lookup: dict, amount: int, session_ids: set[str]) -> None:
+    # Callers hold the cursor lock, so the read-modify-write of the sketch cannot race another fold.
+    row = model.objects.filter(**lookup).only("pk", "session_sketch").first()
+    if row is None:
+        model.objects.create(**lookup, event_count=amount, session_sketch=HyperLogLog().update(session_ids).to_bytes())
+        return
+    sketch = HyperLogLog.from_bytes(row.session_sketch).update(session_ids)
+    model.objects.filter(pk=row.pk).update(event_count=F("event_count") + amount, session_sketch=sketch.to_bytes())
+
+
+def _fold_next_batch(batch_size: int, cutoff: datetime) -> int:
+    """
+    Folds the next `batch_size` events after the cursor into the rollup tables.
+    Events newer than `cutoff` are left for a later run so rows committed out of id order are not skipped.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Write first: takes the cursor row lock (SQLite: the database write lock) so concurrent
+        # refreshers serialize instead of folding the same events twice.
+        AnalyticsRollupCursor.objects.filter(pk=CURSOR_PK).update(refreshed_at=now)
+        cursor = AnalyticsRollupCursor.objects.get(pk=CURSOR_PK)
+        events = list(
+            AnalyticsEvent.objects.filter(id__gt=cursor.last_event_id)
+            .order_by("id")
+            .values("id", "created_at", "event_name", "session_id", "metadata__query")[:batch_size]
+        )
+
+        folded = []
+        for event in events:
+            if event["created_at"] >= cutoff:
+                break
+            folded.append(event)
+        if not folded:
+            return 0
+
+        event_counts: Counter = Counter()
+        search_counts: Counter = Counter()
+        sessions = set()
+        bucket_sessions: dict[tuple, set[str]] = defaultdict(set)
+        for event in folded:
+            bucket = hour_bucket(event["created_at"])
+            event_counts[(bucket, event["event_name"])] += 1
+            event_counts[(bucket, ALL_EVENTS)] += 1
+            bucket_sessions[(bucket, event["event_name"])].add(event["session_id"])
+            bucket_sessions[(bucket, ALL_EVENTS)].add(event["session_id"])
+            sessions.add((bucket, event["event_name"], event["session_id"]))
+            if event["event_name"] in SEARCH_EVENT_NAMES:
+                query = event["metadata__query"]
+                search_counts[(bucket, str(query)[:255] if query else "")] += 1
+
+        day_counts: Counter = Counter()
+        day_sessions: dict[tuple, set[str]] = defaultdict(set)
+        for (bucket, event_name), amount in event_counts.items():
+            _fold_sketch(
+                AnalyticsHourlyRollup,
+                {"bucket_start": bucket, "event_name": event_name},
+                amount,
+                bucket_sessions[(bucket, event_name)],
+            )
+            day_counts[(bucket.date(), event_name)] += amount
+            day_sessions[(bucket.date(), event_name)] |= bucket_sessions[(bucket, event_name)]
+        for (day, event_name), amount in day_counts.items():
+            _fold_sketch(AnalyticsDailyRollup, {"day": day, "event_name": event_name}, amount, day_sessions[(day, event_name)])
+        for (bucket, query), amount in search_counts.items():
+            _increment(AnalyticsSearchRollup, "search_count", {"bucket_start": bucket, "query": query}, amount)
+        AnalyticsSessionRollup.objects.bulk_create(
+            [
+                AnalyticsSessionRollup(bucket_start=bucket, event_name=event_name, session_id=session_id)
+                for bucket, event_name, session_id in sessions
+            ],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+        AnalyticsRollupCursor.objects.filter(pk=CURSOR_PK).update(last_event_id=folded[-1]["id"])
+    return len(folded)
+
+
+def refresh_analytics_rollups(max_batches: int = 0, batch_size: int | None = None) -> int:
+    """
+    Incrementally folds new AnalyticsEvent rows into the hourly rollups and returns how many were folded.
+    `max_batches=0` drains everything older than ANALYTICS_ROLLUP_LAG_SEC.
+    """
+    batch_size = max(int(batch_size or settings.ANALYTICS_ROLLUP_BATCH_SIZE), 1)
+    cutoff = timezone.now() - timedelta(seconds=max(int(settings.ANALYTICS_ROLLUP_LAG_SEC), 0))
+    AnalyticsRollupCursor.objects.get_or_create(pk=CURSOR_PK)
+
+    folded = 0
+    batches = 0
+    while True:
+        count = _fold_next_batch(batch_size, cutoff)
+        folded += count
+        batches += 1
+        if count < batch_size or (max_batches and batches >= max_batches):
+            return folded
+
+
+def rebuild_analytics_rollups(batch_size: int | None = None) -> int:
+    """Drops every rollup row and re-folds the full AnalyticsEvent history."""
+    with transaction.atomic():
+        AnalyticsRollupCursor.objects.update_or_create(pk=CURSOR_PK, defaults={"last_event_id": 0})
+        AnalyticsHourlyRollup.objects.all().delete()
+        AnalyticsDailyRollup.objects.all().delete()
+        AnalyticsSessionRollup.objects.all().delete()
+        AnalyticsSearchRollup.objects.all().delete()
+    return refresh_analytics_rollups(batch_size=batch_size)
+
+
+def _bucket_filter(start: datetime | None) -> dict:
+    # Windows are hour-aligned: the bucket containing `start` is counted in full.
+    return {} if start is None else {"bucket_start__gte": hour_bucket(start)}
+
+
+def rollup_event_count(event_names: list[str], start: datetime | None = None) -> int:
+    total = AnalyticsHourlyRollup.objects.filter(event_name__in=event_names, **_bucket_filter(start)).aggregate(
+        total=Sum("event_count")
+    )["total"]
+    return total or 0
+
+
+def _window_sketches(event_names: list[str], start: datetime | None) -> list:
+    """
+    Sketches covering [start, now): hourly rows up to the next UTC midnight, daily rows after it.
+    """
+    if start is None:
+        return list(
+            AnalyticsDailyRollup.objects.filter(event_name__in=event_names).values_list("session_sketch", flat=True)
+        )
+    first_bucket = hour_bucket(start)
+    first_full_day = first_bucket.date()
+    if first_bucket.hour:
+        first_full_day += timedelta(days=1)
+    day_start = datetime.combine(first_full_day, datetime.min.time(), tzinfo=dt_timezone.utc)
+    hourly = AnalyticsHourlyRollup.objects.filter(
+        event_name__in=event_names,
+        bucket_start__gte=first_bucket,
+        bucket_start__lt=day_start,
+    ).values_list("session_sketch", flat=True)
+    daily = AnalyticsDailyRollup.objects.filter(event_name__in=event_names, day__gte=first_full_day).values_list(
+        "session_sketch", flat=True
+    )
+    return list(hourly) + list(daily)
+
+
+def rollup_distinct_sessions(
+    event_names: list[str] | None = None,
+    start: datetime | None = None,
+    exact: bool | None = None,
+) -> int:
+    """
+    Distinct sessions for `event_names` (all events when None) since `start` (all time when None).
+    Approximate (HyperLogLog, ~1.6% error) unless `exact` or ANALYTICS_EXACT_DISTINCT is set.
+    """
+    if exact is None:
+        exact = settings.ANALYTICS_EXACT_DISTINCT
+    if exact:
+        queryset = AnalyticsSessionRollup.objects.filter(**_bucket_filter(start))
+        if event_names is not None:
+            queryset = queryset.filter(event_name__in=event_names)
+        return queryset.values("session_id").distinct().count()
+    return merge_sketches(_window_sketches(event_names or [ALL_EVENTS], start)).count()
+
+
+def rollup_top_search_query(start: datetime | None = None) -> tuple[str, int]:
+    top = (
+        AnalyticsSearchRollup.objects.filter(**_bucket_filter(start))
+        .values("query")
+        .annotate(total=Sum("search_count"))
+        .order_by("-total", "query")
+        .first()
+    )
+    if not top:
+        return "", 0
+    return top["query"], top["total"] or 0
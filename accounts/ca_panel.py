@@ -0,0 +1,31 @@
+from .models import CAPanelProfile, User
+
+
+def eligible_ca_users():
+    return User.objects.filter(user_type="ca", is_verified_ca=True).exclude(email="")
+
+
+def sync_ca_panel_profiles(user_ids=None) -> int:
+    """
+    Creates the missing panel profiles for verified CA users in one SELECT and one INSERT.
+
+    Existing profiles are never modified. A profile that already uses a CA's email (for example one
+    an admin created by hand) is left alone by `ignore_conflicts`. Returns the number of profiles
+    attempted.
+    """
+    users = eligible_ca_users().filter(ca_panel_profile__isnull=True)
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    profiles = [
+        CAPanelProfile(
+            user=user,
+            display_name=f"{user.first_name} {user.last_name}".strip() or user.email.split("@")[0],
+            email=user.email,
+            phone_number=user.phone_number or "",
+            is_active=True,
+        )
+        for user in users.only("id", "email", "first_name", "last_name", "phone_number")
+    ]
+    if profiles:
+        CAPanelProfile.objects.bulk_create(profiles, ignore_conflicts=True)
+    return len(profiles)
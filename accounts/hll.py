@@ -0,0 +1,83 @@
+"""
+Minimal HyperLogLog sketch for approximate distinct-session counts.
+
+Registers are one byte each and are stored zlib-compressed, so sparse hourly sketches take a few
+dozen bytes. Sketches with the same precision merge by register-wise max, which lets any window
+be answered by merging its bucket sketches.
+"""
+
+import hashlib
+import math
+import zlib
+from typing import Iterable
+
+PRECISION = 12
+REGISTER_COUNT = 1 << PRECISION
+_HASH_BITS = 64
+_RANK_BITS = _HASH_BITS - PRECISION
+_HIGH_BITS = int.from_bytes(b"\x80" * REGISTER_COUNT, "big")
+_ALL_BITS = (1 << (8 * REGISTER_COUNT)) - 1
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """HyperLogLog with 2**PRECISION one-byte registers (~1.6% standard error)."""
+
+    __slots__ = ("registers",)
+
+    def __init__(self, registers: bytes | bytearray | None = None):
+        if registers is not None and len(registers) != REGISTER_COUNT:
+            raise ValueError(f"Expected {REGISTER_COUNT} registers, got {len(registers)}.")
+        self.registers = bytearray(registers) if registers is not None else bytearray(REGISTER_COUNT)
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview | None) -> "HyperLogLog":
+        if not data:
+            return cls()
+        return cls(zlib.decompress(bytes(data)))
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(bytes(self.registers), 6)
+
+    def add(self, value: str) -> None:
+        hashed = _hash64(value)
+        index = hashed >> _RANK_BITS
+        remainder = hashed & ((1 << _RANK_BITS) - 1)
+        rank = _RANK_BITS - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """In-place register-wise max, computed on whole-sketch integers (SWAR) instead of per register."""
+        a = int.from_bytes(self.registers, "big")
+        b = int.from_bytes(other.registers, "big")
+        # Registers never exceed 0x7F, so the per-byte high bit of (a | 0x80) - b flags a >= b.
+        a_wins = ((((a | _HIGH_BITS) - b) & _HIGH_BITS) >> 7) * 0xFF
+        merged = (a & a_wins) | (b & (a_wins ^ _ALL_BITS))
+        self.registers = bytearray(merged.to_bytes(REGISTER_COUNT, "big"))
+        return self
+
+    def count(self) -> int:
+        m = REGISTER_COUNT
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def merge_sketches(blobs: Iterable[bytes | memoryview | None]) -> HyperLogLog:
+    merged = HyperLogLog()
+    for blob in blobs:
+        if blob:
+            merged.merge(HyperLogLog.from_bytes(blob))
+    return merged
@@ -0,0 +1,64 @@
+import os
+import socket
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from accounts.payment_webhooks import apply_webhook_inbox_row, claim_webhook_inbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply payment webhooks stored in the inbox (PAYMENT_WEBHOOK_ASYNC_ENABLED). "
+        "Several appliers can run at once; each claims its own batch with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PAYMENT_WEBHOOK_BATCH_SIZE,
+            help="Inbox rows claimed per batch.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.PAYMENT_WEBHOOK_POLL_SEC,
+            help="Seconds to wait before polling an empty inbox again.",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain the current inbox and exit.")
+        parser.add_argument("--max-batches", type=int, default=0, help="Exit after this many batches.")
+
+    def handle(self, *args, **options):
+        batch_size = max(int(options["batch_size"]), 1)
+        poll_interval = max(float(options["poll_interval"]), 0.1)
+        max_batches = max(int(options["max_batches"]), 0)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        outcomes: Counter = Counter()
+        batches = 0
+        try:
+            while not max_batches or batches < max_batches:
+                claimed_ids = claim_webhook_inbox(worker_id, batch_size)
+                if not claimed_ids:
+                    if options["once"]:
+                        break
+                    close_old_connections()
+                    time.sleep(poll_interval)
+                    continue
+                batches += 1
+                # One row at a time in inbox order, so events for an order apply in arrival order.
+                for inbox_id in claimed_ids:
+                    outcomes[apply_webhook_inbox_row(inbox_id)] += 1
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Stopping payment webhook applier."))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Applied {sum(outcomes.values())} payment webhook(s) in {batches} batch(es): "
+                + ", ".join(f"{outcome}={count}" for outcome, count in sorted(outcomes.items()))
+            )
+        )
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.payment_ops import audit_parser_credits, unsettled_parser_credit_reservations
+
+
+class Command(BaseCommand):
+    help = "Compare parser credit balances with the credit ledger and optionally rebuild them from it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Reset each mismatched balance to its ledger sum.",
+        )
+        parser.add_argument(
+            "--unsettled-hours",
+            type=int,
+            default=24,
+            help="Report parser upload reservations older than this that were never consumed or refunded.",
+        )
+
+    def handle(self, *args, **options):
+        unsettled = list(unsettled_parser_credit_reservations(timedelta(hours=max(int(options["unsettled_hours"]), 0))))
+        for entry in unsettled:
+            self.stdout.write(
+                self.style.WARNING(f"user {entry.user_id}: reservation {entry.reference} from {entry.created_at:%Y-%m-%d %H:%M} is unsettled")
+            )
+
+        mismatches = audit_parser_credits(fix=options["fix"])
+        for mismatch in mismatches:
+            self.stdout.write(
+                f"user {mismatch['user_id']}: balance {mismatch['balance']} != ledger {mismatch['ledger']}"
+            )
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("Parser credit balances match the ledger."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(mismatches)} balance(s) from the ledger."))
+        else:
+            raise CommandError(f"{len(mismatches)} parser credit balance(s) differ from the ledger; rerun with --fix.")
@@ -1,14 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 
-from accounts.models import PaymentOrder
-from accounts.payment_ops import grant_parser_credits_once, is_order_credit_eligible
+from accounts.models import PaymentOrder, PaymentTransaction
+from accounts.payment_ops import grant_parser_credits_once, is_order_credit_eligible, is_success_status
+from accounts.payment_providers import ProviderRateLimiter, fetch_order_status, provider_credentials_ready
 
 
 class Command(BaseCommand):
-    help = "Reconcile paid/successful payment orders that are missing credit grants."
+    help = (
+        "Reconcile paid/successful payment orders that are missing credit grants. "
+        "Stale payment_pending orders are also checked against the provider's order status API."
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -28,11 +35,42 @@ class Command(BaseCommand):
             action="store_true",
             help="Preview reconciliation candidates without applying credit grants.",
         )
+        parser.add_argument(
+            "--stale-minutes",
+            type=int,
+            default=settings.PAYMENT_RECONCILE_STALE_MINUTES,
+            help="Ask the provider about payment_pending orders not updated for this many minutes.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.PAYMENT_RECONCILE_CONCURRENCY,
+            help="Provider order lookups run concurrently.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=settings.PAYMENT_RECONCILE_RATE_PER_SEC,
+            help="Maximum provider order lookups started per second, per provider (0 = unlimited).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PAYMENT_RECONCILE_BATCH_SIZE,
+            help="Orders loaded per chunk and credit grants committed per transaction.",
+        )
+        parser.add_argument(
+            "--skip-provider-check",
+            action="store_true",
+            help="Only reconcile from local order and transaction state.",
+        )
 
     def handle(self, *args, **options):
         hours = max(1, int(options["hours"]))
         order_id = (options["order_id"] or "").strip()
         dry_run = bool(options["dry_run"])
+        batch_size = max(int(options["batch_size"]), 1)
+        stale_before = timezone.now() - timedelta(minutes=max(int(options["stale_minutes"]), 0))
 
         queryset = PaymentOrder.objects.select_related("user", "plan").prefetch_related("transactions")
         if order_id:
@@ -43,33 +81,96 @@ class Command(BaseCommand):
         queryset = queryset.order_by("-created_at")
 
         scanned = 0
-        eligible = 0
-        granted = 0
         skipped = 0
+        # (order, provider lookup result or None when local state already proves payment)
+        to_grant: list[tuple[PaymentOrder, dict | None]] = []
+        stale_pending: list[PaymentOrder] = []
 
-        for payment_order in queryset:
+        for payment_order in queryset.iterator(chunk_size=batch_size):
             scanned += 1
-            if not is_order_credit_eligible(payment_order):
-                skipped += 1
-                continue
-
-            eligible += 1
-            if dry_run:
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"[DRY-RUN] eligible order={payment_order.order_id} status={payment_order.status}"
-                    )
-                )
-                continue
-
-            changed = grant_parser_credits_once(payment_order)
-            if changed:
-                granted += 1
-                self.stdout.write(self.style.SUCCESS(f"Granted credits for {payment_order.order_id}"))
+            if is_order_credit_eligible(payment_order):
+                to_grant.append((payment_order, None))
+            elif (
+                not options["skip_provider_check"]
+                and payment_order.status == "payment_pending"
+                and not payment_order.credit_granted_at
+                and payment_order.provider_order_id
+                and payment_order.updated_at <= stale_before
+            ):
+                stale_pending.append(payment_order)
             else:
                 skipped += 1
 
+        checked, lookup_failed, provider_paid, still_pending = self._check_providers(stale_pending, options)
+        to_grant.extend(provider_paid)
+        skipped += still_pending
+
+        eligible = len(to_grant)
+        granted = 0
+        if dry_run:
+            for payment_order, result in to_grant:
+                source = f"provider={result['provider_status']}" if result else f"status={payment_order.status}"
+                self.stdout.write(self.style.WARNING(f"[DRY-RUN] eligible order={payment_order.order_id} {source}"))
+        else:
+            for start in range(0, len(to_grant), batch_size):
+                with transaction.atomic():
+                    for payment_order, result in to_grant[start:start + batch_size]:
+                        if result:
+                            self._record_provider_status(payment_order, result)
+                        if grant_parser_credits_once(payment_order):
+                            granted += 1
+                            self.stdout.write(self.style.SUCCESS(f"Granted credits for {payment_order.order_id}"))
+                        else:
+                            skipped += 1
+
         self.stdout.write(self.style.SUCCESS(f"Scanned: {scanned}"))
+        self.stdout.write(self.style.SUCCESS(f"Provider checked: {checked}"))
+        if lookup_failed:
+            self.stdout.write(self.style.ERROR(f"Provider lookup failed: {lookup_failed}"))
         self.stdout.write(self.style.SUCCESS(f"Eligible: {eligible}"))
         self.stdout.write(self.style.SUCCESS(f"Granted: {granted}"))
         self.stdout.write(self.style.SUCCESS(f"Skipped: {skipped}"))
+
+    def _check_providers(self, orders: list[PaymentOrder], options) -> tuple[int, int, list, int]:
+        """Looks up stale pending orders on their provider; returns (checked, failed, paid, not_paid)."""
+        lookups = [order for order in orders if provider_credentials_ready(order.provider)]
+        not_configured = len(orders) - len(lookups)
+        if not_configured:
+            self.stdout.write(self.style.WARNING(f"Provider credentials missing for {not_configured} stale order(s)."))
+        if not lookups:
+            return 0, 0, [], not_configured
+
+        limiter = ProviderRateLimiter(float(options["rate"]))
+
+        def lookup(payment_order: PaymentOrder) -> dict:
+            limiter.wait(payment_order.provider)
+            return fetch_order_status(payment_order.provider, payment_order.provider_order_id)
+
+        workers = min(max(int(options["workers"]), 1), len(lookups))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="payment-reconcile") as pool:
+            results = list(pool.map(lookup, lookups))
+
+        failed = 0
+        paid = []
+        not_paid = not_configured
+        for payment_order, result in zip(lookups, results):
+            if result["outcome"] == "error":
+                failed += 1
+                not_paid += 1
+                self.stdout.write(self.style.ERROR(f"[{payment_order.order_id}] provider lookup failed: {result['error']}"))
+            elif is_success_status(result["provider_status"]):
+                paid.append((payment_order, result))
+            else:
+                not_paid += 1
+        return len(lookups), failed, paid, not_paid
+
+    def _record_provider_status(self, payment_order: PaymentOrder, result: dict) -> None:
+        PaymentTransaction.objects.get_or_create(
+            idempotency_key=f"reconcile:{payment_order.provider}:{payment_order.provider_order_id}:{result['provider_status']}"[:200],
+            defaults={
+                "payment_order": payment_order,
+                "provider_status": result["provider_status"][:60],
+                "payload": {"source": "reconcile_payment_orders", "order": result["payload"]},
+                "processed_at": timezone.now(),
+            },
+        )
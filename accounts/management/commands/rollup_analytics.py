@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from accounts.analytics_rollups import rebuild_analytics_rollups, refresh_analytics_rollups
+
+
+class Command(BaseCommand):
+    help = "Fold new analytics events into the hourly rollup tables used by the admin dashboards."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.ANALYTICS_ROLLUP_BATCH_SIZE,
+            help="Events folded per transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=0,
+            help="Stop after this many batches (default: drain all pending events).",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop all rollup rows and rebuild them from the full event history.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        if options["rebuild"]:
+            folded = rebuild_analytics_rollups(batch_size=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt analytics rollups from {folded} event(s)."))
+            return
+
+        folded = refresh_analytics_rollups(max_batches=max(0, int(options["max_batches"])), batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Folded {folded} new analytics event(s) into rollups."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts.ca_panel import sync_ca_panel_profiles
+
+
+class Command(BaseCommand):
+    help = "Create missing CA panel profiles for verified CA users (covers bulk updates that skip signals)."
+
+    def handle(self, *args, **options):
+        created = sync_ca_panel_profiles()
+        self.stdout.write(self.style.SUCCESS(f"Synced CA panel profiles: {created} missing profile(s) created."))
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.10 on 2026-10-18 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_capanelprofile_cahelprequest_assigned_ca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollupCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalyticsHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('event_name', models.CharField(max_length=64)),
+                ('event_count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-bucket_start', 'event_name'],
+                'unique_together': {('bucket_start', 'event_name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsSearchRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('query', models.CharField(blank=True, max_length=255)),
+                ('search_count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('bucket_start', 'query')},
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsSessionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket_start', models.DateTimeField()),
+                ('event_name', models.CharField(max_length=64)),
+                ('session_id', models.CharField(max_length=64)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event_name', 'bucket_start'], name='accounts_an_event_n_0383ad_idx')],
+                'unique_together': {('bucket_start', 'event_name', 'session_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.10 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+def reset_analytics_rollups(apps, schema_editor):
+    # Rollups folded before sketches existed have no session sketch; drop them and rewind the
+    # cursor so rollup_analytics (or the next dashboard read) re-folds the event history.
+    for model_name in ("AnalyticsHourlyRollup", "AnalyticsSessionRollup", "AnalyticsSearchRollup"):
+        apps.get_model("accounts", model_name).objects.all().delete()
+    apps.get_model("accounts", "AnalyticsRollupCursor").objects.update(last_event_id=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analyticshourlyrollup',
+            name='session_sketch',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.CreateModel(
+            name='AnalyticsDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('event_name', models.CharField(max_length=64)),
+                ('event_count', models.PositiveBigIntegerField(default=0)),
+                ('session_sketch', models.BinaryField(default=b'')),
+            ],
+            options={
+                'ordering': ['-day', 'event_name'],
+                'unique_together': {('day', 'event_name')},
+            },
+        ),
+        migrations.RunPython(reset_analytics_rollups, migrations.RunPython.noop),
+    ]
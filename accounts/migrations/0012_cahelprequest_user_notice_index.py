@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-18 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_analytics_session_sketches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cahelprequest',
+            index=models.Index(fields=['user', 'notice_code', 'created_at'], name='accounts_ca_user_id_1fd5b0_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-18 16:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_opening_balances(apps, schema_editor):
+    UserEntitlement = apps.get_model("accounts", "UserEntitlement")
+    ParserCreditLedgerEntry = apps.get_model("accounts", "ParserCreditLedgerEntry")
+    ParserCreditLedgerEntry.objects.bulk_create(
+        [
+            ParserCreditLedgerEntry(user_id=user_id, kind="opening", amount=credits, reference="ledger introduced")
+            for user_id, credits in UserEntitlement.objects.filter(parser_credits__gt=0).values_list("user_id", "parser_credits")
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_cahelprequest_user_notice_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParserCreditLedgerEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('opening', 'Opening balance'), ('grant', 'Grant'), ('reserve', 'Reserve'), ('consume', 'Consume'), ('refund', 'Refund')], max_length=20)),
+                ('amount', models.IntegerField()),
+                ('reference', models.CharField(blank=True, max_length=120)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('payment_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='credit_entries', to='accounts.paymentorder')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parser_credit_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', 'created_at'], name='accounts_pa_user_id_72aac0_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('kind', 'grant')), fields=('payment_order',), name='unique_credit_grant_per_order')],
+            },
+        ),
+        migrations.RunPython(record_opening_balances, migrations.RunPython.noop),
+    ]
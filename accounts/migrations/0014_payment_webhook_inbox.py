@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-18 16:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_parser_credit_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentWebhookInbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(choices=[('cashfree', 'Cashfree'), ('razorpay', 'Razorpay')], max_length=20)),
+                ('idempotency_key', models.CharField(max_length=200, unique=True)),
+                ('provider_order_id', models.CharField(max_length=120)),
+                ('provider_payment_id', models.CharField(blank=True, max_length=120)),
+                ('provider_status', models.CharField(blank=True, max_length=60)),
+                ('event_name', models.CharField(blank=True, max_length=60)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('claimed_by', models.CharField(blank=True, max_length=120)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('outcome', models.CharField(blank=True, choices=[('applied', 'Applied'), ('duplicate', 'Duplicate'), ('ignored', 'Ignored'), ('failed', 'Failed')], max_length=20)),
+                ('last_error', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('processed_at__isnull', True)), fields=['id'], name='payment_webhook_pending_idx')],
+            },
+        ),
+    ]
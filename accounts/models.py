@@ -144,6 +144,8 @@ class CAHelpRequest(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        # Serves the latest-request-per-notice lookup behind saved notices.
+        indexes = [models.Index(fields=["user", "notice_code", "created_at"])]
 
     def __str__(self):
         return f"{self.email} - {self.notice_code or 'general'} ({self.status})"
@@ -295,6 +297,80 @@ class ExperimentExposure(models.Model):
         return f"{self.experiment_key}:{self.variant}"
 
 
+class AnalyticsHourlyRollup(models.Model):
+    """
+    Event count and HyperLogLog session sketch per hour bucket and event name ("*" = all events),
+    maintained from AnalyticsEvent by analytics_rollups.
+    """
+
+    bucket_start = models.DateTimeField()
+    event_name = models.CharField(max_length=64)
+    event_count = models.PositiveBigIntegerField(default=0)
+    session_sketch = models.BinaryField(default=b"")
+
+    class Meta:
+        ordering = ["-bucket_start", "event_name"]
+        unique_together = ("bucket_start", "event_name")
+
+    def __str__(self):
+        return f"{self.event_name} @ {self.bucket_start:%Y-%m-%d %H:00}: {self.event_count}"
+
+
+class AnalyticsDailyRollup(models.Model):
+    """Per-UTC-day counterpart of AnalyticsHourlyRollup so long windows merge one sketch per day."""
+
+    day = models.DateField()
+    event_name = models.CharField(max_length=64)
+    event_count = models.PositiveBigIntegerField(default=0)
+    session_sketch = models.BinaryField(default=b"")
+
+    class Meta:
+        ordering = ["-day", "event_name"]
+        unique_together = ("day", "event_name")
+
+    def __str__(self):
+        return f"{self.event_name} @ {self.day}: {self.event_count}"
+
+
+class AnalyticsSessionRollup(models.Model):
+    """One row per session seen for an event name within an hour bucket (exact distinct-session source)."""
+
+    bucket_start = models.DateTimeField()
+    event_name = models.CharField(max_length=64)
+    session_id = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ("bucket_start", "event_name", "session_id")
+        indexes = [models.Index(fields=["event_name", "bucket_start"])]
+
+    def __str__(self):
+        return f"{self.session_id} {self.event_name} @ {self.bucket_start:%Y-%m-%d %H:00}"
+
+
+class AnalyticsSearchRollup(models.Model):
+    """Search event count per hour bucket and search query."""
+
+    bucket_start = models.DateTimeField()
+    query = models.CharField(max_length=255, blank=True)
+    search_count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("bucket_start", "query")
+
+    def __str__(self):
+        return f"'{self.query}' @ {self.bucket_start:%Y-%m-%d %H:00}: {self.search_count}"
+
+
+class AnalyticsRollupCursor(models.Model):
+    """Singleton watermark: the last AnalyticsEvent id folded into the rollup tables."""
+
+    last_event_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Analytics rollups through event #{self.last_event_id}"
+
+
 class WeeklyKpiSnapshot(models.Model):
     week_start = models.DateField(unique=True)
     week_end = models.DateField()
@@ -392,6 +468,50 @@ class PaymentTransaction(models.Model):
         return f"{self.idempotency_key}"
 
 
+class PaymentWebhookInbox(models.Model):
+    """
+    Signature-verified provider webhook, stored before it is acknowledged.
+    `apply_payment_webhooks` (or the webhook view itself unless PAYMENT_WEBHOOK_ASYNC_ENABLED)
+    applies it; `outcome` stays blank until then.
+    """
+
+    PROVIDER_CHOICES = (
+        ("cashfree", "Cashfree"),
+        ("razorpay", "Razorpay"),
+    )
+    OUTCOME_CHOICES = (
+        ("applied", "Applied"),
+        ("duplicate", "Duplicate"),
+        ("ignored", "Ignored"),
+        ("failed", "Failed"),
+    )
+
+    provider = models.CharField(max_length=20, choices=PROVIDER_CHOICES)
+    # Same key as the PaymentTransaction the webhook produces, so provider retries collapse here.
+    idempotency_key = models.CharField(max_length=200, unique=True)
+    provider_order_id = models.CharField(max_length=120)
+    provider_payment_id = models.CharField(max_length=120, blank=True)
+    provider_status = models.CharField(max_length=60, blank=True)
+    event_name = models.CharField(max_length=60, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_by = models.CharField(max_length=120, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["id"], condition=models.Q(processed_at__isnull=True), name="payment_webhook_pending_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.provider}:{self.idempotency_key} ({self.outcome or 'pending'})"
+
+
 class UserEntitlement(models.Model):
     user = models.OneToOneField(
         "accounts.User",
@@ -409,3 +529,50 @@ class UserEntitlement(models.Model):
 
     def __str__(self):
         return f"{self.user.email} credits={self.parser_credits}"
+
+
+class ParserCreditLedgerEntry(models.Model):
+    """
+    Append-only history of parser credit movements. `UserEntitlement.parser_credits` always
+    equals the sum of a user's `amount`s; `audit_parser_credits` checks and rebuilds it.
+    """
+
+    KIND_CHOICES = (
+        ("opening", "Opening balance"),
+        ("grant", "Grant"),
+        ("reserve", "Reserve"),
+        ("consume", "Consume"),
+        ("refund", "Refund"),
+    )
+
+    user = models.ForeignKey(
+        "accounts.User",
+        on_delete=models.CASCADE,
+        related_name="parser_credit_entries",
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # Signed: grants and refunds add, reservations subtract, consumptions only close a reservation.
+    amount = models.IntegerField()
+    payment_order = models.ForeignKey(
+        PaymentOrder,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="credit_entries",
+    )
+    reference = models.CharField(max_length=120, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [models.Index(fields=["user", "created_at"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["payment_order"],
+                condition=models.Q(kind="grant"),
+                name="unique_credit_grant_per_order",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.kind} {self.amount:+d}"
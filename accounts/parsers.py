@@ -0,0 +1,35 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONLineError:
+    """Placeholder for an NDJSON line that is not valid JSON, so it can be reported per item."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline-delimited JSON into a list; blank lines are skipped."""
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        items = []
+        for line in stream:
+            try:
+                text = line.decode(encoding).strip()
+            except UnicodeDecodeError as exc:
+                raise ParseError(f"NDJSON body is not valid {encoding}.") from exc
+            if not text:
+                continue
+            try:
+                items.append(json.loads(text))
+            except ValueError as exc:
+                items.append(NDJSONLineError(f"Invalid JSON: {exc.msg}."))
+        return items
@@ -1,11 +1,19 @@
+from datetime import timedelta
+
 from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Sum
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
-from .models import PaymentOrder, UserEntitlement
+from .models import ParserCreditLedgerEntry, PaymentOrder, UserEntitlement
+
+SUCCESS_PROVIDER_STATUSES = ("SUCCESS", "PAID", "COMPLETED", "CAPTURED")
+# Parser uploads reserve and settle their credit under one "parser-upload-<token>" reference.
+PARSER_UPLOAD_REFERENCE_PREFIX = "parser-upload-"
 
 
 def is_success_status(value: str) -> bool:
-    return (value or "").strip().upper() in {"SUCCESS", "PAID", "COMPLETED", "CAPTURED"}
+    return (value or "").strip().upper() in SUCCESS_PROVIDER_STATUSES
 
 
 def is_failure_status(value: str) -> bool:
@@ -16,6 +24,9 @@ def grant_parser_credits_once(payment_order: PaymentOrder) -> bool:
     """
     Grants parser credits once for a paid order.
     Returns True when credits were granted in this call, False when already granted.
+
+    Only the order row is locked (it carries the idempotency flag); the balance moves with a
+    single relative UPDATE, so grants never wait on uploads spending the same entitlement.
     """
     with transaction.atomic():
         locked_order = PaymentOrder.objects.select_for_update().get(pk=payment_order.pk)
@@ -27,22 +38,18 @@ def grant_parser_credits_once(payment_order: PaymentOrder) -> bool:
             locked_order.save(update_fields=["status", "paid_at", "updated_at"])
             return True
 
-        entitlement, _ = UserEntitlement.objects.select_for_update().get_or_create(
-            user=locked_order.user,
-            defaults={
-                "parser_credits": 0,
-                "lifetime_purchased_credits": 0,
-                "lifetime_consumed_credits": 0,
-            },
+        _ensure_entitlement(locked_order.user)
+        UserEntitlement.objects.filter(user_id=locked_order.user_id).update(
+            parser_credits=F("parser_credits") + locked_order.credits,
+            lifetime_purchased_credits=F("lifetime_purchased_credits") + locked_order.credits,
+            updated_at=timezone.now(),
         )
-        entitlement.parser_credits += locked_order.credits
-        entitlement.lifetime_purchased_credits += locked_order.credits
-        entitlement.save(
-            update_fields=[
-                "parser_credits",
-                "lifetime_purchased_credits",
-                "updated_at",
-            ]
+        ParserCreditLedgerEntry.objects.create(
+            user_id=locked_order.user_id,
+            kind="grant",
+            amount=locked_order.credits,
+            payment_order=locked_order,
+            reference=locked_order.order_id,
         )
 
         now = timezone.now()
@@ -58,4 +65,103 @@ def is_order_credit_eligible(payment_order: PaymentOrder) -> bool:
         return False
     if payment_order.status == "paid":
         return True
-    return payment_order.transactions.filter(provider_status__in=["SUCCESS", "PAID", "COMPLETED", "CAPTURED"]).exists()
+    if "transactions" in getattr(payment_order, "_prefetched_objects_cache", {}):
+        # Bulk callers prefetch transactions; answer from them instead of one query per order.
+        return any(row.provider_status in SUCCESS_PROVIDER_STATUSES for row in payment_order.transactions.all())
+    return payment_order.transactions.filter(provider_status__in=SUCCESS_PROVIDER_STATUSES).exists()
+
+
+def _entitlement_defaults() -> dict:
+    return {
+        "parser_credits": 0,
+        "lifetime_purchased_credits": 0,
+        "lifetime_consumed_credits": 0,
+    }
+
+
+def _ensure_entitlement(user) -> None:
+    UserEntitlement.objects.get_or_create(user=user, defaults=_entitlement_defaults())
+
+
+def reserve_parser_credit(user, reference: str = "") -> tuple[bool, int]:
+    """
+    Takes one parser credit from the user's entitlement.
+    Returns (reserved, credits_remaining); nothing is taken when the balance is empty.
+
+    The balance check and decrement are one conditional UPDATE, so concurrent uploads never
+    hold an explicit row lock and can never drive the balance below zero.
+    """
+    with transaction.atomic():
+        reserved = UserEntitlement.objects.filter(user=user, parser_credits__gte=1).update(
+            parser_credits=F("parser_credits") - 1,
+            lifetime_consumed_credits=F("lifetime_consumed_credits") + 1,
+            updated_at=timezone.now(),
+        )
+        if reserved:
+            ParserCreditLedgerEntry.objects.create(user=user, kind="reserve", amount=-1, reference=reference)
+        else:
+            _ensure_entitlement(user)
+        credits_remaining = UserEntitlement.objects.filter(user=user).values_list("parser_credits", flat=True).first()
+        return bool(reserved), credits_remaining or 0
+
+
+def consume_parser_credit(user, reference: str = "") -> None:
+    """Closes a reservation whose upload was charged (parsed, or rejected as not a notice); the balance is unchanged."""
+    ParserCreditLedgerEntry.objects.create(user=user, kind="consume", amount=0, reference=reference)
+
+
+def refund_parser_credit(user, reference: str = "") -> None:
+    """Returns a credit taken by reserve_parser_credit when parsing could not finish."""
+    with transaction.atomic():
+        _ensure_entitlement(user)
+        UserEntitlement.objects.filter(user=user).update(
+            parser_credits=F("parser_credits") + 1,
+            lifetime_consumed_credits=Greatest(F("lifetime_consumed_credits") - 1, 0),
+            updated_at=timezone.now(),
+        )
+        ParserCreditLedgerEntry.objects.create(user=user, kind="refund", amount=1, reference=reference)
+
+
+def audit_parser_credits(fix: bool = False) -> list[dict]:
+    """
+    Compares every entitlement balance with its ledger sum and returns the mismatches.
+    With `fix`, each mismatched balance is reset to its ledger sum.
+    """
+    ledger_sums = dict(
+        ParserCreditLedgerEntry.objects.values("user_id").annotate(total=Sum("amount")).values_list("user_id", "total")
+    )
+    balances = dict(UserEntitlement.objects.values_list("user_id", "parser_credits"))
+    mismatches = []
+    for user_id in sorted(set(ledger_sums) | set(balances)):
+        ledger_total = ledger_sums.get(user_id) or 0
+        balance = balances.get(user_id)
+        if balance == ledger_total or (balance is None and ledger_total == 0):
+            continue
+        mismatches.append({"user_id": user_id, "balance": balance, "ledger": ledger_total})
+        if fix and balance is not None:
+            UserEntitlement.objects.filter(user_id=user_id).update(
+                parser_credits=max(ledger_total, 0),
+                updated_at=timezone.now(),
+            )
+    return mismatches
+
+
+def unsettled_parser_credit_reservations(older_than: timedelta):
+    """
+    Parser upload reservations older than `older_than` that no consume or refund entry with the
+    same reference has closed, i.e. credits taken for uploads that never finished.
+    """
+    settled = ParserCreditLedgerEntry.objects.filter(
+        user_id=OuterRef("user_id"),
+        reference=OuterRef("reference"),
+        kind__in=("consume", "refund"),
+    )
+    return (
+        ParserCreditLedgerEntry.objects.filter(
+            kind="reserve",
+            reference__startswith=PARSER_UPLOAD_REFERENCE_PREFIX,
+            created_at__lt=timezone.now() - older_than,
+        )
+        .exclude(Exists(settled))
+        .order_by("created_at", "id")
+    )
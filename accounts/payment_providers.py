@@ -0,0 +1,96 @@
+"""
+Cashfree / Razorpay order API endpoints and order-status lookups.
+
+`CASHFREE_API_BASE_URL` / `RAZORPAY_API_BASE_URL` override the provider hosts, which lets a local
+stand-in server answer these calls in tests and staging.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+
+from complia_backend import http_client
+
+
+def cashfree_orders_url() -> str:
+    base_url = (getattr(settings, "CASHFREE_API_BASE_URL", "") or "").strip().rstrip("/")
+    if not base_url:
+        env = getattr(settings, "CASHFREE_ENV", "sandbox").strip().lower()
+        base_url = "https://api.cashfree.com/pg" if env == "production" else "https://sandbox.cashfree.com/pg"
+    return f"{base_url}/orders"
+
+
+def cashfree_headers() -> dict:
+    return {
+        "x-client-id": settings.CASHFREE_APP_ID,
+        "x-client-secret": settings.CASHFREE_SECRET_KEY,
+        "x-api-version": "2023-08-01",
+        "content-type": "application/json",
+    }
+
+
+def razorpay_orders_url() -> str:
+    base_url = (getattr(settings, "RAZORPAY_API_BASE_URL", "") or "https://api.razorpay.com/v1").strip().rstrip("/")
+    return f"{base_url}/orders"
+
+
+def provider_credentials_ready(provider: str) -> bool:
+    if provider == "razorpay":
+        return bool(settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET)
+    return bool(settings.CASHFREE_APP_ID and settings.CASHFREE_SECRET_KEY)
+
+
+class ProviderRateLimiter:
+    """Spaces request starts to each provider so they stay under `per_second` requests per second."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start: dict[str, float] = {}
+
+    def wait(self, provider: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start.get(provider, now))
+            self._next_start[provider] = start_at + self.interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+
+def fetch_order_status(provider: str, provider_order_id: str, timeout: int | None = None) -> dict[str, Any]:
+    """
+    Looks up one order on the provider (no DB access, safe on worker threads).
+    Returns {"outcome": "ok", "provider_status", "payload"} or {"outcome": "error", "error"}.
+    """
+    kwargs: dict[str, Any] = {"timeout": timeout} if timeout else {}
+    try:
+        if provider == "razorpay":
+            response = http_client.get(
+                "razorpay",
+                f"{razorpay_orders_url()}/{provider_order_id}",
+                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                **kwargs,
+            )
+        else:
+            response = http_client.get(
+                "cashfree",
+                f"{cashfree_orders_url()}/{provider_order_id}",
+                headers=cashfree_headers(),
+                **kwargs,
+            )
+        if response.status_code != 200:
+            return {"outcome": "error", "error": f"{provider} order lookup failed ({response.status_code})."}
+        payload = response.json()
+    except Exception as exc:  # noqa: BLE001 - one failed lookup must not stop the reconcile run
+        return {"outcome": "error", "error": str(exc)}
+
+    status_key = "status" if provider == "razorpay" else "order_status"
+    return {
+        "outcome": "ok",
+        "provider_status": str(payload.get(status_key) or "").strip().upper(),
+        "payload": payload,
+    }
@@ -0,0 +1,233 @@
+"""
+Durable inbox for payment provider webhooks.
+
+The webhook views only verify the signature, extract the order/payment references and append
+the payload to `PaymentWebhookInbox` (one row per idempotency key), then answer the provider.
+`apply_webhook_inbox_row` does the order lookup, transaction row, credit grant and analytics;
+`apply_payment_webhooks` runs it in batches claimed with SKIP LOCKED, so several appliers can
+drain the inbox concurrently.
+"""
+
+import logging
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import AnalyticsEvent, PaymentOrder, PaymentTransaction, PaymentWebhookInbox
+from .payment_ops import grant_parser_credits_once, is_failure_status, is_success_status
+
+logger = logging.getLogger(__name__)
+
+RAZORPAY_SUCCESS_EVENTS = {"payment.captured", "order.paid", "payment.authorized"}
+RAZORPAY_FAILURE_EVENTS = {"payment.failed"}
+WEBHOOK_PATHS = {
+    "cashfree": "/payments/webhook",
+    "razorpay": "/payments/webhook/razorpay",
+}
+
+
+def parse_cashfree_webhook(payload: dict) -> dict:
+    data = payload.get("data", {})
+    order_data = data.get("order", {})
+    payment_data = data.get("payment", {})
+
+    provider_order_id = (
+        order_data.get("order_id")
+        or payload.get("order_id")
+        or payload.get("cf_order_id")
+        or ""
+    ).strip()
+    provider_payment_id = (
+        payment_data.get("cf_payment_id")
+        or payment_data.get("payment_id")
+        or payload.get("cf_payment_id")
+        or ""
+    ).strip()
+    provider_status = (
+        payment_data.get("payment_status")
+        or order_data.get("order_status")
+        or payload.get("payment_status")
+        or payload.get("order_status")
+        or payload.get("type")
+        or ""
+    ).strip()
+    return {
+        "provider_order_id": provider_order_id,
+        "provider_payment_id": provider_payment_id,
+        "provider_status": provider_status,
+        "event_name": "",
+        "idempotency_key": f"{provider_order_id}:{provider_payment_id or 'no-payment-id'}:{provider_status or 'unknown'}",
+    }
+
+
+def parse_razorpay_webhook(payload: dict) -> dict:
+    event_name = (payload.get("event") or "").strip()
+    body_payload = payload.get("payload", {}) if isinstance(payload, dict) else {}
+
+    payment_entity = (body_payload.get("payment", {}) or {}).get("entity", {})
+    order_entity = (body_payload.get("order", {}) or {}).get("entity", {})
+
+    provider_order_id = (
+        payment_entity.get("order_id")
+        or order_entity.get("id")
+        or ""
+    ).strip()
+    provider_payment_id = (payment_entity.get("id") or "").strip()
+    provider_status = (
+        payment_entity.get("status")
+        or order_entity.get("status")
+        or event_name
+        or ""
+    ).strip()
+
+    if event_name in RAZORPAY_SUCCESS_EVENTS and provider_status.lower() not in {"captured", "paid", "completed"}:
+        provider_status = "CAPTURED"
+    elif event_name in RAZORPAY_FAILURE_EVENTS:
+        provider_status = payment_entity.get("error_reason") or "FAILED"
+
+    return {
+        "provider_order_id": provider_order_id,
+        "provider_payment_id": provider_payment_id,
+        "provider_status": provider_status,
+        "event_name": event_name,
+        "idempotency_key": (
+            f"rzp:{provider_order_id}:{provider_payment_id or 'no-payment-id'}:{event_name or provider_status or 'unknown'}"
+        ),
+    }
+
+
+def record_webhook(provider: str, parsed: dict, payload: dict) -> tuple[PaymentWebhookInbox, bool]:
+    """Appends a verified webhook to the inbox; returns (row, created). Retries of one event share a row."""
+    return PaymentWebhookInbox.objects.get_or_create(
+        idempotency_key=parsed["idempotency_key"][:200],
+        defaults={
+            "provider": provider,
+            "provider_order_id": parsed["provider_order_id"][:120],
+            "provider_payment_id": parsed["provider_payment_id"][:120],
+            "provider_status": parsed["provider_status"][:60],
+            "event_name": parsed["event_name"][:60],
+            "payload": payload,
+        },
+    )
+
+
+def claim_webhook_inbox(worker_id: str, limit: int) -> list[int]:
+    """
+    Leases up to `limit` unprocessed inbox rows to `worker_id`, oldest first, and returns their ids.
+    Rows whose lease expired (crashed applier) become claimable again.
+    """
+    if limit < 1:
+        return []
+
+    now = timezone.now()
+    lease_cutoff = now - timedelta(seconds=max(int(settings.PAYMENT_WEBHOOK_LEASE_SEC), 1))
+    claimable = Q(processed_at__isnull=True) & (Q(claimed_at__isnull=True) | Q(claimed_at__lt=lease_cutoff))
+    worker_id = worker_id[:120]
+    candidates = PaymentWebhookInbox.objects.filter(claimable).order_by("id")
+
+    # Same leasing scheme as claim_queued_parser_uploads: SKIP LOCKED where supported, and an
+    # UPDATE that re-checks the lease everywhere.
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic() if skip_locked else nullcontext():
+        if skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        candidate_ids = list(candidates.values_list("id", flat=True)[:limit])
+        if not candidate_ids:
+            return []
+        PaymentWebhookInbox.objects.filter(claimable, id__in=candidate_ids).update(
+            claimed_by=worker_id,
+            claimed_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(
+        PaymentWebhookInbox.objects.filter(id__in=candidate_ids, claimed_by=worker_id, claimed_at=now)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+
+def _record_payment_event(payment_order: PaymentOrder, event_name: str, provider: str) -> None:
+    AnalyticsEvent.objects.create(
+        user=payment_order.user,
+        session_id=f"pay-{payment_order.order_id}",
+        event_name=event_name,
+        path=WEBHOOK_PATHS[provider],
+        metadata={"order_id": payment_order.order_id, "plan_key": payment_order.plan.key},
+    )
+
+
+def _apply(inbox: PaymentWebhookInbox) -> str:
+    payment_order = (
+        PaymentOrder.objects.select_related("plan")
+        .filter(Q(order_id=inbox.provider_order_id) | Q(provider_order_id=inbox.provider_order_id))
+        .first()
+    )
+    if not payment_order:
+        return "ignored"
+
+    now = timezone.now()
+    _transaction_row, created = PaymentTransaction.objects.get_or_create(
+        idempotency_key=inbox.idempotency_key,
+        defaults={
+            "payment_order": payment_order,
+            "provider_payment_id": inbox.provider_payment_id,
+            "provider_status": inbox.provider_status,
+            "signature_verified": True,
+            "payload": inbox.payload,
+            "processed_at": now,
+        },
+    )
+    if not created:
+        return "duplicate"
+
+    provider_status = inbox.provider_status
+    if is_success_status(provider_status) or inbox.event_name in RAZORPAY_SUCCESS_EVENTS:
+        grant_parser_credits_once(payment_order)
+        _record_payment_event(payment_order, "payment_success", inbox.provider)
+    elif payment_order.credit_granted_at:
+        # Appliers can run events for one order out of order; a late failure or pending
+        # notification must not downgrade an order that was already paid.
+        pass
+    elif is_failure_status(provider_status) or inbox.event_name in RAZORPAY_FAILURE_EVENTS:
+        payment_order.status = "failed"
+        payment_order.failure_reason = provider_status or "Payment failed"
+        payment_order.save(update_fields=["status", "failure_reason", "updated_at"])
+        _record_payment_event(payment_order, "payment_failed", inbox.provider)
+    else:
+        payment_order.status = "payment_pending"
+        payment_order.save(update_fields=["status", "updated_at"])
+    return "applied"
+
+
+def apply_webhook_inbox_row(inbox_id: int) -> str:
+    """
+    Applies one inbox row and returns its outcome ("applied", "duplicate", "ignored"),
+    "retry" when it failed and will be claimed again, "failed" once attempts are exhausted,
+    or "missing" when the row is already processed.
+    """
+    inbox = PaymentWebhookInbox.objects.filter(pk=inbox_id, processed_at__isnull=True).first()
+    if inbox is None:
+        return "missing"
+    try:
+        with transaction.atomic():
+            outcome = _apply(inbox)
+            PaymentWebhookInbox.objects.filter(pk=inbox.pk).update(
+                outcome=outcome,
+                last_error="",
+                processed_at=timezone.now(),
+            )
+        return outcome
+    except Exception as exc:
+        logger.exception("Payment webhook %s failed (attempt %s).", inbox.idempotency_key, inbox.attempts)
+        exhausted = inbox.attempts >= max(int(settings.PAYMENT_WEBHOOK_MAX_ATTEMPTS), 1)
+        PaymentWebhookInbox.objects.filter(pk=inbox.pk).update(
+            last_error=str(exc)[:1000],
+            claimed_at=None,
+            claimed_by="",
+            **({"outcome": "failed", "processed_at": timezone.now()} if exhausted else {}),
+        )
+        return "failed" if exhausted else "retry"
@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .ca_panel import sync_ca_panel_profiles
+from .models import User
+
+CA_ELIGIBILITY_FIELDS = {"user_type", "is_verified_ca", "email"}
+
+
+@receiver(post_save, sender=User)
+def sync_verified_ca_profile(sender, instance, update_fields=None, **kwargs):
+    # Saves that cannot change eligibility (e.g. last_login on every login) skip the sync.
+    if update_fields is not None and not CA_ELIGIBILITY_FIELDS & set(update_fields):
+        return
+    if instance.user_type != "ca" or not instance.is_verified_ca or not instance.email:
+        return
+    # After commit, so a rolled-back verification never leaves a profile behind.
+    transaction.on_commit(lambda: sync_ca_panel_profiles(user_ids=[instance.pk]))
@@ -1,29 +1,54 @@
 import base64
+import gzip
 import hashlib
 import hmac
 import json
+import threading
+import warnings
 from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
 from django.test import TestCase, override_settings
-from django.core.management import call_command
+from django.core.management import CommandError, call_command
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from unittest.mock import Mock, patch
 
+from complia_backend import circuit_breakers, http_client
+
+from .analytics_rollups import (
+    refresh_analytics_rollups,
+    rollup_distinct_sessions,
+    rollup_event_count,
+    rollup_top_search_query,
+)
+from .hll import HyperLogLog, merge_sketches
 from .models import (
+    AnalyticsDailyRollup,
     AnalyticsEvent,
+    AnalyticsHourlyRollup,
+    AnalyticsRollupCursor,
     AssistedOffer,
     AssistedIntent,
     CAPanelProfile,
     CAHelpRequest,
     ExperimentExposure,
+    ParserCreditLedgerEntry,
     PaymentOrder,
     PaymentPlan,
     PaymentTransaction,
+    PaymentWebhookInbox,
     User,
     UserEntitlement,
     WeeklyKpiSnapshot,
 )
+from .payment_ops import (
+    grant_parser_credits_once,
+    refund_parser_credit,
+    reserve_parser_credit,
+    unsettled_parser_credit_reservations,
+)
 
 
 class UserModelTests(TestCase):
@@ -91,6 +116,7 @@ class CAHelpRequestTests(APITestCase):
         self.assertIn("consent_to_share_with_ca", response.data["errors"])
 
 
+@override_settings(ANALYTICS_ROLLUP_LAG_SEC=0)
 class AnalyticsTests(APITestCase):
     def test_create_analytics_event_anonymous(self):
         payload = {
@@ -114,6 +140,61 @@ class AnalyticsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("metadata", response.data["errors"])
 
+    def test_batch_analytics_events_report_per_item_errors(self):
+        user = User.objects.create_user(email="batch@complia.in", password="pass123456")
+        self.client.force_authenticate(user=user)
+        payload = {
+            "events": [
+                {"event_name": "page_view", "path": "/", "session_id": "sess-batch-01", "metadata": {"page": "home"}},
+                {"event_name": "search_performed", "path": "/", "session_id": "sess-batch-01", "metadata": {"query": "DRC-01"}},
+                {
+                    "event_name": "search_performed",
+                    "path": "/",
+                    "session_id": "sess-batch-01",
+                    "metadata": {"query": "DRC-01", "result_count": 2},
+                },
+                "not-an-event",
+            ]
+        }
+        response = self.client.post("/api/v1/analytics/events/batch/", payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["accepted"], 2)
+        self.assertEqual([item["index"] for item in response.data["rejected_events"]], [1, 3])
+        self.assertIn("metadata", response.data["rejected_events"][0]["errors"])
+        self.assertEqual(
+            sorted(AnalyticsEvent.objects.values_list("event_name", flat=True)),
+            ["page_view", "search_performed"],
+        )
+        self.assertEqual(AnalyticsEvent.objects.filter(user=user).count(), 2)
+
+    def test_batch_analytics_events_accept_ndjson(self):
+        lines = [
+            json.dumps({"event_name": "page_view", "path": "/a", "session_id": "sess-ndjson-1"}),
+            "",
+            "{not json",
+            json.dumps({"event_name": "page_view", "path": "/b", "session_id": "sess-ndjson-1"}),
+        ]
+        response = self.client.post(
+            "/api/v1/analytics/events/batch/",
+            data="\n".join(lines).encode("utf-8"),
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["accepted"], 2)
+        self.assertEqual(response.data["rejected_events"][0]["index"], 1)
+        self.assertEqual(AnalyticsEvent.objects.filter(user__isnull=True).count(), 2)
+
+    @override_settings(ANALYTICS_BATCH_MAX_EVENTS=2)
+    def test_batch_analytics_events_rejects_oversized_or_malformed_batches(self):
+        event = {"event_name": "page_view", "path": "/", "session_id": "sess-batch-02"}
+        response = self.client.post("/api/v1/analytics/events/batch/", [event, event, event], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("events", response.data["errors"])
+
+        response = self.client.post("/api/v1/analytics/events/batch/", {"events": "nope"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(AnalyticsEvent.objects.count(), 0)
+
     def test_superadmin_metrics_requires_admin(self):
         user = User.objects.create_user(email="user@complia.in", password="pass123456", user_type="taxpayer")
         self.client.force_authenticate(user=user)
@@ -146,7 +227,7 @@ class AnalyticsTests(APITestCase):
 
 
 class GoogleLoginTests(APITestCase):
-    @patch("accounts.views.requests.get")
+    @patch("accounts.views.http_client.get")
     def test_google_login_success(self, mock_get):
         mock_resp = Mock()
         mock_resp.status_code = 200
@@ -167,7 +248,7 @@ class GoogleLoginTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
     @override_settings(SUPERADMIN_EMAILS={"maazabdulbasith@gmail.com"})
-    @patch("accounts.views.requests.get")
+    @patch("accounts.views.http_client.get")
     def test_google_login_superadmin_auto_promote(self, mock_get):
         mock_resp = Mock()
         mock_resp.status_code = 200
@@ -318,6 +399,30 @@ class SuperAdminCARequestOpsTests(APITestCase):
         self.assertGreaterEqual(len(results), 1)
         self.assertTrue(any(item["display_name"] == "Aarav Shah" for item in results))
 
+    def test_ca_panel_profiles_sync_outside_the_list_endpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            verified = User.objects.create_user(
+                email="ca2@example.com", password="pass123456", user_type="ca", first_name="Nisha", last_name="Rao"
+            )
+            unverified = User.objects.create_user(email="ca3@example.com", password="pass123456", user_type="ca")
+        self.assertFalse(CAPanelProfile.objects.filter(user=verified).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            verified.is_verified_ca = True
+            verified.save(update_fields=["is_verified_ca"])
+        self.assertEqual(CAPanelProfile.objects.get(user=verified).display_name, "Nisha Rao")
+
+        # Bulk verification skips signals; the command backfills it, leaving existing profiles alone.
+        User.objects.filter(pk=unverified.pk).update(is_verified_ca=True)
+        call_command("sync_ca_panel_profiles", stdout=StringIO())
+        self.assertEqual(CAPanelProfile.objects.get(user=unverified).email, "ca3@example.com")
+        self.assertEqual(CAPanelProfile.objects.filter(email="ca1@example.com").count(), 1)
+
+        self.client.force_authenticate(user=self.admin)
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/v1/admin/ca-panel/")
+        self.assertEqual(response.data["count"], 3)
+
     def test_admin_can_create_and_update_ca_panel_profile(self):
         self.client.force_authenticate(user=self.admin)
         create_response = self.client.post(
@@ -359,7 +464,7 @@ class SuperAdminCARequestOpsTests(APITestCase):
         response = self.client.get("/api/v1/admin/exports/ca_requests/?status=new")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("text/csv", response["Content-Type"])
-        csv_text = response.content.decode("utf-8")
+        csv_text = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("notice_code", csv_text)
         self.assertIn("GST-DRC-01", csv_text)
 
@@ -369,6 +474,7 @@ class SuperAdminCARequestOpsTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+@override_settings(ANALYTICS_ROLLUP_LAG_SEC=0)
 class SuperAdminFunnelAndKpiTests(APITestCase):
     def setUp(self):
         self.admin = User.objects.create_user(email="admin@complia.in", password="pass123456", user_type="admin")
@@ -416,6 +522,109 @@ class SuperAdminFunnelAndKpiTests(APITestCase):
         self.assertGreaterEqual(WeeklyKpiSnapshot.objects.count(), 1)
 
 
+class HyperLogLogTests(TestCase):
+    def test_merge_matches_union_sketch(self):
+        first = HyperLogLog().update(f"sess-{idx}" for idx in range(4000))
+        second = HyperLogLog().update(f"sess-{idx}" for idx in range(2000, 7000))
+        union = HyperLogLog().update(f"sess-{idx}" for idx in range(7000))
+
+        merged = HyperLogLog.from_bytes(first.to_bytes()).merge(second)
+        self.assertEqual(merged.registers, union.registers)
+        self.assertLess(abs(merged.count() - 7000) / 7000, 0.05)
+
+    def test_small_cardinalities_are_exact_enough(self):
+        self.assertEqual(HyperLogLog().count(), 0)
+        self.assertEqual(HyperLogLog().update(["a", "a", "b"]).count(), 2)
+        self.assertEqual(merge_sketches([None, b"", HyperLogLog().update(["x"]).to_bytes()]).count(), 1)
+
+
+@override_settings(ANALYTICS_ROLLUP_LAG_SEC=0)
+class AnalyticsRollupTests(APITestCase):
+    def _event(self, event_name, session_id, metadata=None, hours_ago=0):
+        event = AnalyticsEvent.objects.create(
+            event_name=event_name,
+            session_id=session_id,
+            path="/",
+            metadata=metadata or {},
+        )
+        if hours_ago:
+            AnalyticsEvent.objects.filter(pk=event.pk).update(created_at=timezone.now() - timedelta(hours=hours_ago))
+        return event
+
+    def test_refresh_folds_only_new_events(self):
+        self._event("search_performed", "sess-roll-1", {"query": "ASMT-10"})
+        self._event("search_performed", "sess-roll-1", {"query": "ASMT-10"})
+        self._event("notice_opened", "sess-roll-2")
+
+        self.assertEqual(refresh_analytics_rollups(batch_size=2), 3)
+        self.assertEqual(refresh_analytics_rollups(), 0)
+        self._event("search_performed", "sess-roll-2", {"query": "DRC-01"})
+        self.assertEqual(refresh_analytics_rollups(), 1)
+
+        self.assertEqual(rollup_event_count(["search_performed"]), 3)
+        self.assertEqual(rollup_distinct_sessions(["search_performed"]), 2)
+        self.assertEqual(rollup_distinct_sessions(), 2)
+        self.assertEqual(rollup_top_search_query(), ("ASMT-10", 2))
+        self.assertEqual(AnalyticsRollupCursor.objects.get().last_event_id, AnalyticsEvent.objects.order_by("-id")[0].id)
+
+    def test_windows_read_hour_buckets(self):
+        self._event("ca_help_submitted", "sess-old", hours_ago=24 * 10)
+        self._event("ca_help_submitted", "sess-new", hours_ago=3)
+        refresh_analytics_rollups()
+
+        week_start = timezone.now() - timedelta(days=7)
+        self.assertEqual(rollup_event_count(["ca_help_submitted"], week_start), 1)
+        self.assertEqual(rollup_distinct_sessions(["ca_help_submitted"], week_start), 1)
+        self.assertEqual(rollup_event_count(["ca_help_submitted"]), 2)
+
+    @override_settings(ANALYTICS_ROLLUP_LAG_SEC=3600)
+    def test_events_inside_lag_window_wait_for_next_run(self):
+        self._event("page_view", "sess-lag")
+        self.assertEqual(refresh_analytics_rollups(), 0)
+        self.assertEqual(AnalyticsRollupCursor.objects.get().last_event_id, 0)
+
+    def test_approximate_distinct_sessions_merge_hour_and_day_sketches(self):
+        for idx in range(300):
+            self._event("page_view", f"sess-hll-{idx}", hours_ago=30 + (idx % 3) * 24)
+        for idx in range(150, 450):
+            self._event("notice_opened", f"sess-hll-{idx}", hours_ago=1)
+        refresh_analytics_rollups()
+
+        exact = rollup_distinct_sessions(exact=True)
+        approximate = rollup_distinct_sessions(exact=False)
+        self.assertEqual(exact, 450)
+        self.assertLess(abs(approximate - exact) / exact, 0.05)
+
+        week_start = timezone.now() - timedelta(days=7, minutes=30)
+        self.assertEqual(
+            rollup_distinct_sessions(["notice_opened"], week_start, exact=False),
+            rollup_distinct_sessions(["notice_opened"], timezone.now() - timedelta(hours=2), exact=False),
+        )
+        self.assertEqual(AnalyticsDailyRollup.objects.filter(event_name="*").count(), len(
+            {row.bucket_start.date() for row in AnalyticsHourlyRollup.objects.filter(event_name="*")}
+        ))
+
+    def test_dashboard_exact_flag(self):
+        admin = User.objects.create_user(email="admin-exact@complia.in", password="pass123456", user_type="admin")
+        self._event("search_performed", "sess-exact", {"query": "DRC-01"})
+        self.client.force_authenticate(user=admin)
+
+        approximate = self.client.get("/api/v1/admin/funnel/?window=7d")
+        exact = self.client.get("/api/v1/admin/funnel/?window=7d&exact=true")
+        self.assertEqual(approximate.data["distinct_mode"], "approximate")
+        self.assertEqual(exact.data["distinct_mode"], "exact")
+        self.assertEqual(exact.data["steps"]["search_performed"], 1)
+        self.assertEqual(approximate.data["steps"]["search_performed"], 1)
+
+    def test_rollup_command_rebuild_is_idempotent(self):
+        self._event("search_performed", "sess-cmd", {"query": "GSTR-3A"})
+        call_command("rollup_analytics", stdout=StringIO())
+        call_command("rollup_analytics", "--rebuild", stdout=StringIO())
+
+        self.assertEqual(AnalyticsHourlyRollup.objects.get(event_name="search_performed").event_count, 1)
+        self.assertEqual(rollup_top_search_query(), ("GSTR-3A", 1))
+
+
 class AssistedIntentAndExperimentTests(APITestCase):
     def setUp(self):
         self.admin = User.objects.create_user(email="admin@complia.in", password="pass123456", user_type="admin")
@@ -499,6 +708,32 @@ class AssistedIntentAndExperimentTests(APITestCase):
         self.assertEqual(response.data["offer"]["key"], "assisted_response_pack_v1")
 
 
+class _FakePaymentProviderHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Cashfree / Razorpay order status endpoints."""
+
+    order_statuses: dict = {}
+    requested_paths: list = []
+
+    def do_GET(self):
+        handler = type(self)
+        handler.requested_paths.append(self.path)
+        order_key = self.path.rsplit("/", 1)[-1]
+        if order_key not in handler.order_statuses:
+            status_code, body = 404, b'{"message": "order not found"}'
+        elif self.path.startswith("/v1/orders/"):
+            status_code, body = 200, json.dumps({"id": order_key, "status": handler.order_statuses[order_key]}).encode()
+        else:
+            status_code, body = 200, json.dumps({"order_id": order_key, "order_status": handler.order_statuses[order_key]}).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
 @override_settings(PAYMENT_PROVIDER_DEFAULT="cashfree")
 class PaymentsPhase3ATests(APITestCase):
     def setUp(self):
@@ -538,7 +773,7 @@ class PaymentsPhase3ATests(APITestCase):
         self.assertEqual(response.data["code"], "payment_provider_not_configured")
 
     @override_settings(CASHFREE_APP_ID="cf_app_test", CASHFREE_SECRET_KEY="cf_secret_test")
-    @patch("accounts.views.requests.post")
+    @patch("accounts.views.http_client.post")
     def test_create_payment_order_success(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -564,7 +799,7 @@ class PaymentsPhase3ATests(APITestCase):
         RAZORPAY_KEY_ID="rzp_test_key",
         RAZORPAY_KEY_SECRET="rzp_test_secret",
     )
-    @patch("accounts.views.requests.post")
+    @patch("accounts.views.http_client.post")
     def test_create_payment_order_success_razorpay(self, mock_post):
         mock_response = Mock()
         mock_response.status_code = 200
@@ -739,6 +974,57 @@ class PaymentsPhase3ATests(APITestCase):
         entitlement = UserEntitlement.objects.get(user=self.user)
         self.assertEqual(entitlement.parser_credits, 1)
 
+    @override_settings(CASHFREE_WEBHOOK_SECRET="whsec_test", PAYMENT_WEBHOOK_ASYNC_ENABLED=True)
+    def test_cashfree_webhook_fast_ack_is_applied_by_inbox_applier(self):
+        payment_order = PaymentOrder.objects.create(
+            user=self.user,
+            plan=self.plan,
+            order_id="cmp-webhook-inbox-001",
+            provider="cashfree",
+            amount_paise=900,
+            currency="INR",
+            credits=1,
+            status="payment_pending",
+        )
+
+        def _post(payment_status, payment_id="cfpay_inbox_1"):
+            payload_json = json.dumps(
+                {
+                    "type": "PAYMENT_WEBHOOK",
+                    "data": {
+                        "order": {"order_id": payment_order.order_id},
+                        "payment": {"cf_payment_id": payment_id, "payment_status": payment_status},
+                    },
+                }
+            )
+            signature = hmac.new(b"whsec_test", payload_json.encode("utf-8"), hashlib.sha256).hexdigest()
+            return self.client.post(
+                "/api/v1/payments/webhooks/cashfree/",
+                data=payload_json,
+                content_type="application/json",
+                HTTP_X_WEBHOOK_SIGNATURE=signature,
+            )
+
+        first = _post("SUCCESS")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertFalse(first.data["duplicate"])
+        self.assertTrue(_post("SUCCESS").data["duplicate"])
+        _post("FAILED", payment_id="cfpay_inbox_0")
+        self.assertFalse(UserEntitlement.objects.filter(user=self.user).exists())
+        self.assertEqual(PaymentWebhookInbox.objects.filter(processed_at__isnull=True).count(), 2)
+
+        call_command("apply_payment_webhooks", "--once", stdout=StringIO())
+
+        self.assertEqual(UserEntitlement.objects.get(user=self.user).parser_credits, 1)
+        self.assertEqual(
+            list(PaymentWebhookInbox.objects.order_by("id").values_list("outcome", "attempts")),
+            [("applied", 1), ("applied", 1)],
+        )
+        payment_order.refresh_from_db()
+        # The later failure notification does not downgrade the paid order.
+        self.assertEqual(payment_order.status, "paid")
+        self.assertEqual(PaymentTransaction.objects.filter(payment_order=payment_order).count(), 2)
+
     def test_get_my_entitlements(self):
         UserEntitlement.objects.create(
             user=self.user,
@@ -1038,6 +1324,114 @@ class PaymentsPhase3ATests(APITestCase):
         call_command("reconcile_payment_orders", "--order-id", payment_order.order_id, "--dry-run")
         self.assertFalse(UserEntitlement.objects.filter(user=self.user).exists())
 
+    def test_reconcile_payment_orders_checks_stale_pending_orders_with_provider(self):
+        _FakePaymentProviderHandler.order_statuses = {
+            "cmp-stale-cf-paid": "PAID",
+            "cmp-stale-cf-active": "ACTIVE",
+            "order_rzp_paid": "paid",
+        }
+        _FakePaymentProviderHandler.requested_paths = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakePaymentProviderHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        def pending_order(order_id, provider, provider_order_id, minutes_old):
+            payment_order = PaymentOrder.objects.create(
+                user=self.user,
+                plan=self.plan,
+                order_id=order_id,
+                provider=provider,
+                provider_order_id=provider_order_id,
+                amount_paise=900,
+                currency="INR",
+                credits=1,
+                status="payment_pending",
+            )
+            PaymentOrder.objects.filter(pk=payment_order.pk).update(updated_at=timezone.now() - timedelta(minutes=minutes_old))
+            return payment_order
+
+        cf_paid = pending_order("cmp-stale-cf-paid", "cashfree", "cmp-stale-cf-paid", 90)
+        cf_active = pending_order("cmp-stale-cf-active", "cashfree", "cmp-stale-cf-active", 90)
+        rzp_paid = pending_order("cmp-stale-rzp-paid", "razorpay", "order_rzp_paid", 90)
+        fresh = pending_order("cmp-fresh-cf", "cashfree", "cmp-fresh-cf", 1)
+
+        with override_settings(
+            CASHFREE_APP_ID="cf-app",
+            CASHFREE_SECRET_KEY="cf-secret",
+            CASHFREE_API_BASE_URL=f"{base_url}/pg",
+            RAZORPAY_KEY_ID="rzp-key",
+            RAZORPAY_KEY_SECRET="rzp-secret",
+            RAZORPAY_API_BASE_URL=f"{base_url}/v1",
+        ):
+            call_command("reconcile_payment_orders", "--dry-run", "--rate", "0", stdout=StringIO())
+            self.assertFalse(UserEntitlement.objects.filter(user=self.user).exists())
+
+            out = StringIO()
+            call_command("reconcile_payment_orders", "--rate", "0", "--workers", "3", "--batch-size", "1", stdout=out)
+
+        self.assertCountEqual(
+            _FakePaymentProviderHandler.requested_paths,
+            ["/pg/orders/cmp-stale-cf-paid", "/pg/orders/cmp-stale-cf-active", "/v1/orders/order_rzp_paid"] * 2,
+        )
+        self.assertIn("Provider checked: 3", out.getvalue())
+        self.assertIn("Granted: 2", out.getvalue())
+        self.assertEqual(UserEntitlement.objects.get(user=self.user).parser_credits, 2)
+        for payment_order, expected_status in ((cf_paid, "paid"), (rzp_paid, "paid"), (cf_active, "payment_pending"), (fresh, "payment_pending")):
+            payment_order.refresh_from_db()
+            self.assertEqual(payment_order.status, expected_status)
+        self.assertTrue(
+            PaymentTransaction.objects.filter(payment_order=rzp_paid, idempotency_key="reconcile:razorpay:order_rzp_paid:PAID").exists()
+        )
+
+    def test_parser_credit_ledger_tracks_balance_without_row_locks(self):
+        payment_order = PaymentOrder.objects.create(
+            user=self.user,
+            plan=self.plan,
+            order_id="cmp-ledger-001",
+            provider="cashfree",
+            amount_paise=900,
+            currency="INR",
+            credits=1,
+            status="paid",
+        )
+        self.assertTrue(grant_parser_credits_once(payment_order))
+        self.assertFalse(grant_parser_credits_once(payment_order))
+
+        with self.assertNumQueries(5):  # savepoint, conditional UPDATE, ledger INSERT, balance read, release
+            self.assertEqual(reserve_parser_credit(self.user, reference="a.pdf"), (True, 0))
+        self.assertEqual(reserve_parser_credit(self.user, reference="b.pdf"), (False, 0))
+        refund_parser_credit(self.user, reference="a.pdf")
+        self.assertEqual(reserve_parser_credit(self.user), (True, 0))
+
+        kinds = list(ParserCreditLedgerEntry.objects.filter(user=self.user).order_by("id").values_list("kind", "amount"))
+        self.assertEqual(kinds, [("grant", 1), ("reserve", -1), ("refund", 1), ("reserve", -1)])
+        entitlement = UserEntitlement.objects.get(user=self.user)
+        self.assertEqual((entitlement.parser_credits, entitlement.lifetime_consumed_credits), (0, 1))
+        call_command("audit_parser_credits", stdout=StringIO())
+
+        UserEntitlement.objects.filter(user=self.user).update(parser_credits=7)
+        with self.assertRaises(CommandError):
+            call_command("audit_parser_credits", stdout=StringIO())
+        call_command("audit_parser_credits", "--fix", stdout=StringIO())
+        self.assertEqual(UserEntitlement.objects.get(user=self.user).parser_credits, 0)
+
+    def test_unsettled_parser_upload_reservations_are_reported(self):
+        UserEntitlement.objects.create(user=self.user, parser_credits=2, lifetime_purchased_credits=2)
+        reserve_parser_credit(self.user, reference="parser-upload-settled")
+        refund_parser_credit(self.user, reference="parser-upload-settled")
+        reserve_parser_credit(self.user, reference="parser-upload-leaked")
+        ParserCreditLedgerEntry.objects.update(created_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(
+            list(unsettled_parser_credit_reservations(timedelta(hours=24)).values_list("reference", flat=True)),
+            ["parser-upload-leaked"],
+        )
+        out = StringIO()
+        call_command("audit_parser_credits", "--fix", stdout=out)
+        self.assertIn("reservation parser-upload-leaked", out.getvalue())
+
 
 class SuperAdminCsvExportTests(APITestCase):
     def setUp(self):
@@ -1072,6 +1466,203 @@ class SuperAdminCsvExportTests(APITestCase):
         response = self.client.get("/api/v1/admin/exports/feedback/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("text/csv", response["Content-Type"])
-        csv_text = response.content.decode("utf-8")
+        self.assertTrue(response.streaming)
+        csv_text = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("TEST-FB-001", csv_text)
         self.assertIn("Helpful content", csv_text)
+
+    @override_settings(CSV_EXPORT_CHUNK_SIZE=2)
+    def test_parser_jobs_csv_export_streams_chunks(self):
+        from complia_backend.notices.models import ParserExtraction, ParserJob
+
+        for idx in range(5):
+            job = ParserJob.objects.create(
+                original_filename=f"notice-{idx}.pdf",
+                status="completed",
+                confidence=0.9,
+                delete_after=timezone.now() + timedelta(hours=1),
+            )
+            ParserExtraction.objects.create(parser_job=job, legal_section="Section 73", confidence=0.9)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get("/api/v1/admin/exports/parser_jobs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        chunks = list(response.streaming_content)
+        # Header chunk first, then rows in chunks of CSV_EXPORT_CHUNK_SIZE.
+        self.assertEqual(len(chunks), 4)
+        self.assertTrue(chunks[0].startswith(b"id,original_filename"))
+        rows = b"".join(chunks).decode("utf-8").strip().splitlines()
+        self.assertEqual(len(rows), 6)
+        self.assertIn("Section 73", rows[1])
+
+    def test_csv_export_gzip_when_accepted(self):
+        from complia_backend.notices.models import NoticeType
+
+        NoticeType.objects.create(
+            code="TEST-GZ-001",
+            title="Gzip Notice",
+            detailed_explanation="Detailed",
+            consequences_of_ignoring="Risk",
+            next_steps="Next",
+        )
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get("/api/v1/admin/exports/notice_qa/", HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        csv_text = gzip.decompress(b"".join(response.streaming_content)).decode("utf-8")
+        self.assertIn("TEST-GZ-001", csv_text)
+
+        with override_settings(CSV_EXPORT_GZIP=False):
+            response = self.client.get("/api/v1/admin/exports/notice_qa/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_remaining = 0
+
+    def do_GET(self):
+        handler = type(self)
+        if handler.failures_remaining > 0:
+            handler.failures_remaining -= 1
+            status_code, body = 503, b"busy"
+        else:
+            status_code, body = 200, b'{"ok": true}'
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@override_settings(HTTP_RETRY_BACKOFF_SEC=0)
+class OutboundHttpClientTests(APITestCase):
+    def setUp(self):
+        http_client.reset_sessions()
+        circuit_breakers.reset_breakers()
+        self.addCleanup(circuit_breakers.reset_breakers)
+        _KeepAliveHandler.failures_remaining = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.host = f"127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        http_client.reset_sessions()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_requests_reuse_pooled_keep_alive_connection(self):
+        for _ in range(3):
+            response = http_client.get("notice_sources", f"{self.base_url}/page")
+            self.assertEqual(response.status_code, 200)
+
+        self.assertIs(http_client.get_session("notice_sources"), http_client.get_session("notice_sources"))
+        stats = http_client.outbound_http_metrics()[self.host]
+        self.assertEqual(stats["provider"], "notice_sources")
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["errors"], 0)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_reused"], 2)
+
+    def test_retryable_status_is_retried_with_provider_policy(self):
+        _KeepAliveHandler.failures_remaining = 1
+        response = http_client.get("google_auth", f"{self.base_url}/userinfo")
+        self.assertEqual(response.status_code, 200)
+
+        _KeepAliveHandler.failures_remaining = 5
+        response = http_client.get("google_auth", f"{self.base_url}/userinfo")
+        # google_auth allows one retry; the last response is handed back instead of raising.
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_KeepAliveHandler.failures_remaining, 3)
+        self.assertEqual(http_client.outbound_http_metrics()[self.host]["errors"], 1)
+
+    def test_connection_only_policy_never_retries_a_sent_request(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            http_client.get_session("razorpay")
+
+        _KeepAliveHandler.failures_remaining = 5
+        response = http_client.get("razorpay", f"{self.base_url}/v1/orders/x")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(_KeepAliveHandler.failures_remaining, 4)
+
+    @override_settings(
+        CIRCUIT_BREAKER_MIN_CALLS=4,
+        CIRCUIT_BREAKER_WINDOW=4,
+        CIRCUIT_BREAKER_FAILURE_RATE=0.5,
+        CIRCUIT_BREAKER_OPEN_SEC=60,
+        CIRCUIT_BREAKER_HALF_OPEN_CALLS=1,
+        CASHFREE_APP_ID="cf-app",
+        CASHFREE_SECRET_KEY="cf-secret",
+    )
+    def test_circuit_breaker_opens_fails_fast_and_recovers_after_probe(self):
+        _KeepAliveHandler.failures_remaining = 2
+        for _ in range(4):
+            with circuit_breakers.guard("cashfree"):
+                http_client.get("cashfree", f"{self.base_url}/pg/orders/x")
+        breaker = circuit_breakers.get_breaker("cashfree")
+        self.assertEqual(breaker.snapshot()["state"], "open")
+
+        with self.assertRaises(circuit_breakers.ProviderUnavailableError) as raised:
+            with circuit_breakers.guard("cashfree"):
+                self.fail("guarded block must not run while the breaker is open")
+        self.assertEqual(raised.exception.reason, "circuit_open")
+
+        user = User.objects.create_user(email="breaker@complia.in", password="pass123456")
+        PaymentPlan.objects.get_or_create(
+            key="single_use_notice_parse",
+            defaults={"name": "Single Use Parse", "amount_paise": 900, "credits": 1, "is_active": True, "is_default": True},
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.post("/api/v1/payments/orders/", {"plan_key": "single_use_notice_parse"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["code"], "payment_provider_unavailable")
+        self.assertIn("Retry-After", response)
+        self.assertEqual(http_client.outbound_http_metrics()[self.host]["requests"], 4)
+
+        ready = self.client.get("/api/v1/ready/").json()
+        self.assertEqual(ready["status"], "ok")
+        self.assertEqual(ready["circuit_breakers"]["cashfree"]["state"], "open")
+        self.assertEqual(ready["circuit_breakers"]["razorpay"]["state"], "closed")
+
+        breaker.opened_until = 0.0  # open period elapsed
+        with circuit_breakers.guard("cashfree"):
+            with self.assertRaises(circuit_breakers.ProviderUnavailableError):
+                with circuit_breakers.guard("cashfree"):
+                    pass  # only one half-open probe at a time
+            http_client.get("cashfree", f"{self.base_url}/pg/orders/x")
+        self.assertEqual(breaker.snapshot()["state"], "closed")
+
+    @override_settings(PROVIDER_BULKHEAD_MAX_CONCURRENT=1, PROVIDER_BULKHEAD_WAIT_SEC=0)
+    def test_bulkhead_rejects_calls_beyond_provider_concurrency(self):
+        with circuit_breakers.guard("azure_vision"):
+            with self.assertRaises(circuit_breakers.ProviderUnavailableError) as raised:
+                with circuit_breakers.guard("azure_vision"):
+                    pass
+            with circuit_breakers.guard("razorpay"):
+                pass
+        self.assertEqual(raised.exception.reason, "bulkhead_full")
+        with circuit_breakers.guard("azure_vision"):
+            pass
+        self.assertEqual(circuit_breakers.breaker_states()["azure_vision"]["rejected"], 1)
+
+    def test_unknown_provider_is_rejected(self):
+        with self.assertRaises(ValueError):
+            http_client.get("not_a_provider", f"{self.base_url}/page")
+
+    def test_superadmin_outbound_http_metrics(self):
+        http_client.get("notice_sources", f"{self.base_url}/page")
+        user = User.objects.create_user(email="user@complia.in", password="pass123456", user_type="taxpayer")
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/v1/admin/outbound-http/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(email="admin@complia.in", password="pass123456", user_type="admin")
+        self.client.force_authenticate(user=admin)
+        response = self.client.get("/api/v1/admin/outbound-http/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["hosts"][self.host]["requests"], 1)
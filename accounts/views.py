@@ -2,27 +2,35 @@ import base64
 import hashlib
 import hmac
 import json
+import os
 import uuid
 import csv
+import zlib
 from datetime import timedelta
 from io import StringIO
+from typing import Iterable, Iterator
 
 import requests
 from allauth.account import app_settings as allauth_account_settings
 from django.conf import settings
-from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.db import transaction
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.utils.crypto import constant_time_compare
 from dj_rest_auth.app_settings import api_settings as dj_rest_auth_api_settings
 from dj_rest_auth.registration.views import RegisterView
 from dj_rest_auth.utils import jwt_encode
-from rest_framework import filters, generics, mixins, permissions, status, viewsets
+from rest_framework import filters, generics, mixins, permissions, serializers, status, viewsets
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle as DRFScopedRateThrottle
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from complia_backend import circuit_breakers, http_client
+from complia_backend.notices.ocr_latency import ocr_latency_snapshot
+
 from .models import (
     AnalyticsEvent,
     AssistedOffer,
@@ -37,8 +45,18 @@ from .models import (
     UserEntitlement,
     WeeklyKpiSnapshot,
 )
+from .analytics_rollups import (
+    SEARCH_EVENT_NAMES,
+    refresh_analytics_rollups,
+    rollup_distinct_sessions,
+    rollup_event_count,
+    rollup_top_search_query,
+)
+from .parsers import NDJSONLineError, NDJSONParser
 from .permissions import IsSuperAdmin
-from .payment_ops import grant_parser_credits_once, is_failure_status, is_order_credit_eligible, is_success_status
+from .payment_ops import grant_parser_credits_once, is_order_credit_eligible
+from .payment_providers import cashfree_headers, cashfree_orders_url, razorpay_orders_url
+from .payment_webhooks import apply_webhook_inbox_row, parse_cashfree_webhook, parse_razorpay_webhook, record_webhook
 from .throttles import CompliaScopedRateThrottle
 from .serializers import (
     AdminAssistedIntentSerializer,
@@ -82,24 +100,20 @@ def _window_to_start(window: str) -> timezone.datetime:
     return now - timedelta(days=7)
 
 
-def _count_distinct_sessions(event_names: list[str], start: timezone.datetime) -> int:
-    return (
-        AnalyticsEvent.objects.filter(event_name__in=event_names, created_at__gte=start)
-        .values("session_id")
-        .distinct()
-        .count()
-    )
+def _wants_exact_distinct(request) -> bool:
+    value = (request.query_params.get("exact") or "").strip().lower()
+    return value in ("true", "1", "yes") or settings.ANALYTICS_EXACT_DISTINCT
 
 
-def _build_funnel(window: str) -> dict:
+def _build_funnel(window: str, exact: bool = False) -> dict:
     start = _window_to_start(window)
     steps = {
-        "search_performed": _count_distinct_sessions(["search_performed", "notice_search"], start),
-        "notice_opened": _count_distinct_sessions(["notice_opened", "notice_detail_viewed"], start),
-        "ca_help_started": _count_distinct_sessions(["ca_help_started"], start),
-        "ca_help_submitted": _count_distinct_sessions(["ca_help_submitted"], start),
-        "assisted_offer_seen": _count_distinct_sessions(["assisted_offer_seen"], start),
-        "assisted_offer_clicked": _count_distinct_sessions(["assisted_offer_clicked"], start),
+        "search_performed": rollup_distinct_sessions(["search_performed", "notice_search"], start, exact),
+        "notice_opened": rollup_distinct_sessions(["notice_opened", "notice_detail_viewed"], start, exact),
+        "ca_help_started": rollup_distinct_sessions(["ca_help_started"], start, exact),
+        "ca_help_submitted": rollup_distinct_sessions(["ca_help_submitted"], start, exact),
+        "assisted_offer_seen": rollup_distinct_sessions(["assisted_offer_seen"], start, exact),
+        "assisted_offer_clicked": rollup_distinct_sessions(["assisted_offer_clicked"], start, exact),
     }
     base = steps["search_performed"] or 1
     conversion_rates = {
@@ -112,6 +126,7 @@ def _build_funnel(window: str) -> dict:
         "to": timezone.now(),
         "steps": steps,
         "conversion_rates": conversion_rates,
+        "distinct_mode": "exact" if exact else "approximate",
     }
 
 
@@ -121,19 +136,14 @@ def _weekly_bounds(reference: timezone.datetime) -> tuple:
     return week_start, week_end
 
 
-def _compute_kpi_metrics(window: str) -> dict:
+def _compute_kpi_metrics(window: str, exact: bool = False) -> dict:
     start = _window_to_start(window)
 
-    unique_visitors = (
-        AnalyticsEvent.objects.filter(created_at__gte=start)
-        .values("session_id")
-        .distinct()
-        .count()
-    )
-    searches = AnalyticsEvent.objects.filter(created_at__gte=start, event_name__in=["search_performed", "notice_search"]).count()
-    details = AnalyticsEvent.objects.filter(created_at__gte=start, event_name__in=["notice_opened", "notice_detail_viewed"]).count()
-    ca_submits = AnalyticsEvent.objects.filter(created_at__gte=start, event_name="ca_help_submitted").count()
-    assisted_clicks = AnalyticsEvent.objects.filter(created_at__gte=start, event_name="assisted_offer_clicked").count()
+    unique_visitors = rollup_distinct_sessions(start=start, exact=exact)
+    searches = rollup_event_count(SEARCH_EVENT_NAMES, start)
+    details = rollup_event_count(["notice_opened", "notice_detail_viewed"], start)
+    ca_submits = rollup_event_count(["ca_help_submitted"], start)
+    assisted_clicks = rollup_event_count(["assisted_offer_clicked"], start)
 
     return {
         "unique_visitors": unique_visitors,
@@ -178,22 +188,6 @@ def _ensure_default_payment_plan() -> PaymentPlan:
     )
 
 
-def _cashfree_base_url() -> str:
-    env = getattr(settings, "CASHFREE_ENV", "sandbox").strip().lower()
-    if env == "production":
-        return "https://api.cashfree.com/pg/orders"
-    return "https://sandbox.cashfree.com/pg/orders"
-
-
-def _cashfree_headers() -> dict:
-    return {
-        "x-client-id": settings.CASHFREE_APP_ID,
-        "x-client-secret": settings.CASHFREE_SECRET_KEY,
-        "x-api-version": "2023-08-01",
-        "content-type": "application/json",
-    }
-
-
 def _payment_provider_default() -> str:
     provider = (getattr(settings, "PAYMENT_PROVIDER_DEFAULT", "cashfree") or "cashfree").strip().lower()
     if provider not in {"cashfree", "razorpay"}:
@@ -208,8 +202,20 @@ def _resolve_provider(requested_provider: str = "") -> str:
     return _payment_provider_default()
 
 
-def _razorpay_order_url() -> str:
-    return "https://api.razorpay.com/v1/orders"
+def _payment_provider_unavailable(payment_order, exc: circuit_breakers.ProviderUnavailableError) -> Response:
+    """Fast-fail response while the provider's circuit breaker is open or its bulkhead is full."""
+    payment_order.status = "failed"
+    payment_order.failure_reason = f"{exc.provider} temporarily unavailable ({exc.reason})."
+    payment_order.save(update_fields=["status", "failure_reason", "updated_at"])
+    return Response(
+        {
+            "status": "error",
+            "message": "Payment provider is temporarily unavailable. Please retry in a minute.",
+            "code": "payment_provider_unavailable",
+        },
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(max(int(exc.retry_after) + 1, 1))},
+    )
 
 
 def _razorpay_checkout_config(plan) -> dict:
@@ -290,15 +296,51 @@ def _cashfree_signature_valid(raw_body: bytes, signature: str, timestamp: str =
     return False
 
 
-def _csv_response(filename: str, headers: list[str], rows: list[list[str]]) -> HttpResponse:
+def _iter_csv_chunks(headers: list[str], rows: Iterable[list[str]], rows_per_chunk: int) -> Iterator[bytes]:
     buffer = StringIO()
     writer = csv.writer(buffer)
     writer.writerow(headers)
+    # Send the header before the first query runs so the download starts immediately.
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate(0)
+
+    pending = 0
     for row in rows:
         writer.writerow(row)
-
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv; charset=utf-8")
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    if pending:
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        # Sync-flush each chunk so compressed bytes reach the client as rows are produced.
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _csv_response(request, filename: str, headers: list[str], rows: Iterable[list[str]]) -> StreamingHttpResponse:
+    """
+    Streams a CSV download, gzip-encoded when the client accepts it and CSV_EXPORT_GZIP is on.
+    `rows` is consumed lazily, so pass a generator over `queryset.iterator(...)`.
+    """
+    chunks = _iter_csv_chunks(headers, rows, max(int(settings.CSV_EXPORT_CHUNK_SIZE), 1))
+    accepts_gzip = "gzip" in (request.META.get("HTTP_ACCEPT_ENCODING") or "").lower()
+    use_gzip = settings.CSV_EXPORT_GZIP and accepts_gzip
+    response = StreamingHttpResponse(_iter_gzip(chunks) if use_gzip else chunks, content_type="text/csv; charset=utf-8")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
     return response
 
 
@@ -313,10 +355,10 @@ class GoogleLogin(APIView):
             return Response({"detail": "access_token is required."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            google_response = requests.get(
+            google_response = http_client.get(
+                "google_auth",
                 "https://www.googleapis.com/oauth2/v3/userinfo",
                 headers={"Authorization": f"Bearer {access_token}"},
-                timeout=8,
             )
         except requests.RequestException:
             return Response({"detail": "Could not reach Google auth service."}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -407,22 +449,7 @@ class SuperAdminCAPanelViewSet(
     ordering = ["display_name", "email"]
 
     def get_queryset(self):
-        eligible_users = User.objects.filter(user_type="ca", is_verified_ca=True).exclude(email="")
-        existing_user_ids = set(
-            CAPanelProfile.objects.exclude(user__isnull=True).values_list("user_id", flat=True)
-        )
-        missing_profiles = [user for user in eligible_users if user.id not in existing_user_ids]
-        for user in missing_profiles:
-            display_name = f"{user.first_name} {user.last_name}".strip() or user.email.split("@")[0]
-            CAPanelProfile.objects.get_or_create(
-                user=user,
-                defaults={
-                    "display_name": display_name,
-                    "email": user.email,
-                    "phone_number": user.phone_number or "",
-                    "is_active": True,
-                },
-            )
+        # Profiles for verified CAs are created by the User post_save signal and sync_ca_panel_profiles.
         queryset = CAPanelProfile.objects.select_related("user").all()
         status_filter = (self.request.query_params.get("status") or "").strip()
         if status_filter == "active":
@@ -443,6 +470,56 @@ class AnalyticsEventCreateView(generics.CreateAPIView):
         serializer.save(user=user)
 
 
+class AnalyticsEventBatchCreateView(generics.GenericAPIView):
+    """
+    Accepts up to ANALYTICS_BATCH_MAX_EVENTS events as a JSON list, {"events": [...]}, or NDJSON.
+    Valid events are inserted together; invalid ones are reported by index without failing the batch.
+    """
+
+    serializer_class = AnalyticsEventSerializer
+    permission_classes = [permissions.AllowAny]
+    parser_classes = [JSONParser, NDJSONParser]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "analytics_event_batch"
+
+    def post(self, request):
+        items = request.data.get("events") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            raise serializers.ValidationError({"events": ["Expected a list of events."]})
+        max_events = max(int(settings.ANALYTICS_BATCH_MAX_EVENTS), 1)
+        if len(items) > max_events:
+            raise serializers.ValidationError({"events": [f"A batch may contain at most {max_events} events."]})
+
+        user = request.user if request.user.is_authenticated else None
+        accepted = []
+        rejected = []
+        for index, item in enumerate(items):
+            if isinstance(item, NDJSONLineError):
+                rejected.append({"index": index, "errors": {"non_field_errors": [item.message]}})
+                continue
+            if not isinstance(item, dict):
+                rejected.append({"index": index, "errors": {"non_field_errors": ["Expected an event object."]}})
+                continue
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                accepted.append(AnalyticsEvent(user=user, **serializer.validated_data))
+            else:
+                rejected.append({"index": index, "errors": serializer.errors})
+
+        if accepted:
+            with transaction.atomic():
+                AnalyticsEvent.objects.bulk_create(accepted, batch_size=500)
+
+        return Response(
+            {
+                "accepted": len(accepted),
+                "rejected": len(rejected),
+                "rejected_events": rejected,
+            },
+            status=status.HTTP_201_CREATED if accepted else status.HTTP_200_OK,
+        )
+
+
 class AssistedIntentCreateView(generics.CreateAPIView):
     serializer_class = AssistedIntentSerializer
     permission_classes = [permissions.AllowAny]
@@ -622,12 +699,15 @@ class PaymentOrderCreateView(generics.GenericAPIView):
                 )
 
             try:
-                cf_response = requests.post(
-                    _cashfree_base_url(),
-                    headers=_cashfree_headers(),
-                    data=json.dumps(payload),
-                    timeout=15,
-                )
+                with circuit_breakers.guard("cashfree"):
+                    cf_response = http_client.post(
+                        "cashfree",
+                        cashfree_orders_url(),
+                        headers=cashfree_headers(),
+                        data=json.dumps(payload),
+                    )
+            except circuit_breakers.ProviderUnavailableError as exc:
+                return _payment_provider_unavailable(payment_order, exc)
             except requests.RequestException:
                 payment_order.status = "failed"
                 payment_order.failure_reason = "Could not connect to Cashfree."
@@ -728,12 +808,15 @@ class PaymentOrderCreateView(generics.GenericAPIView):
             )
 
         try:
-            rzp_response = requests.post(
-                _razorpay_order_url(),
-                auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
-                json=payload,
-                timeout=15,
-            )
+            with circuit_breakers.guard("razorpay"):
+                rzp_response = http_client.post(
+                    "razorpay",
+                    razorpay_orders_url(),
+                    auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET),
+                    json=payload,
+                )
+        except circuit_breakers.ProviderUnavailableError as exc:
+            return _payment_provider_unavailable(payment_order, exc)
         except requests.RequestException:
             payment_order.status = "failed"
             payment_order.failure_reason = "Could not connect to Razorpay."
@@ -907,6 +990,39 @@ class PaymentTestConfirmView(generics.GenericAPIView):
         )
 
 
+def _accept_payment_webhook(provider: str, parsed: dict, payload: dict) -> Response:
+    """
+    Stores a verified webhook in the inbox and acknowledges it. With PAYMENT_WEBHOOK_ASYNC_ENABLED
+    the apply_payment_webhooks command applies it later; otherwise it is applied before answering.
+    """
+    if not parsed["provider_order_id"]:
+        return Response(
+            {
+                "status": "error",
+                "message": "Missing order reference.",
+                "code": "missing_order_id",
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    inbox, created = record_webhook(provider, parsed, payload)
+    if settings.PAYMENT_WEBHOOK_ASYNC_ENABLED or inbox.processed_at:
+        return Response({"status": "ok", "duplicate": not created}, status=status.HTTP_200_OK)
+
+    outcome = apply_webhook_inbox_row(inbox.id)
+    if outcome == "retry":
+        # Nothing was applied; a 5xx makes the provider redeliver, which retries this inbox row.
+        return Response(
+            {
+                "status": "error",
+                "message": "Webhook could not be applied. Please retry.",
+                "code": "webhook_apply_failed",
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return Response({"status": "ok", "duplicate": outcome == "duplicate"}, status=status.HTTP_200_OK)
+
+
 class CashfreeWebhookView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
     throttle_classes = [ScopedRateThrottle]
@@ -933,90 +1049,7 @@ class CashfreeWebhookView(generics.GenericAPIView):
             )
 
         payload = request.data or {}
-        data = payload.get("data", {})
-        order_data = data.get("order", {})
-        payment_data = data.get("payment", {})
-
-        provider_order_id = (
-            order_data.get("order_id")
-            or payload.get("order_id")
-            or payload.get("cf_order_id")
-            or ""
-        ).strip()
-        provider_payment_id = (
-            payment_data.get("cf_payment_id")
-            or payment_data.get("payment_id")
-            or payload.get("cf_payment_id")
-            or ""
-        ).strip()
-        provider_status = (
-            payment_data.get("payment_status")
-            or order_data.get("order_status")
-            or payload.get("payment_status")
-            or payload.get("order_status")
-            or payload.get("type")
-            or ""
-        ).strip()
-
-        if not provider_order_id:
-            return Response(
-                {
-                    "status": "error",
-                    "message": "Missing order reference.",
-                    "code": "missing_order_id",
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        payment_order = PaymentOrder.objects.filter(
-            Q(order_id=provider_order_id) | Q(provider_order_id=provider_order_id)
-        ).first()
-        if not payment_order:
-            return Response({"status": "ok"}, status=status.HTTP_200_OK)
-
-        idempotency_key = f"{provider_order_id}:{provider_payment_id or 'no-payment-id'}:{provider_status or 'unknown'}"
-        transaction_row, created = PaymentTransaction.objects.get_or_create(
-            idempotency_key=idempotency_key,
-            defaults={
-                "payment_order": payment_order,
-                "provider_payment_id": provider_payment_id,
-                "provider_status": provider_status,
-                "signature_verified": True,
-                "payload": payload,
-                "processed_at": timezone.now(),
-            },
-        )
-
-        if not created:
-            return Response({"status": "ok", "duplicate": True}, status=status.HTTP_200_OK)
-
-        if is_success_status(provider_status):
-            grant_parser_credits_once(payment_order)
-            AnalyticsEvent.objects.create(
-                user=payment_order.user,
-                session_id=f"pay-{payment_order.order_id}",
-                event_name="payment_success",
-                path="/payments/webhook",
-                metadata={"order_id": payment_order.order_id, "plan_key": payment_order.plan.key},
-            )
-        elif is_failure_status(provider_status):
-            payment_order.status = "failed"
-            payment_order.failure_reason = provider_status or "Payment failed"
-            payment_order.save(update_fields=["status", "failure_reason", "updated_at"])
-            AnalyticsEvent.objects.create(
-                user=payment_order.user,
-                session_id=f"pay-{payment_order.order_id}",
-                event_name="payment_failed",
-                path="/payments/webhook",
-                metadata={"order_id": payment_order.order_id, "plan_key": payment_order.plan.key},
-            )
-        else:
-            payment_order.status = "payment_pending"
-            payment_order.save(update_fields=["status", "updated_at"])
-
-        transaction_row.processed_at = timezone.now()
-        transaction_row.save(update_fields=["processed_at"])
-        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+        return _accept_payment_webhook("cashfree", parse_cashfree_webhook(payload), payload)
 
 
 class RazorpayWebhookView(generics.GenericAPIView):
@@ -1039,90 +1072,7 @@ class RazorpayWebhookView(generics.GenericAPIView):
             )
 
         payload = request.data or {}
-        event_name = (payload.get("event") or "").strip()
-        body_payload = payload.get("payload", {}) if isinstance(payload, dict) else {}
-
-        payment_entity = (body_payload.get("payment", {}) or {}).get("entity", {})
-        order_entity = (body_payload.get("order", {}) or {}).get("entity", {})
-
-        provider_order_id = (
-            payment_entity.get("order_id")
-            or order_entity.get("id")
-            or ""
-        ).strip()
-        provider_payment_id = (payment_entity.get("id") or "").strip()
-        provider_status = (
-            payment_entity.get("status")
-            or order_entity.get("status")
-            or event_name
-            or ""
-        ).strip()
-
-        if not provider_order_id:
-            return Response(
-                {
-                    "status": "error",
-                    "message": "Missing order reference.",
-                    "code": "missing_order_id",
-                },
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        payment_order = PaymentOrder.objects.filter(
-            Q(provider_order_id=provider_order_id) | Q(order_id=provider_order_id)
-        ).first()
-        if not payment_order:
-            return Response({"status": "ok"}, status=status.HTTP_200_OK)
-
-        success_event = event_name in {"payment.captured", "order.paid", "payment.authorized"}
-        failed_event = event_name in {"payment.failed"}
-        if success_event and provider_status.lower() not in {"captured", "paid", "completed"}:
-            provider_status = "CAPTURED"
-        elif failed_event:
-            provider_status = payment_entity.get("error_reason") or "FAILED"
-
-        idempotency_key = f"rzp:{provider_order_id}:{provider_payment_id or 'no-payment-id'}:{event_name or provider_status or 'unknown'}"
-        transaction_row, created = PaymentTransaction.objects.get_or_create(
-            idempotency_key=idempotency_key,
-            defaults={
-                "payment_order": payment_order,
-                "provider_payment_id": provider_payment_id,
-                "provider_status": provider_status,
-                "signature_verified": True,
-                "payload": payload,
-                "processed_at": timezone.now(),
-            },
-        )
-        if not created:
-            return Response({"status": "ok", "duplicate": True}, status=status.HTTP_200_OK)
-
-        if is_success_status(provider_status) or success_event:
-            grant_parser_credits_once(payment_order)
-            AnalyticsEvent.objects.create(
-                user=payment_order.user,
-                session_id=f"pay-{payment_order.order_id}",
-                event_name="payment_success",
-                path="/payments/webhook/razorpay",
-                metadata={"order_id": payment_order.order_id, "plan_key": payment_order.plan.key},
-            )
-        elif is_failure_status(provider_status) or failed_event:
-            payment_order.status = "failed"
-            payment_order.failure_reason = provider_status or "Payment failed"
-            payment_order.save(update_fields=["status", "failure_reason", "updated_at"])
-            AnalyticsEvent.objects.create(
-                user=payment_order.user,
-                session_id=f"pay-{payment_order.order_id}",
-                event_name="payment_failed",
-                path="/payments/webhook/razorpay",
-                metadata={"order_id": payment_order.order_id, "plan_key": payment_order.plan.key},
-            )
-        else:
-            payment_order.status = "payment_pending"
-            payment_order.save(update_fields=["status", "updated_at"])
-
-        transaction_row.processed_at = timezone.now()
-        transaction_row.save(update_fields=["processed_at"])
-        return Response({"status": "ok"}, status=status.HTTP_200_OK)
+        return _accept_payment_webhook("razorpay", parse_razorpay_webhook(payload), payload)
 
 
 class MyEntitlementsView(generics.GenericAPIView):
@@ -1237,8 +1187,11 @@ class SuperAdminMetricsView(generics.GenericAPIView):
     def get(self, request):
         now = timezone.now()
         live_window_start = now - timedelta(minutes=2)
+        refresh_analytics_rollups(max_batches=settings.ANALYTICS_ROLLUP_READ_BATCHES)
 
-        total_visitors = AnalyticsEvent.objects.values("session_id").distinct().count()
+        exact = _wants_exact_distinct(request)
+        total_visitors = rollup_distinct_sessions(exact=exact)
+        # The live window is shorter than a rollup bucket; the created_at index keeps this scan small.
         live_visitors = (
             AnalyticsEvent.objects.filter(created_at__gte=live_window_start)
             .values("session_id")
@@ -1246,28 +1199,15 @@ class SuperAdminMetricsView(generics.GenericAPIView):
             .count()
         )
 
-        top_search = (
-            AnalyticsEvent.objects.filter(event_name__in=["search_performed", "notice_search"])
-            .values("metadata__query")
-            .annotate(total=Count("id"))
-            .order_by("-total")
-            .first()
-        )
-
-        top_notice = top_search["metadata__query"] if top_search and top_search["metadata__query"] else "N/A"
-        top_notice_count = top_search["total"] if top_search else 0
+        top_query, top_notice_count = rollup_top_search_query()
+        top_notice = top_query or "N/A"
 
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        visitors_today = (
-            AnalyticsEvent.objects.filter(created_at__gte=today_start)
-            .values("session_id")
-            .distinct()
-            .count()
-        )
+        visitors_today = rollup_distinct_sessions(start=today_start, exact=exact)
 
-        total_searches = AnalyticsEvent.objects.filter(event_name__in=["search_performed", "notice_search"]).count()
-        total_notice_views = AnalyticsEvent.objects.filter(event_name__in=["notice_opened", "notice_detail_viewed"]).count()
-        total_ca_help_submissions = AnalyticsEvent.objects.filter(event_name="ca_help_submitted").count()
+        total_searches = rollup_event_count(SEARCH_EVENT_NAMES)
+        total_notice_views = rollup_event_count(["notice_opened", "notice_detail_viewed"])
+        total_ca_help_submissions = rollup_event_count(["ca_help_submitted"])
 
         return Response(
             {
@@ -1279,6 +1219,27 @@ class SuperAdminMetricsView(generics.GenericAPIView):
                 "total_searches": total_searches,
                 "total_notice_views": total_notice_views,
                 "ca_help_submissions": total_ca_help_submissions,
+                "distinct_mode": "exact" if exact else "approximate",
+            }
+        )
+
+
+class SuperAdminOutboundHttpMetricsView(generics.GenericAPIView):
+    """
+    Per-host outbound HTTP stats (latency, errors, keep-alive reuse) and OCR latency histograms
+    for the serving process.
+    """
+
+    permission_classes = [IsSuperAdmin]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "admin_metrics"
+
+    def get(self, request):
+        return Response(
+            {
+                "pid": os.getpid(),
+                "hosts": http_client.outbound_http_metrics(),
+                "ocr_latency": ocr_latency_snapshot(),
             }
         )
 
@@ -1292,7 +1253,8 @@ class SuperAdminFunnelView(generics.GenericAPIView):
         window = request.query_params.get("window", "7d")
         if window not in {"7d", "30d"}:
             window = "7d"
-        return Response(_build_funnel(window))
+        refresh_analytics_rollups(max_batches=settings.ANALYTICS_ROLLUP_READ_BATCHES)
+        return Response(_build_funnel(window, _wants_exact_distinct(request)))
 
 
 class SuperAdminKpiView(generics.GenericAPIView):
@@ -1305,12 +1267,13 @@ class SuperAdminKpiView(generics.GenericAPIView):
         if window not in {"7d", "30d"}:
             window = "7d"
 
+        refresh_analytics_rollups(max_batches=settings.ANALYTICS_ROLLUP_READ_BATCHES)
         _ensure_weekly_snapshot()
         snapshots = WeeklyKpiSnapshot.objects.all()[:8]
         return Response(
             {
                 "window": window,
-                "current": _compute_kpi_metrics(window),
+                "current": _compute_kpi_metrics(window, _wants_exact_distinct(request)),
                 "weekly_snapshots": WeeklyKpiSnapshotSerializer(snapshots, many=True).data,
             }
         )
@@ -1344,7 +1307,7 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        rows = [
+        rows = (
             [
                 str(item.id),
                 item.notice_code,
@@ -1363,9 +1326,10 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                 item.closed_at.isoformat() if item.closed_at else "",
                 item.created_at.isoformat(),
             ]
-            for item in queryset
-        ]
+            for item in queryset.iterator(chunk_size=settings.CSV_EXPORT_CHUNK_SIZE)
+        )
         return _csv_response(
+            request,
             "complia_ca_requests.csv",
             [
                 "id",
@@ -1394,7 +1358,7 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        rows = [
+        rows = (
             [
                 str(item.id),
                 item.notice_code_snapshot or "",
@@ -1407,9 +1371,10 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                 item.experiment_variant or "",
                 item.created_at.isoformat(),
             ]
-            for item in queryset
-        ]
+            for item in queryset.iterator(chunk_size=settings.CSV_EXPORT_CHUNK_SIZE)
+        )
         return _csv_response(
+            request,
             "complia_assisted_intents.csv",
             [
                 "id",
@@ -1434,7 +1399,7 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        rows = [
+        rows = (
             [
                 str(item.id),
                 item.notice.code if item.notice else "",
@@ -1444,9 +1409,10 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                 (item.comments or "").replace("\n", " ").strip(),
                 item.created_at.isoformat(),
             ]
-            for item in queryset
-        ]
+            for item in queryset.iterator(chunk_size=settings.CSV_EXPORT_CHUNK_SIZE)
+        )
         return _csv_response(
+            request,
             "complia_feedback.csv",
             ["id", "notice_code", "notice_title", "is_helpful", "status", "comments", "created_at"],
             rows,
@@ -1463,7 +1429,7 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
         elif status_filter == "unverified":
             queryset = queryset.filter(verified_at__isnull=True)
 
-        rows = [
+        rows = (
             [
                 str(item.id),
                 item.code,
@@ -1474,9 +1440,10 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                 item.verified_at.isoformat() if item.verified_at else "",
                 item.updated_at.isoformat(),
             ]
-            for item in queryset
-        ]
+            for item in queryset.iterator(chunk_size=settings.CSV_EXPORT_CHUNK_SIZE)
+        )
         return _csv_response(
+            request,
             "complia_notice_qa.csv",
             ["id", "code", "title", "severity", "is_active", "verified_by", "verified_at", "updated_at"],
             rows,
@@ -1490,11 +1457,10 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
 
-        rows = []
-        for item in queryset:
-            extraction = getattr(item, "extraction", None)
-            rows.append(
-                [
+        def iter_rows():
+            for item in queryset.iterator(chunk_size=settings.CSV_EXPORT_CHUNK_SIZE):
+                extraction = getattr(item, "extraction", None)
+                yield [
                     str(item.id),
                     item.original_filename,
                     item.notice.code if item.notice else "",
@@ -1506,9 +1472,9 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                     extraction.review_status if extraction else "",
                     item.created_at.isoformat(),
                 ]
-            )
 
         return _csv_response(
+            request,
             "complia_parser_jobs.csv",
             [
                 "id",
@@ -1522,7 +1488,7 @@ class SuperAdminCsvExportView(generics.GenericAPIView):
                 "extraction_review_status",
                 "created_at",
             ],
-            rows,
+            iter_rows(),
         )
 
 
@@ -0,0 +1,168 @@
+"""
+Per-provider circuit breakers and bulkheads for outbound calls.
+
+`http_client.request` reports every call's outcome for providers listed in `BREAKER_PROVIDERS`:
+responses >= 500 or 429, transport errors and calls slower than CIRCUIT_BREAKER_SLOW_CALL_SEC
+count as failures. When the failure rate over the last CIRCUIT_BREAKER_WINDOW calls reaches
+CIRCUIT_BREAKER_FAILURE_RATE the breaker opens and `guard()` fails fast for
+CIRCUIT_BREAKER_OPEN_SEC. After that, CIRCUIT_BREAKER_HALF_OPEN_CALLS probe calls are let
+through. If all of them succeed the breaker closes, and any failure opens it again.
+
+`guard()` is also the bulkhead: at most PROVIDER_BULKHEAD_MAX_CONCURRENT guarded calls per
+provider run at once in this process. A call that cannot get a slot within
+PROVIDER_BULKHEAD_WAIT_SEC is rejected instead of tying up another worker on a sick dependency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+
+BREAKER_PROVIDERS = ("google_vision", "azure_vision", "cashfree", "razorpay")
+
+
+class ProviderUnavailableError(Exception):
+    """Raised by `guard()` when a provider's breaker is open or its bulkhead is full."""
+
+    def __init__(self, provider: str, reason: str, retry_after: float = 0.0):
+        self.provider = provider
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{provider} unavailable ({reason})")
+
+
+class CircuitBreaker:
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.state = "closed"
+        self.opened_until = 0.0
+        self._outcomes: deque[bool] = deque(maxlen=max(int(settings.CIRCUIT_BREAKER_WINDOW), 1))
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self._bulkhead = threading.BoundedSemaphore(max(int(settings.PROVIDER_BULKHEAD_MAX_CONCURRENT), 1))
+        self._in_flight = 0
+        self.rejected = 0
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_until = time.monotonic() + max(float(settings.CIRCUIT_BREAKER_OPEN_SEC), 0.0)
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    def _admit(self) -> bool:
+        """Returns True when the call is a half-open probe; raises when the breaker rejects it."""
+        with self._lock:
+            if self.state == "open":
+                retry_after = self.opened_until - time.monotonic()
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise ProviderUnavailableError(self.provider, "circuit_open", retry_after)
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probes_in_flight >= max(int(settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS), 1):
+                    self.rejected += 1
+                    raise ProviderUnavailableError(self.provider, "circuit_half_open")
+                self._probes_in_flight += 1
+                return True
+            return False
+
+    def record(self, failed: bool, elapsed_sec: float) -> None:
+        failed = failed or elapsed_sec >= float(settings.CIRCUIT_BREAKER_SLOW_CALL_SEC)
+        with self._lock:
+            if self.state == "open":
+                return
+            if self.state == "half_open":
+                if failed:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= max(int(settings.CIRCUIT_BREAKER_HALF_OPEN_CALLS), 1):
+                    self.state = "closed"
+                    self._outcomes.clear()
+                return
+            self._outcomes.append(failed)
+            calls = len(self._outcomes)
+            if calls >= max(int(settings.CIRCUIT_BREAKER_MIN_CALLS), 1):
+                if sum(self._outcomes) / calls >= float(settings.CIRCUIT_BREAKER_FAILURE_RATE):
+                    self._open()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        probe = self._admit()
+        try:
+            if not self._bulkhead.acquire(timeout=max(float(settings.PROVIDER_BULKHEAD_WAIT_SEC), 0.0)):
+                with self._lock:
+                    self.rejected += 1
+                raise ProviderUnavailableError(self.provider, "bulkhead_full")
+            with self._lock:
+                self._in_flight += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._bulkhead.release()
+        finally:
+            if probe:
+                with self._lock:
+                    self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = len(self._outcomes)
+            state = self.state
+            if state == "open" and self.opened_until <= time.monotonic():
+                state = "half_open"
+            return {
+                "state": state,
+                "failure_rate": round(sum(self._outcomes) / calls, 3) if calls else 0.0,
+                "calls": calls,
+                "in_flight": self._in_flight,
+                "rejected": self.rejected,
+                "retry_after_sec": round(max(self.opened_until - time.monotonic(), 0.0), 1) if state == "open" else 0.0,
+            }
+
+
+_breakers_lock = threading.Lock()
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    breaker = _breakers.get(provider)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(provider)
+        return _breakers[provider]
+
+
+@contextmanager
+def guard(provider: str) -> Iterator[None]:
+    """Runs the block under `provider`'s breaker and bulkhead; raises ProviderUnavailableError to fail fast."""
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        yield
+        return
+    with get_breaker(provider).guard():
+        yield
+
+
+def record(provider: str, failed: bool, elapsed_sec: float) -> None:
+    if provider in BREAKER_PROVIDERS and settings.CIRCUIT_BREAKER_ENABLED:
+        get_breaker(provider).record(failed, elapsed_sec)
+
+
+def breaker_states() -> dict[str, dict]:
+    """Per-provider breaker state for this process (providers without calls yet report closed)."""
+    return {provider: get_breaker(provider).snapshot() for provider in BREAKER_PROVIDERS}
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
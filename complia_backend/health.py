@@ -4,6 +4,8 @@ from django.db import connections
 from django.db.utils import OperationalError
 from django.http import JsonResponse
 
+from complia_backend.circuit_breakers import breaker_states
+
 
 def health_check(_request):
     """
@@ -34,11 +36,14 @@ def readiness_check(_request):
             status=503,
         )
 
+    # Breaker state is reported, not gated on: an open OCR/payment breaker degrades those
+    # features but the instance can still serve everything else.
     return JsonResponse(
         {
             "status": "ok",
             "checks": {
                 "database": "ok",
             },
+            "circuit_breakers": breaker_states(),
         }
     )
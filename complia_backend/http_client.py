@@ -0,0 +1,222 @@
+"""
+Shared outbound HTTP client.
+
+Every third-party call (OCR, payment providers, Google auth, notice source monitoring) goes
+through one pooled `requests.Session` per provider. Sessions keep per-host keep-alive pools,
+apply the provider's retry/backoff policy and default timeout, and record per-host latency and
+connection reuse for `outbound_http_metrics()`. Call outcomes also feed the provider's circuit
+breaker (see `circuit_breakers`).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from complia_backend import circuit_breakers
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# retries: attempts after the first one.
+# retry_methods: methods safe to retry after the request reached the provider; connection
+#   failures (nothing was sent) are retried for every method.
+# timeout_setting: settings attribute used when the caller does not pass `timeout`.
+PROVIDER_POLICIES = {
+    "google_vision": {
+        "retries": 2,
+        "retry_methods": frozenset({"POST"}),
+        "timeout_setting": "OCR_REQUEST_TIMEOUT_SEC",
+    },
+    "azure_vision": {
+        # Re-POSTing analyze only starts a duplicate read operation, and status polls are GETs.
+        "retries": 2,
+        "retry_methods": frozenset({"GET", "POST"}),
+        "timeout_setting": "OCR_REQUEST_TIMEOUT_SEC",
+    },
+    "cashfree": {
+        # Order creation is not idempotent: only retry when the request never left.
+        "retries": 1,
+        "retry_methods": frozenset(),
+        "timeout_setting": "PAYMENT_PROVIDER_TIMEOUT_SEC",
+    },
+    "razorpay": {
+        "retries": 1,
+        "retry_methods": frozenset(),
+        "timeout_setting": "PAYMENT_PROVIDER_TIMEOUT_SEC",
+    },
+    "google_auth": {
+        "retries": 1,
+        "retry_methods": frozenset({"GET"}),
+        "timeout_setting": "GOOGLE_AUTH_TIMEOUT_SEC",
+    },
+    "notice_sources": {
+        "retries": 2,
+        "retry_methods": frozenset({"GET", "HEAD"}),
+        "timeout_setting": "NOTICE_SOURCE_CHECK_TIMEOUT_SEC",
+    },
+}
+
+_sessions_lock = threading.Lock()
+_sessions: dict[str, requests.Session] = {}
+_sessions_pid: int | None = None
+
+_metrics_lock = threading.Lock()
+_host_metrics: dict[str, dict] = {}
+
+
+def _retry_policy(policy: dict) -> Retry:
+    retries = max(int(policy["retries"]), 0)
+    retry_methods = policy["retry_methods"]
+    return Retry(
+        total=retries,
+        connect=retries,
+        read=retries if retry_methods else 0,
+        status=retries if retry_methods else 0,
+        # Connection-only policies: urllib3 reads an empty allowed_methods as "every method" (and
+        # warns that this changes in v3), so name one explicitly. read=0/status=0 already stop any
+        # retry once the request was sent; connect retries do not consult allowed_methods.
+        allowed_methods=retry_methods or frozenset({"GET"}),
+        status_forcelist=RETRYABLE_STATUS_CODES,
+        backoff_factor=max(float(settings.HTTP_RETRY_BACKOFF_SEC), 0.0),
+        respect_retry_after_header=True,
+        # Hand the last response back so callers keep their own status-code handling.
+        raise_on_status=False,
+    )
+
+
+def _build_session(provider: str) -> requests.Session:
+    adapter = HTTPAdapter(
+        pool_connections=max(int(settings.HTTP_POOL_CONNECTIONS), 1),
+        pool_maxsize=max(int(settings.HTTP_POOL_MAXSIZE), 1),
+        max_retries=_retry_policy(PROVIDER_POLICIES[provider]),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(provider: str) -> requests.Session:
+    """
+    Returns the pooled session for `provider`, creating it on first use.
+    Sessions are rebuilt after a fork so worker processes never share parent sockets.
+    """
+    global _sessions_pid
+    if provider not in PROVIDER_POLICIES:
+        raise ValueError(f"Unknown outbound HTTP provider: {provider}")
+    pid = os.getpid()
+    session = _sessions.get(provider) if _sessions_pid == pid else None
+    if session is not None:
+        return session
+    with _sessions_lock:
+        if _sessions_pid != pid:
+            _sessions.clear()
+            _sessions_pid = pid
+        session = _sessions.get(provider)
+        if session is None:
+            session = _build_session(provider)
+            _sessions[provider] = session
+        return session
+
+
+def reset_sessions() -> None:
+    """Closes pooled connections; sessions are rebuilt lazily on next use."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+    with _metrics_lock:
+        _host_metrics.clear()
+
+
+def _record(provider: str, url: str, elapsed_ms: float, failed: bool) -> None:
+    host = urlsplit(url).netloc or url
+    with _metrics_lock:
+        stats = _host_metrics.setdefault(
+            host,
+            {
+                "provider": provider,
+                "requests": 0,
+                "errors": 0,
+                "total_latency_ms": 0.0,
+                "max_latency_ms": 0.0,
+            },
+        )
+        stats["requests"] += 1
+        stats["errors"] += 1 if failed else 0
+        stats["total_latency_ms"] += elapsed_ms
+        stats["max_latency_ms"] = max(stats["max_latency_ms"], elapsed_ms)
+
+
+def request(provider: str, method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Sends a request through the provider's pooled session.
+    Raises requests.RequestException like `requests.request` once retries are exhausted.
+    """
+    session = get_session(provider)
+    if kwargs.get("timeout") is None:
+        kwargs["timeout"] = max(int(getattr(settings, PROVIDER_POLICIES[provider]["timeout_setting"])), 1)
+    started = time.perf_counter()
+    failed = True
+    throttled = False
+    try:
+        response = session.request(method, url, **kwargs)
+        failed = response.status_code >= 500
+        throttled = response.status_code == 429
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        _record(provider, url, elapsed * 1000, failed)
+        circuit_breakers.record(provider, failed or throttled, elapsed)
+
+
+def get(provider: str, url: str, **kwargs) -> requests.Response:
+    return request(provider, "GET", url, **kwargs)
+
+
+def post(provider: str, url: str, **kwargs) -> requests.Response:
+    return request(provider, "POST", url, **kwargs)
+
+
+def _pool_stats() -> dict[str, dict[str, int]]:
+    pool_stats: dict[str, dict[str, int]] = {}
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+    for session in sessions:
+        for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+            pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+            if pools is None:
+                continue
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+                stats = pool_stats.setdefault(host, {"connections_opened": 0, "pooled_requests": 0})
+                stats["connections_opened"] += pool.num_connections
+                stats["pooled_requests"] += pool.num_requests
+    return pool_stats
+
+
+def outbound_http_metrics() -> dict[str, dict]:
+    """
+    Per-host snapshot for this process: request/error counts, latency and connection reuse.
+    `connections_reused` counts requests (including retries) served on an existing keep-alive socket.
+    """
+    with _metrics_lock:
+        snapshot = {host: dict(stats) for host, stats in _host_metrics.items()}
+    pool_stats = _pool_stats()
+    for host, stats in snapshot.items():
+        pooled = pool_stats.get(host, {"connections_opened": 0, "pooled_requests": 0})
+        stats["avg_latency_ms"] = round(stats.pop("total_latency_ms") / max(stats["requests"], 1), 2)
+        stats["max_latency_ms"] = round(stats["max_latency_ms"], 2)
+        stats["connections_opened"] = pooled["connections_opened"]
+        stats["connections_reused"] = max(pooled["pooled_requests"] - pooled["connections_opened"], 0)
+    return snapshot
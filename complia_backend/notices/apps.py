@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class NoticesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'complia_backend.notices'
+
+    def ready(self):
+        from . import signals  # noqa: F401
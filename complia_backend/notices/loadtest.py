@@ -0,0 +1,312 @@
+"""
+Building blocks for `load_test_parser_upload`: a local stand-in for the OCR providers,
+synthetic notice uploads and per-stage latency / query-count recording.
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fitz
+from django.db import connection
+
+DOCUMENT_KINDS = ("text", "pdf", "scanned_pdf", "image")
+
+_NOTICE_TEMPLATES = (
+    (
+        "FORM GST DRC-01",
+        "Show cause notice under Section {section} of the CGST Act, 2017",
+        "Tax payable: Rs. {amount}",
+    ),
+    (
+        "FORM GST ASMT-10",
+        "Notice for scrutiny of returns under Section 61 read with Rule 99",
+        "Discrepancy amount: INR {amount}",
+    ),
+    (
+        "Notice under Section 143(2) of the Income Tax Act, 1961",
+        "Assessing Officer, Income Tax Department (e-proceedings)",
+        "Demand of Rs. {amount} is proposed for AY 2024-25",
+    ),
+)
+
+
+def synthetic_notice_text(seed: int) -> str:
+    """Deterministic notice-like text (about 1 KB) that passes the parser's likelihood checks."""
+    rng = random.Random(seed)
+    form, heading, amount_line = _NOTICE_TEMPLATES[seed % len(_NOTICE_TEMPLATES)]
+    reply_by = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    lines = [
+        "GOVERNMENT OF INDIA",
+        "Office of the Deputy Commissioner, Central Board of Indirect Taxes",
+        form,
+        f"Reference No: LT/{rng.randint(1000, 9999)}/{seed}",
+        f"DIN: {rng.randint(10 ** 11, 10 ** 12 - 1)}",
+        heading.format(section=rng.choice(("73(1)", "74(1)", "122"))),
+        f"Tax period: April {2021 + seed % 3} to March {2022 + seed % 3}",
+        amount_line.format(amount=f"{rng.randint(1000, 9_999_999):,}.00"),
+        f"Date by which reply has to be submitted: {reply_by:%d/%m/%Y}",
+    ]
+    for _ in range(rng.randint(6, 12)):
+        lines.append(
+            rng.choice(
+                (
+                    "You are requested to furnish the reply along with supporting documents.",
+                    "Failing which the matter shall be decided on the basis of records available.",
+                    "The assessee may appear for personal hearing on the date mentioned above.",
+                    "Interest under Section 50 and penalty under Section 122 shall also apply.",
+                    "This notice is issued without prejudice to any other action under the Act.",
+                )
+            )
+        )
+    return "\n".join(lines)
+
+
+def _text_page_document(text: str) -> fitz.Document:
+    document = fitz.open()
+    page = document.new_page(width=595, height=842)
+    page.insert_textbox(fitz.Rect(40, 40, 555, 802), text, fontsize=9)
+    return document
+
+
+def _render_png(text: str) -> bytes:
+    with _text_page_document(text) as document:
+        return document[0].get_pixmap(matrix=fitz.Matrix(1, 1), alpha=False).tobytes("png")
+
+
+def build_upload(kind: str, seed: int) -> tuple[str, str, bytes]:
+    """Returns (filename, content_type, content) of a synthetic upload of `kind`."""
+    text = synthetic_notice_text(seed)
+    if kind == "text":
+        return f"notice-{seed}.txt", "text/plain", text.encode("utf-8")
+    if kind == "pdf":
+        with _text_page_document(text) as document:
+            return f"notice-{seed}.pdf", "application/pdf", document.tobytes()
+    if kind == "image":
+        return f"notice-{seed}.png", "image/png", _render_png(text)
+    if kind == "scanned_pdf":
+        # Image-only page, so the parser finds no embedded text and rasterizes it for OCR.
+        with fitz.open() as document:
+            page = document.new_page(width=595, height=842)
+            page.insert_image(page.rect, stream=_render_png(text))
+            return f"scan-{seed}.pdf", "application/pdf", document.tobytes()
+    raise ValueError(f"Unknown document kind: {kind}")
+
+
+class FakeOCRServer:
+    """
+    Local HTTP stand-in for Google Vision `images:annotate` and Azure Read v3.2 (images, and
+    PDFs with one `readResults` entry per page).
+
+    Azure analyze calls answer 202 with an `Operation-Location`; the operation reports `running`
+    for `azure_polls` status checks before it succeeds. Every response is delayed by `latency_ms`
+    (uniform +/-50% jitter), and `error_rate` of provider calls fail with 503. The returned text
+    is `synthetic_notice_text` seeded from the request body, so any image reads as a notice.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, azure_polls: int = 1, seed: int = 0):
+        self.latency_ms = max(float(latency_ms), 0.0)
+        self.error_rate = min(max(float(error_rate), 0.0), 1.0)
+        self.azure_polls = max(int(azure_polls), 0)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._operations: dict[str, dict] = {}
+        self.calls: dict[str, int] = {}
+        self.injected_errors: dict[str, int] = {}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def google_endpoint(self) -> str:
+        return f"{self.base_url}/v1/images:annotate"
+
+    def start(self) -> "FakeOCRServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-ocr", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOCRServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _count(self, route: str, injected: bool = False) -> None:
+        with self._lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            if injected:
+                self.injected_errors[route] = self.injected_errors.get(route, 0) + 1
+
+    def _delay_and_maybe_fail(self, route: str) -> bool:
+        with self._lock:
+            jitter = self._rng.uniform(0.5, 1.5)
+            fail = self._rng.random() < self.error_rate
+        if self.latency_ms:
+            time.sleep(self.latency_ms * jitter / 1000)
+        self._count(route, injected=fail)
+        return fail
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status_code: int, payload: dict, headers: dict | None = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self):
+                body = self._read_body()
+                path = self.path.split("?", 1)[0]
+                if path == "/v1/images:annotate":
+                    if fake._delay_and_maybe_fail("google_annotate"):
+                        self._send_json(503, {"error": {"message": "Injected load-test failure."}})
+                        return
+                    content = json.loads(body)["requests"][0]["image"]["content"]
+                    text = synthetic_notice_text(zlib.crc32(base64.b64decode(content)))
+                    self._send_json(200, {"responses": [{"fullTextAnnotation": {"text": text}}]})
+                    return
+                if path == "/vision/v3.2/read/analyze":
+                    if fake._delay_and_maybe_fail("azure_analyze"):
+                        self._send_json(503, {"error": {"message": "Injected load-test failure."}})
+                        return
+                    operation_id = uuid.uuid4().hex
+                    pages = 1
+                    # Like Azure, sniff the format: uploads are always sent as application/octet-stream.
+                    if body.startswith(b"%PDF"):
+                        with fitz.open(stream=body, filetype="pdf") as document:
+                            pages = document.page_count
+                        fake._count("azure_analyze_pdf")
+                    with fake._lock:
+                        fake._operations[operation_id] = {"polls": 0, "seed": zlib.crc32(body), "pages": pages}
+                    location = f"{fake.base_url}/vision/v3.2/read/analyzeResults/{operation_id}"
+                    self._send_json(202, {}, headers={"Operation-Location": location})
+                    return
+                self._send_json(404, {"error": {"message": "Unknown route."}})
+
+            def do_GET(self):
+                prefix = "/vision/v3.2/read/analyzeResults/"
+                if not self.path.startswith(prefix):
+                    self._send_json(404, {"error": {"message": "Unknown route."}})
+                    return
+                if fake._delay_and_maybe_fail("azure_poll"):
+                    self._send_json(503, {"error": {"message": "Injected load-test failure."}})
+                    return
+                with fake._lock:
+                    operation = fake._operations.get(self.path[len(prefix):])
+                    if operation is not None:
+                        operation["polls"] += 1
+                if operation is None:
+                    self._send_json(404, {"error": {"message": "Unknown operation."}})
+                    return
+                if operation["polls"] <= fake.azure_polls:
+                    self._send_json(200, {"status": "running"})
+                    return
+                read_results = [
+                    {"page": page, "lines": [{"text": line} for line in synthetic_notice_text(operation["seed"] + page).splitlines()]}
+                    for page in range(1, operation["pages"] + 1)
+                ]
+                self._send_json(200, {"status": "succeeded", "analyzeResult": {"readResults": read_results}})
+
+        return Handler
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list; 0.0 when empty."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(-(-pct * len(sorted_values) // 100)), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class StageRecorder:
+    """Thread-safe latency, error and DB query samples per named stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict[str, list[tuple[float, int, bool]]] = {}
+
+    def record(self, stage: str, elapsed_ms: float, queries: int, failed: bool) -> None:
+        with self._lock:
+            self._samples.setdefault(stage, []).append((elapsed_ms, queries, failed))
+
+    @contextmanager
+    def measure(self, stage: str):
+        """
+        Times the block and counts the queries it runs on this thread's DB connection.
+        Yields the sample dict; the block may set `failed` (exceptions always count as failures).
+        """
+        sample = {"elapsed_ms": 0.0, "queries": 0, "failed": False}
+
+        def _count_query(execute, sql, params, many, context):
+            sample["queries"] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(_count_query):
+                yield sample
+        except BaseException:
+            sample["failed"] = True
+            raise
+        finally:
+            sample["elapsed_ms"] = (time.perf_counter() - started) * 1000
+            self.record(stage, sample["elapsed_ms"], sample["queries"], sample["failed"])
+
+    def wrap(self, stage: str, func):
+        def _measured(*args, **kwargs):
+            with self.measure(stage):
+                return func(*args, **kwargs)
+
+        return _measured
+
+    def summary(self) -> dict[str, dict]:
+        with self._lock:
+            samples = {stage: list(values) for stage, values in self._samples.items()}
+        report = {}
+        for stage, values in samples.items():
+            latencies = sorted(value[0] for value in values)
+            errors = sum(1 for value in values if value[2])
+            report[stage] = {
+                "count": len(values),
+                "errors": errors,
+                "error_rate": errors / len(values),
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+                "avg_queries": sum(value[1] for value in values) / len(values),
+                "max_queries": max(value[1] for value in values),
+            }
+        return report
@@ -0,0 +1,105 @@
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from complia_backend.notices import parser_utils
+from complia_backend.notices.parser_utils import (
+    NoticeText,
+    analyze_notice_likelihood,
+    extract_amount,
+    extract_deadline_date,
+    extract_legal_section,
+)
+
+
+def _synthetic_document(samples: list[dict], target_bytes: int) -> str:
+    """Concatenates sample texts, as multi-page OCR output would, until the text reaches `target_bytes`."""
+    page = "\n\n".join(sample.get("text", "") for sample in samples if sample.get("text"))
+    if not page:
+        raise CommandError("Dataset samples contain no text.")
+    copies = max(1, -(-target_bytes // len(page)))
+    return "\n\n".join([page] * copies)[:target_bytes]
+
+
+def _extract(text: str, filename: str) -> None:
+    document = NoticeText(text)
+    analyze_notice_likelihood(document, filename)
+    extract_legal_section(document)
+    extract_amount(document)
+    extract_deadline_date(document)
+
+
+def _full_scan(text: str, filename: str) -> None:
+    """
+    Reference cost of running every pattern over the whole text without literal prefilters,
+    i.e. what each document paid before the prefilters; a lower bound, as line splitting is not repeated.
+    """
+    haystack = f"{filename}\n{text}".lower()
+    for branches in (*parser_utils._LIKELIHOOD_POSITIVE_PATTERNS.values(), *parser_utils._LIKELIHOOD_NEGATIVE_PATTERNS.values()):
+        for branch in branches:
+            branch.regex.search(haystack)
+    for pattern in (
+        *parser_utils._SECTION_PATTERNS,
+        parser_utils._RULE_RE,
+        *parser_utils._AMOUNT_CONTEXT_PATTERNS,
+        *parser_utils._DEADLINE_PATTERNS,
+    ):
+        pattern.regex.search(text)
+
+
+def _per_document_ms(func, text: str, filename: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text, filename)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark likelihood scoring and field extraction on large synthetic OCR texts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dataset",
+            default="complia_backend/notices/data/parser_benchmark_samples.json",
+            help="Path to benchmark sample JSON file used to build the synthetic texts.",
+        )
+        parser.add_argument(
+            "--sizes-kb",
+            default="16,64,256",
+            help="Comma-separated synthetic document sizes in KB.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Timed runs per document size.",
+        )
+
+    def handle(self, *args, **options):
+        dataset_path = Path(options["dataset"])
+        if not dataset_path.exists():
+            raise CommandError(f"Dataset not found: {dataset_path}")
+        with dataset_path.open("r", encoding="utf-8") as file_obj:
+            samples = json.load(file_obj)
+        if not isinstance(samples, list) or not samples:
+            raise CommandError("Dataset must contain a non-empty JSON array.")
+
+        try:
+            sizes_kb = [int(value) for value in options["sizes_kb"].split(",") if value.strip()]
+        except ValueError as exc:
+            raise CommandError("--sizes-kb must be a comma-separated list of integers.") from exc
+        if not sizes_kb or min(sizes_kb) <= 0:
+            raise CommandError("--sizes-kb must list positive sizes.")
+        repeat = max(1, int(options["repeat"]))
+
+        for size_kb in sizes_kb:
+            text = _synthetic_document(samples, size_kb * 1024)
+            _extract(text, "benchmark.pdf")
+            engine_ms = _per_document_ms(_extract, text, "benchmark.pdf", repeat)
+            full_scan_ms = _per_document_ms(_full_scan, text, "benchmark.pdf", repeat)
+            speedup = full_scan_ms / engine_ms if engine_ms else 0.0
+            self.stdout.write(
+                f"{size_kb} KB: {engine_ms:.2f} ms/doc (full scan {full_scan_ms:.2f} ms/doc, speedup {speedup:.1f}x)"
+            )
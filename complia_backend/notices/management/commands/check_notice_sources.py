@@ -1,12 +1,18 @@
 import hashlib
 import re
-from typing import Iterable
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from typing import Any, Iterable
+from urllib.parse import urlsplit
 
-import requests
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
+from complia_backend import http_client
 from complia_backend.notices.models import NoticeType
 
 USER_AGENT = "CompliaSourceMonitor/1.0 (+https://complia.in/contact-us)"
@@ -29,6 +35,81 @@ def _hash_response_content(raw_bytes: bytes, content_type: str) -> str:
     return hashlib.sha256(normalized_bytes).hexdigest()
 
 
+class _HostGate:
+    """
+    Caps in-flight requests per host and spaces request starts to the same host by `delay` seconds.
+    """
+
+    def __init__(self, per_host: int, delay: float):
+        self.per_host = max(per_host, 1)
+        self.delay = max(delay, 0.0)
+        self._lock = threading.Lock()
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    def run(self, host: str, func, *args, **kwargs):
+        with self._slot(host):
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start_at + self.delay
+            if start_at > now:
+                time.sleep(start_at - now)
+            return func(*args, **kwargs)
+
+
+def _source_host(url: str) -> str:
+    return (urlsplit(url).hostname or url).lower()
+
+
+def _interleave_by_host(notices: list[NoticeType]) -> list[NoticeType]:
+    """Round-robins notices across hosts so one slow host does not occupy every worker."""
+    by_host: dict[str, list[NoticeType]] = defaultdict(list)
+    for notice in notices:
+        by_host[_source_host(notice.source_url)].append(notice)
+    return [notice for notice in chain.from_iterable(zip_longest(*by_host.values())) if notice is not None]
+
+
+def _fetch_source(notice: NoticeType, timeout: int) -> dict[str, Any]:
+    """
+    Fetches one source URL (no DB access, runs on a worker thread).
+    Sends the stored validators so an unchanged page can answer 304 without a body.
+    """
+    headers = {"User-Agent": USER_AGENT, "Accept": "text/html,application/pdf,*/*"}
+    if notice.source_content_hash:
+        if notice.source_etag:
+            headers["If-None-Match"] = notice.source_etag
+        if notice.source_last_modified:
+            headers["If-Modified-Since"] = notice.source_last_modified
+    try:
+        response = http_client.get(
+            "notice_sources",
+            notice.source_url,
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=True,
+        )
+        etag = (response.headers.get("ETag") or "")[:255]
+        last_modified = (response.headers.get("Last-Modified") or "")[:64]
+        if response.status_code == 304:
+            return {"outcome": "not_modified", "etag": etag, "last_modified": last_modified}
+        response.raise_for_status()
+        return {
+            "outcome": "fetched",
+            "content_hash": _hash_response_content(response.content, response.headers.get("Content-Type", "")),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+    except Exception as exc:  # noqa: BLE001 - we want command resilience per notice
+        return {"outcome": "error", "error": str(exc)}
+
+
 class Command(BaseCommand):
     help = "Checks official source URLs for notice changes and flags notices that need review."
 
@@ -36,7 +117,25 @@ class Command(BaseCommand):
         parser.add_argument("--code", help="Check a single notice by code")
         parser.add_argument("--limit", type=int, default=0, help="Limit the number of notices processed")
         parser.add_argument("--include-inactive", action="store_true", help="Include inactive notices in the check")
-        parser.add_argument("--timeout", type=int, default=getattr(settings, "NOTICE_SOURCE_CHECK_TIMEOUT_SEC", 15))
+        parser.add_argument("--timeout", type=int, default=settings.NOTICE_SOURCE_CHECK_TIMEOUT_SEC)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.NOTICE_SOURCE_CHECK_CONCURRENCY,
+            help="Total source URLs fetched concurrently.",
+        )
+        parser.add_argument(
+            "--per-host",
+            type=int,
+            default=settings.NOTICE_SOURCE_PER_HOST_CONCURRENCY,
+            help="Maximum concurrent requests to a single host.",
+        )
+        parser.add_argument(
+            "--host-delay",
+            type=float,
+            default=settings.NOTICE_SOURCE_HOST_DELAY_SEC,
+            help="Minimum seconds between request starts to the same host.",
+        )
 
     def handle(self, *args, **options):
         queryset = NoticeType.objects.exclude(source_url="").exclude(source_url__isnull=True).order_by("code")
@@ -58,76 +157,76 @@ class Command(BaseCommand):
         failures = 0
         newly_monitored = 0
         timeout = max(int(options["timeout"]), 3)
+        workers = max(int(options["workers"]), 1)
+        gate = _HostGate(int(options["per_host"]), float(options["host_delay"]))
 
+        with ThreadPoolExecutor(max_workers=min(workers, len(notices)), thread_name_prefix="source-check") as pool:
+            futures = {
+                notice.pk: pool.submit(gate.run, _source_host(notice.source_url), _fetch_source, notice, timeout)
+                for notice in _interleave_by_host(notices)
+            }
+            results = {pk: future.result() for pk, future in futures.items()}
+
+        now = timezone.now()
         for notice in notices:
             checked += 1
-            now = timezone.now()
-            try:
-                response = requests.get(
-                    notice.source_url,
-                    headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/pdf,*/*"},
-                    timeout=timeout,
-                    allow_redirects=True,
-                )
-                response.raise_for_status()
-                content_hash = _hash_response_content(response.content, response.headers.get("Content-Type", ""))
-
-                previous_hash = notice.source_content_hash or ""
-                notice.source_last_checked_at = now
-                notice.source_check_error = ""
-
-                if not previous_hash:
-                    notice.source_content_hash = content_hash
-                    if notice.review_status not in {"trusted", "needs_review", "watch"}:
-                        notice.review_status = "watch"
-                    notice.save(
-                        update_fields=[
-                            "source_content_hash",
-                            "source_last_checked_at",
-                            "source_check_error",
-                            "updated_at",
-                        ]
-                    )
-                    newly_monitored += 1
-                    self.stdout.write(self.style.SUCCESS(f"[{notice.code}] baseline hash stored"))
-                    continue
-
-                if previous_hash != content_hash:
-                    notice.source_content_hash = content_hash
-                    notice.source_last_changed_at = now
-                    notice.source_check_error = ""
-                    notice.review_status = "needs_review"
-                    notice.save(
-                        update_fields=[
-                            "source_content_hash",
-                            "source_last_checked_at",
-                            "source_last_changed_at",
-                            "source_check_error",
-                            "review_status",
-                            "updated_at",
-                        ]
-                    )
-                    changed += 1
-                    self.stdout.write(self.style.WARNING(f"[{notice.code}] source changed -> needs review"))
-                    continue
-
-                notice.save(update_fields=["source_last_checked_at", "source_check_error", "updated_at"])
-                unchanged += 1
-                self.stdout.write(f"[{notice.code}] unchanged")
-            except Exception as exc:  # noqa: BLE001 - we want command resilience per notice
+            result = results[notice.pk]
+            notice.source_last_checked_at = now
+            notice.updated_at = now
+
+            if result["outcome"] == "error":
                 failures += 1
-                notice.source_last_checked_at = now
-                notice.source_check_error = str(exc)[:500]
+                notice.source_check_error = result["error"][:500]
                 notice.review_status = "needs_review"
-                notice.save(
-                    update_fields=[
-                        "source_last_checked_at",
-                        "source_check_error",
-                        "review_status",
-                        "updated_at",
-                    ]
-                )
-                self.stdout.write(self.style.ERROR(f"[{notice.code}] check failed: {exc}"))
+                self.stdout.write(self.style.ERROR(f"[{notice.code}] check failed: {result['error']}"))
+                continue
+
+            notice.source_check_error = ""
+            if result["outcome"] == "not_modified":
+                # A 304 may refresh validators but never drops the ones we already hold.
+                notice.source_etag = result["etag"] or notice.source_etag
+                notice.source_last_modified = result["last_modified"] or notice.source_last_modified
+                unchanged += 1
+                self.stdout.write(f"[{notice.code}] unchanged (not modified)")
+                continue
+
+            notice.source_etag = result["etag"]
+            notice.source_last_modified = result["last_modified"]
+            content_hash = result["content_hash"]
+            previous_hash = notice.source_content_hash or ""
+            if not previous_hash:
+                notice.source_content_hash = content_hash
+                if notice.review_status not in {"trusted", "needs_review", "watch"}:
+                    notice.review_status = "watch"
+                newly_monitored += 1
+                self.stdout.write(self.style.SUCCESS(f"[{notice.code}] baseline hash stored"))
+                continue
+
+            if previous_hash != content_hash:
+                notice.source_content_hash = content_hash
+                notice.source_last_changed_at = now
+                notice.review_status = "needs_review"
+                changed += 1
+                self.stdout.write(self.style.WARNING(f"[{notice.code}] source changed -> needs review"))
+                continue
+
+            unchanged += 1
+            self.stdout.write(f"[{notice.code}] unchanged")
+
+        NoticeType.objects.bulk_update(
+            notices,
+            [
+                "source_content_hash",
+                "source_etag",
+                "source_last_modified",
+                "source_last_checked_at",
+                "source_last_changed_at",
+                "source_check_error",
+                "review_status",
+                "updated_at",
+            ],
+            batch_size=200,
+        )
 
         self.stdout.write(
             self.style.SUCCESS(
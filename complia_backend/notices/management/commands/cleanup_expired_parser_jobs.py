@@ -1,11 +1,12 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from complia_backend.notices.models import ParserJob
+from complia_backend.notices.models import OCRCacheEntry, ParserJob
+from complia_backend.notices.ocr_cache import evict_least_recently_used_ocr_cache, purge_expired_ocr_cache
 
 
 class Command(BaseCommand):
-    help = "Delete parser jobs that have passed their delete_after TTL."
+    help = "Delete parser jobs and cached OCR text that have passed their privacy TTL."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,13 +18,16 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         dry_run = options["dry_run"]
         now = timezone.now()
-        queryset = ParserJob.objects.filter(delete_after__lt=now)
+        # Queued jobs still hold an upload and a reserved credit; their TTL restarts once a worker finishes them.
+        queryset = ParserJob.objects.filter(delete_after__lt=now).exclude(status="queued")
         job_count = queryset.count()
 
         if dry_run:
+            cache_count = OCRCacheEntry.objects.filter(expires_at__lte=now).count()
             self.stdout.write(
                 self.style.WARNING(
-                    f"[DRY RUN] {job_count} parser job(s) are expired and would be deleted."
+                    f"[DRY RUN] {job_count} parser job(s) and {cache_count} OCR cache entr(ies) "
+                    "are expired and would be deleted."
                 )
             )
             return
@@ -34,3 +38,8 @@ class Command(BaseCommand):
                 f"Deleted {job_count} expired parser job(s). Cascade rows removed: {deleted_count}."
             )
         )
+        cache_deleted = purge_expired_ocr_cache()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {cache_deleted} expired OCR cache entr(ies)."))
+        cache_evicted = evict_least_recently_used_ocr_cache()
+        if cache_evicted:
+            self.stdout.write(self.style.SUCCESS(f"Evicted {cache_evicted} OCR cache entr(ies) over OCR_CACHE_MAX_CHARS."))
@@ -364,10 +364,15 @@ class Command(BaseCommand):
         curated_seeds = CURATED_NOTICE_SEEDS[:target]
         curated_codes = {seed.code for seed in curated_seeds}
 
-        auto_deactivated = NoticeType.objects.filter(code__startswith="AUTO-NOTICE-", is_active=True).update(is_active=False)
+        auto_deactivated = NoticeType.objects.filter(code__startswith="AUTO-NOTICE-", is_active=True).update(
+            is_active=False,
+            updated_at=now,
+        )
         non_curated_deactivated = 0
         if strict_curated_only:
-            non_curated_deactivated = NoticeType.objects.filter(is_active=True).exclude(code__in=curated_codes).update(is_active=False)
+            non_curated_deactivated = (
+                NoticeType.objects.filter(is_active=True).exclude(code__in=curated_codes).update(is_active=False, updated_at=now)
+            )
 
         created_count = 0
         updated_count = 0
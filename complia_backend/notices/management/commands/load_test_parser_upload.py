@@ -0,0 +1,206 @@
+import json
+import random
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import ParserCreditLedgerEntry, User, UserEntitlement
+from complia_backend.notices import views
+from complia_backend.notices.loadtest import DOCUMENT_KINDS, FakeOCRServer, StageRecorder, build_upload
+
+# Stages timed inside the upload view, keyed by the view-module attribute that implements them.
+VIEW_STAGES = {
+    "reserve_parser_credit": "reserve_credit",
+    "extract_upload_text": "extract",
+    "record_parser_result": "parse_and_store",
+}
+
+
+def _parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in DOCUMENT_KINDS:
+            raise CommandError(f"Unknown document kind '{kind}'. Use: {', '.join(DOCUMENT_KINDS)}.")
+        try:
+            mix[kind] = float(weight or 1)
+        except ValueError as exc:
+            raise CommandError(f"Invalid weight for '{kind}': {weight}") from exc
+    if not mix or sum(mix.values()) <= 0:
+        raise CommandError("--mix must give at least one document kind a positive weight.")
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test parser/upload/ in-process against a local fake OCR provider and report latency "
+        "percentiles, throughput, DB query counts and error rates per stage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Total uploads to send.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Uploads in flight at once.")
+        parser.add_argument(
+            "--mix",
+            default="text=1,pdf=1,scanned_pdf=1,image=1",
+            help=f"Weighted document kinds, e.g. 'text=2,image=1'. Kinds: {', '.join(DOCUMENT_KINDS)}.",
+        )
+        parser.add_argument(
+            "--provider",
+            choices=("google_vision", "azure_vision"),
+            default="azure_vision",
+            help="OCR provider the fake server emulates.",
+        )
+        parser.add_argument("--ocr-latency-ms", type=float, default=300.0, help="Mean fake OCR response latency.")
+        parser.add_argument("--ocr-error-rate", type=float, default=0.0, help="Fraction of OCR calls answered with 503.")
+        parser.add_argument(
+            "--azure-polls",
+            type=int,
+            default=1,
+            help="Azure status checks that report 'running' before the read operation succeeds.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Seed for the document mix and fake OCR jitter.")
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="Keep the load-test users and their parser jobs instead of deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        request_count = int(options["requests"])
+        concurrency = int(options["concurrency"])
+        if request_count < 1 or concurrency < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+        mix = _parse_mix(options["mix"])
+
+        rng = random.Random(options["seed"])
+        kinds = rng.choices(list(mix), weights=list(mix.values()), k=request_count)
+        uploads = [build_upload(kind, options["seed"] * 1_000_003 + index) for index, kind in enumerate(kinds)]
+
+        # One fresh user per upload: each has exactly one credit and never hits the per-user throttle.
+        run_id = uuid.uuid4().hex[:10]
+        users = []
+        for index in range(request_count):
+            user = User(email=f"loadtest-{run_id}-{index}@complia.invalid")
+            user.set_unusable_password()
+            users.append(user)
+        User.objects.bulk_create(users)
+        users = list(User.objects.filter(email__startswith=f"loadtest-{run_id}-").order_by("id"))
+        UserEntitlement.objects.bulk_create(
+            [UserEntitlement(user=user, parser_credits=1, lifetime_purchased_credits=1) for user in users]
+        )
+        ParserCreditLedgerEntry.objects.bulk_create(
+            [ParserCreditLedgerEntry(user=user, kind="grant", amount=1, reference=f"load-test-{run_id}") for user in users]
+        )
+
+        recorder = StageRecorder()
+        statuses: Counter = Counter()
+        upload_url = reverse("parser-upload")
+
+        def _send(index: int) -> None:
+            filename, content_type, content = uploads[index]
+            client = APIClient()
+            client.force_authenticate(user=users[index])
+            try:
+                with recorder.measure("request") as sample:
+                    response = client.post(
+                        upload_url,
+                        {"file": SimpleUploadedFile(filename, content, content_type=content_type)},
+                        format="multipart",
+                    )
+                    sample["failed"] = response.status_code >= 400
+                recorder.record(f"request[{kinds[index]}]", sample["elapsed_ms"], sample["queries"], sample["failed"])
+                statuses[response.status_code] += 1
+            except Exception as exc:
+                statuses[type(exc).__name__] += 1
+            finally:
+                connection.close()
+
+        try:
+            with FakeOCRServer(
+                latency_ms=options["ocr_latency_ms"],
+                error_rate=options["ocr_error_rate"],
+                azure_polls=options["azure_polls"],
+                seed=options["seed"],
+            ) as fake_ocr:
+                overrides = {
+                    "OCR_ENABLED": True,
+                    "OCR_PROVIDER": options["provider"],
+                    "GOOGLE_VISION_API_KEY": "load-test",
+                    "GOOGLE_VISION_ENDPOINT": fake_ocr.google_endpoint,
+                    "AZURE_VISION_API_KEY": "load-test",
+                    "AZURE_VISION_ENDPOINT": fake_ocr.base_url,
+                    "PARSER_ASYNC_ENABLED": False,
+                    "PARSER_PRIVATE_BETA_ENABLED": False,
+                    "ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"],
+                }
+                stage_patches = [
+                    patch.object(views, attribute, recorder.wrap(stage, getattr(views, attribute)))
+                    for attribute, stage in VIEW_STAGES.items()
+                ]
+                with override_settings(**overrides):
+                    for stage_patch in stage_patches:
+                        stage_patch.start()
+                    try:
+                        started = time.perf_counter()
+                        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load-test") as executor:
+                            list(executor.map(_send, range(request_count)))
+                        wall_sec = time.perf_counter() - started
+                    finally:
+                        for stage_patch in stage_patches:
+                            stage_patch.stop()
+                provider_calls = dict(fake_ocr.calls)
+                provider_errors = dict(fake_ocr.injected_errors)
+        finally:
+            if not options["keep_data"]:
+                User.objects.filter(email__startswith=f"loadtest-{run_id}-").delete()
+
+        succeeded = sum(count for code, count in statuses.items() if isinstance(code, int) and code < 400)
+        report = {
+            "requests": request_count,
+            "concurrency": concurrency,
+            "provider": options["provider"],
+            "wall_sec": wall_sec,
+            "throughput_rps": request_count / wall_sec if wall_sec else 0.0,
+            "success_rps": succeeded / wall_sec if wall_sec else 0.0,
+            "statuses": {str(code): count for code, count in sorted(statuses.items(), key=lambda item: str(item[0]))},
+            "stages": recorder.summary(),
+            "fake_ocr_calls": provider_calls,
+            "fake_ocr_injected_errors": provider_errors,
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{request_count} uploads, concurrency {concurrency}, provider {options['provider']}: "
+                f"{report['wall_sec']:.2f}s, {report['throughput_rps']:.2f} req/s ({report['success_rps']:.2f} ok/s)"
+            )
+        )
+        self.stdout.write(f"Statuses: {report['statuses']}")
+        self.stdout.write(
+            f"{'stage':<22} {'count':>6} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'avg q':>7} {'max q':>6}"
+        )
+        for stage, stats in sorted(report["stages"].items()):
+            self.stdout.write(
+                f"{stage:<22} {stats['count']:>6} {stats['error_rate'] * 100:>5.1f}% "
+                f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+                f"{stats['avg_queries']:>7.1f} {stats['max_queries']:>6}"
+            )
+        self.stdout.write(f"Fake OCR calls: {provider_calls} injected errors: {provider_errors}")
@@ -1,12 +1,27 @@
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from decimal import Decimal, InvalidOperation
+from itertools import islice
 from pathlib import Path
 
+import django
+from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
+from complia_backend.notices.loadtest import percentile
 from complia_backend.notices.models import ParserBenchmarkRun
-from complia_backend.notices.parser_utils import parse_notice_document
+from complia_backend.notices.parser_utils import (
+    NoticeText,
+    analyze_notice_likelihood,
+    get_notice_classifier,
+    parse_notice_document,
+)
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+SLOWEST_SAMPLES_KEPT = 10
 
 
 def _normalize_text(value: str) -> str:
@@ -34,14 +49,102 @@ def _calculate_f1(precision: float, recall: float):
     return (2 * precision * recall) / (precision + recall)
 
 
+def _iter_samples(dataset_path: Path):
+    """Yields samples one at a time: JSONL datasets are streamed, JSON arrays are loaded whole."""
+    if dataset_path.suffix.lower() in JSONL_SUFFIXES:
+        with dataset_path.open("r", encoding="utf-8") as file_obj:
+            for line_number, line in enumerate(file_obj, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    sample = json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f"Invalid JSON on line {line_number} of {dataset_path}: {exc}") from exc
+                if not isinstance(sample, dict):
+                    raise CommandError(f"Line {line_number} of {dataset_path} is not a JSON object.")
+                yield sample
+        return
+
+    with dataset_path.open("r", encoding="utf-8") as file_obj:
+        samples = json.load(file_obj)
+    if not isinstance(samples, list) or not samples:
+        raise CommandError("Dataset must contain a non-empty JSON array.")
+    yield from samples
+
+
+def _iter_shards(samples, shard_size: int):
+    indexed = enumerate(samples)
+    while True:
+        shard = list(islice(indexed, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def _evaluate_sample(index: int, sample: dict) -> dict:
+    text = sample.get("text", "")
+    filename = sample.get("filename", "sample.txt")
+    stage_timings: dict[str, float] = {}
+
+    started = time.perf_counter()
+    document = NoticeText(text)
+    likelihood_started = time.perf_counter()
+    analyze_notice_likelihood(document, filename)
+    stage_timings["likelihood"] = (time.perf_counter() - likelihood_started) * 1000
+    parsed = parse_notice_document(document, filename, stage_timings=stage_timings)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    expected_amount = _safe_decimal(sample.get("expected_amount"))
+    predicted_amount = _safe_decimal(parsed.get("amount_claimed"))
+    return {
+        "index": index,
+        "filename": filename,
+        "expected_notice_code": (sample.get("expected_notice_code") or "").strip().upper(),
+        "predicted_notice_code": (parsed["notice"].code if parsed["notice"] else "").strip().upper(),
+        "expected_legal_section": _normalize_text(sample.get("expected_legal_section", "")),
+        "predicted_legal_section": _normalize_text(parsed.get("legal_section", "")),
+        "expected_amount": str(expected_amount) if expected_amount is not None else "",
+        "predicted_amount": str(predicted_amount) if predicted_amount is not None else "",
+        "total_ms": total_ms,
+        "stage_ms": stage_timings,
+    }
+
+
+def _evaluate_shard(shard: list[tuple[int, dict]]) -> list[dict]:
+    return [_evaluate_sample(index, sample) for index, sample in shard]
+
+
+def _init_worker() -> None:
+    # Spawned workers start without Django; forked ones inherit it (the parent closed its DB
+    # connections before forking, so no socket is shared).
+    if not apps.ready:
+        django.setup()
+    get_notice_classifier()
+
+
+def _tally(counts: dict, expected, predicted) -> None:
+    # Empty strings and None mean "no value"; a zero amount is still a value.
+    has_expected = expected not in (None, "")
+    matched = has_expected and predicted == expected
+    if predicted not in (None, ""):
+        counts["tp" if matched else "fp"] += 1
+    if has_expected and not matched:
+        counts["fn"] += 1
+
+
+def _amount_key(value: str):
+    amount = _safe_decimal(value)
+    return amount.quantize(Decimal("0.01")) if amount is not None else None
+
+
 class Command(BaseCommand):
-    help = "Run parser benchmark on a labeled sample set and store metrics."
+    help = "Run parser benchmark on a labeled sample set and store accuracy and latency metrics."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--dataset",
             default="complia_backend/notices/data/parser_benchmark_samples.json",
-            help="Path to benchmark sample JSON file.",
+            help="Path to a benchmark JSON array or a JSONL file (one sample per line, streamed).",
         )
         parser.add_argument(
             "--no-store",
@@ -53,113 +156,185 @@ class Command(BaseCommand):
             default="",
             help="Optional user email to attribute benchmark run.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes evaluating shards (1 evaluates in this process).",
+        )
+        parser.add_argument(
+            "--shard-size",
+            type=int,
+            default=50,
+            help="Samples per shard sent to a worker process.",
+        )
+        parser.add_argument(
+            "--samples-output",
+            default="",
+            help="Optional JSONL path receiving one record per sample with predictions and stage timings.",
+        )
+        parser.add_argument(
+            "--max-latency-regression",
+            type=float,
+            default=0.0,
+            help=(
+                "Fail when p95 sample latency exceeds the previous run on the same dataset and worker count "
+                "by more than this percentage (default 0 disables the check)."
+            ),
+        )
+        parser.add_argument(
+            "--min-latency-regression-ms",
+            type=float,
+            default=5.0,
+            help="Ignore p95 increases smaller than this many milliseconds; small datasets put millisecond-level noise in p95.",
+        )
 
     def handle(self, *args, **options):
         dataset_path = Path(options["dataset"])
         no_store = options["no_store"]
         generated_by_email = options["generated_by"].strip().lower()
+        workers = max(1, int(options["workers"]))
+        shard_size = max(1, int(options["shard_size"]))
+        max_regression_pct = max(0.0, float(options["max_latency_regression"]))
+        min_regression_ms = max(0.0, float(options["min_latency_regression_ms"]))
 
         if not dataset_path.exists():
             raise CommandError(f"Dataset not found: {dataset_path}")
 
-        with dataset_path.open("r", encoding="utf-8") as file_obj:
-            samples = json.load(file_obj)
-
-        if not isinstance(samples, list) or not samples:
-            raise CommandError("Dataset must contain a non-empty JSON array.")
-
-        notice_tp = notice_fp = notice_fn = 0
-        section_tp = section_fp = section_fn = 0
-        amount_tp = amount_fp = amount_fn = 0
-
-        for sample in samples:
-            text = sample.get("text", "")
-            filename = sample.get("filename", "sample.txt")
-            expected_notice_code = (sample.get("expected_notice_code") or "").strip().upper()
-            expected_section = _normalize_text(sample.get("expected_legal_section", ""))
-            expected_amount = _safe_decimal(sample.get("expected_amount"))
-
-            parsed = parse_notice_document(text, filename)
-            predicted_notice = (parsed["notice"].code if parsed["notice"] else "").strip().upper()
-            predicted_section = _normalize_text(parsed.get("legal_section", ""))
-            predicted_amount = _safe_decimal(parsed.get("amount_claimed"))
-
-            notice_match = bool(expected_notice_code) and predicted_notice == expected_notice_code
-            if predicted_notice:
-                if notice_match:
-                    notice_tp += 1
-                else:
-                    notice_fp += 1
-            if expected_notice_code and not notice_match:
-                notice_fn += 1
-
-            section_match = bool(expected_section) and predicted_section == expected_section
-            if predicted_section:
-                if section_match:
-                    section_tp += 1
-                else:
-                    section_fp += 1
-            if expected_section and not section_match:
-                section_fn += 1
-
-            amount_match = (
-                expected_amount is not None
-                and predicted_amount is not None
-                and predicted_amount.quantize(Decimal("0.01")) == expected_amount.quantize(Decimal("0.01"))
-            )
-            if predicted_amount is not None:
-                if amount_match:
-                    amount_tp += 1
-                else:
-                    amount_fp += 1
-            if expected_amount is not None and not amount_match:
-                amount_fn += 1
-
-        notice_precision, notice_recall = _calculate_precision_recall(notice_tp, notice_fp, notice_fn)
-        section_precision, section_recall = _calculate_precision_recall(section_tp, section_fp, section_fn)
-        amount_precision, amount_recall = _calculate_precision_recall(amount_tp, amount_fp, amount_fn)
+        counts = {field: {"tp": 0, "fp": 0, "fn": 0} for field in ("notice", "section", "amount")}
+        latencies: list[float] = []
+        stage_latencies: dict[str, list[float]] = {}
+        slowest: list[dict] = []
+        samples_output = open(options["samples_output"], "w", encoding="utf-8") if options["samples_output"] else None
+
+        def _collect(results: list[dict]) -> None:
+            for result in results:
+                _tally(counts["notice"], result["expected_notice_code"], result["predicted_notice_code"])
+                _tally(counts["section"], result["expected_legal_section"], result["predicted_legal_section"])
+                _tally(counts["amount"], _amount_key(result["expected_amount"]), _amount_key(result["predicted_amount"]))
+                latencies.append(result["total_ms"])
+                for stage, elapsed_ms in result["stage_ms"].items():
+                    stage_latencies.setdefault(stage, []).append(elapsed_ms)
+                slowest.append({key: result[key] for key in ("index", "filename", "total_ms")})
+                if samples_output is not None:
+                    samples_output.write(json.dumps(result) + "\n")
+            slowest.sort(key=lambda item: -item["total_ms"])
+            del slowest[SLOWEST_SAMPLES_KEPT:]
+
+        started = time.perf_counter()
+        try:
+            shards = _iter_shards(_iter_samples(dataset_path), shard_size)
+            if workers == 1:
+                get_notice_classifier()
+                for shard in shards:
+                    _collect(_evaluate_shard(shard))
+            else:
+                connections.close_all()
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                    # At most two shards per worker are in flight, so a large JSONL file is never fully in memory.
+                    pending = set()
+                    for shard in shards:
+                        pending.add(pool.submit(_evaluate_shard, shard))
+                        if len(pending) >= workers * 2:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                _collect(future.result())
+                    for future in wait(pending).done:
+                        _collect(future.result())
+        finally:
+            if samples_output is not None:
+                samples_output.close()
+        wall_sec = time.perf_counter() - started
+
+        sample_count = len(latencies)
+        if not sample_count:
+            raise CommandError("Dataset must contain at least one sample.")
+
+        notice_precision, notice_recall = _calculate_precision_recall(**counts["notice"])
+        section_precision, section_recall = _calculate_precision_recall(**counts["section"])
+        amount_precision, amount_recall = _calculate_precision_recall(**counts["amount"])
 
         notice_f1 = _calculate_f1(notice_precision, notice_recall)
         section_f1 = _calculate_f1(section_precision, section_recall)
         amount_f1 = _calculate_f1(amount_precision, amount_recall)
         overall_f1 = (notice_f1 + section_f1 + amount_f1) / 3
 
+        latencies.sort()
+        latency = {
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": sum(latencies) / sample_count,
+            "max_ms": latencies[-1],
+        }
+        stage_latency = {}
+        for stage, values in sorted(stage_latencies.items()):
+            values.sort()
+            stage_latency[stage] = {"p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95)}
+
         metrics = {
             "dataset_path": str(dataset_path),
-            "notice_counts": {"tp": notice_tp, "fp": notice_fp, "fn": notice_fn},
-            "section_counts": {"tp": section_tp, "fp": section_fp, "fn": section_fn},
-            "amount_counts": {"tp": amount_tp, "fp": amount_fp, "fn": amount_fn},
+            "notice_counts": counts["notice"],
+            "section_counts": counts["section"],
+            "amount_counts": counts["amount"],
             "notice_f1": notice_f1,
             "section_f1": section_f1,
             "amount_f1": amount_f1,
+            "workers": workers,
+            "shard_size": shard_size,
+            "wall_sec": wall_sec,
+            "throughput_samples_per_sec": sample_count / wall_sec if wall_sec else 0.0,
+            "latency": latency,
+            "stage_latency": stage_latency,
+            "slowest_samples": slowest,
         }
 
         generated_by = None
         if generated_by_email:
             generated_by = get_user_model().objects.filter(email__iexact=generated_by_email).first()
 
-        self.stdout.write(self.style.SUCCESS(f"Samples: {len(samples)}"))
+        self.stdout.write(self.style.SUCCESS(f"Samples: {sample_count}"))
         self.stdout.write(
             f"Notice P/R: {notice_precision:.3f}/{notice_recall:.3f} | "
             f"Section P/R: {section_precision:.3f}/{section_recall:.3f} | "
             f"Amount P/R: {amount_precision:.3f}/{amount_recall:.3f}"
         )
         self.stdout.write(self.style.SUCCESS(f"Overall F1: {overall_f1:.3f}"))
+        self.stdout.write(
+            f"Latency p50/p95: {latency['p50_ms']:.2f}/{latency['p95_ms']:.2f} ms | "
+            f"Throughput: {metrics['throughput_samples_per_sec']:.1f} samples/s ({workers} worker(s))"
+        )
+
+        previous_run = (
+            # Runs with a different worker count have different per-sample latency; never compare across them.
+            ParserBenchmarkRun.objects.filter(metrics__dataset_path=str(dataset_path), metrics__workers=workers)
+            .order_by("-created_at", "-id")
+            .first()
+        )
 
         if no_store:
             self.stdout.write(self.style.WARNING("Skipped storing benchmark run (--no-store)."))
-            return
+        else:
+            benchmark_run = ParserBenchmarkRun.objects.create(
+                sample_count=sample_count,
+                notice_precision=notice_precision,
+                notice_recall=notice_recall,
+                section_precision=section_precision,
+                section_recall=section_recall,
+                amount_precision=amount_precision,
+                amount_recall=amount_recall,
+                overall_f1=overall_f1,
+                metrics=metrics,
+                generated_by=generated_by,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Stored benchmark run #{benchmark_run.id}."))
 
-        benchmark_run = ParserBenchmarkRun.objects.create(
-            sample_count=len(samples),
-            notice_precision=notice_precision,
-            notice_recall=notice_recall,
-            section_precision=section_precision,
-            section_recall=section_recall,
-            amount_precision=amount_precision,
-            amount_recall=amount_recall,
-            overall_f1=overall_f1,
-            metrics=metrics,
-            generated_by=generated_by,
-        )
-        self.stdout.write(self.style.SUCCESS(f"Stored benchmark run #{benchmark_run.id}."))
+        previous_p95 = ((previous_run.metrics or {}).get("latency") or {}).get("p95_ms") if previous_run else None
+        if max_regression_pct and previous_p95:
+            regression_ms = latency["p95_ms"] - previous_p95
+            regression_pct = regression_ms / previous_p95 * 100
+            if regression_pct > max_regression_pct and regression_ms >= min_regression_ms:
+                raise CommandError(
+                    f"p95 latency regressed {regression_pct:.1f}% against run #{previous_run.id} "
+                    f"({previous_p95:.2f} -> {latency['p95_ms']:.2f} ms; limit {max_regression_pct:.1f}%)."
+                )
@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import socket
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from complia_backend.notices.parser_jobs import claim_queued_parser_uploads, process_queued_parser_upload
+
+
+def _init_process_worker() -> None:
+    # Children are spawned from a bare interpreter, so nothing (DB sockets included) is inherited
+    # from the parent; drop anything setup() opened so each job starts from its own connection.
+    django.setup()
+    connections.close_all()
+
+
+def _run_queued_upload(queued_id: int) -> str:
+    try:
+        return process_queued_parser_upload(queued_id)
+    finally:
+        close_old_connections()
+
+
+def _build_executor(pool: str, workers: int):
+    if pool == "process":
+        # "spawn", not fork: the claim loop keeps a DB connection open in the parent, and forked
+        # children (started lazily on the first submit) would share that socket.
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parser-worker")
+
+
+class Command(BaseCommand):
+    help = "Process queued parser uploads (PARSER_ASYNC_ENABLED) with a local thread or process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=getattr(settings, "PARSER_WORKER_CONCURRENCY", 2),
+            help="Number of parser jobs processed concurrently.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=["thread", "process"],
+            default="thread",
+            help="Use threads for OCR-bound workloads or processes for CPU-heavy PDF parsing.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "PARSER_WORKER_POLL_SEC", 2),
+            help="Seconds to wait before polling an empty queue again.",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain the current queue and exit.")
+        parser.add_argument("--max-jobs", type=int, default=0, help="Exit after processing this many jobs.")
+
+    def handle(self, *args, **options):
+        workers = max(int(options["workers"]), 1)
+        poll_interval = max(float(options["poll_interval"]), 0.1)
+        max_jobs = max(int(options["max_jobs"]), 0)
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.stdout.write(
+            f"Parser worker {worker_id} started with {workers} {options['pool']} worker(s)."
+        )
+
+        outcomes: Counter = Counter()
+        processed = 0
+        in_flight = set()
+        executor = _build_executor(options["pool"], workers)
+        try:
+            while True:
+                capacity = workers - len(in_flight)
+                if max_jobs:
+                    capacity = min(capacity, max_jobs - processed - len(in_flight))
+                claimed_ids = claim_queued_parser_uploads(worker_id, capacity) if capacity > 0 else []
+                for queued_id in claimed_ids:
+                    in_flight.add(executor.submit(_run_queued_upload, queued_id))
+
+                if not in_flight:
+                    if options["once"] or (max_jobs and processed >= max_jobs):
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                done, in_flight = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        outcomes[future.result()] += 1
+                    except Exception as exc:  # pragma: no cover - pool/transport failure
+                        outcomes["failed"] += 1
+                        self.stderr.write(f"Parser worker task crashed: {exc}")
+                    processed += 1
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Stopping; waiting for in-flight parser jobs to finish."))
+        finally:
+            executor.shutdown(wait=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Parser workers processed {processed} job(s). completed={completed}, "
+                "review_required={review_required}, failed={failed}, retried={retry}, "
+                "lease_lost={lease_lost}.".format(
+                    processed=processed,
+                    completed=outcomes["completed"],
+                    review_required=outcomes["review_required"],
+                    failed=outcomes["failed"],
+                    retry=outcomes["retry"],
+                    lease_lost=outcomes["lease_lost"],
+                )
+            )
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.10 on 2026-10-18 14:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0009_noticetype_review_status_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedParserUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_content', models.BinaryField()),
+                ('notice_code_hint', models.CharField(blank=True, max_length=80)),
+                ('credit_reserved', models.BooleanField(default=False)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('claimed_by', models.CharField(blank=True, max_length=120)),
+                ('claimed_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('parser_job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='queued_upload', to='notices.parserjob')),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0011_ocrcacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='noticetype',
+            name='source_etag',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='noticetype',
+            name='source_last_modified',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
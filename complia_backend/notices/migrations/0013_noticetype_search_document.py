@@ -0,0 +1,80 @@
+# Generated by Django 5.2.10 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+SEARCH_SOURCE_FIELDS = ("code", "slug", "title", "summary")
+FTS_TABLE = "notices_noticetype_fts"
+
+
+def populate_search_documents(apps, schema_editor):
+    NoticeType = apps.get_model("notices", "NoticeType")
+    TriggerKeyword = apps.get_model("notices", "TriggerKeyword")
+    keywords = {}
+    for notice_id, keyword in TriggerKeyword.objects.order_by("id").values_list("notice_type_id", "keyword"):
+        keywords.setdefault(notice_id, []).append(keyword)
+    for notice in NoticeType.objects.only("id", *SEARCH_SOURCE_FIELDS):
+        parts = [getattr(notice, field) or "" for field in SEARCH_SOURCE_FIELDS]
+        parts.extend(keyword for keyword in keywords.get(notice.id, []) if keyword)
+        document = "\n".join(part.strip() for part in parts if part.strip()).lower()
+        NoticeType.objects.filter(pk=notice.pk).update(search_document=document)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX notices_noticetype_search_gin ON notices_noticetype "
+            "USING gin (to_tsvector('simple', search_document))"
+        )
+    elif vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "search_document, content='notices_noticetype', content_rowid='id', tokenize='unicode61')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON notices_noticetype BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON notices_noticetype BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) "
+            "VALUES ('delete', old.id, old.search_document); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF search_document ON notices_noticetype BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) "
+            "VALUES ('delete', old.id, old.search_document); "
+            f"INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS notices_noticetype_search_gin")
+    elif vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0012_noticetype_source_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='noticetype',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models.functions import Length
+
+
+def populate_text_chars(apps, schema_editor):
+    OCRCacheEntry = apps.get_model("notices", "OCRCacheEntry")
+    OCRCacheEntry.objects.update(text_chars=Length("text"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0013_noticetype_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ocrcacheentry',
+            name='text_chars',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_text_chars, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.10 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0014_ocrcacheentry_text_chars'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoticeCatalogState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=255)),
+                ('changed_at', models.DateTimeField()),
+            ],
+        ),
+    ]
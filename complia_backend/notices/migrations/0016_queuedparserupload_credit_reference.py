@@ -0,0 +1,18 @@
+# Generated by Django 5.2.10 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notices', '0015_noticecatalogstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='queuedparserupload',
+            name='credit_reference',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 from django.utils.text import slugify
 
+from .search import SEARCH_SOURCE_FIELDS, build_search_document
+
 class NoticeType(models.Model):
     REVIEW_STATUS_CHOICES = [
         ("watch", "Watch"),
@@ -36,12 +38,17 @@ class NoticeType(models.Model):
     verified_at = models.DateTimeField(blank=True, null=True)
     source_url = models.URLField(blank=True, help_text="Official source or reference page used to monitor this notice")
     source_content_hash = models.CharField(max_length=64, blank=True)
+    source_etag = models.CharField(max_length=255, blank=True)
+    source_last_modified = models.CharField(max_length=64, blank=True)
     source_last_checked_at = models.DateTimeField(blank=True, null=True)
     source_last_changed_at = models.DateTimeField(blank=True, null=True)
     source_check_error = models.TextField(blank=True)
     review_status = models.CharField(max_length=20, choices=REVIEW_STATUS_CHOICES, default="watch", db_index=True)
     is_active = models.BooleanField(default=False, help_text="Only active notices are shown to users")
 
+    # Lowercased code, slug, title, summary and trigger keywords; see notices.search.
+    search_document = models.TextField(blank=True, default="", editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -57,6 +64,12 @@ class NoticeType(models.Model):
                 candidate = f"{base_slug}-{idx}"
                 idx += 1
             self.slug = candidate
+
+        keywords = self.triggers.order_by("id").values_list("keyword", flat=True) if self.pk else []
+        self.search_document = build_search_document(self, keywords)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(SEARCH_SOURCE_FIELDS):
+            kwargs["update_fields"] = {*update_fields, "search_document"}
         super().save(*args, **kwargs)
 
 class TriggerKeyword(models.Model):
@@ -66,6 +79,18 @@ class TriggerKeyword(models.Model):
     def __str__(self):
         return f"'{self.keyword}' -> {self.notice_type.code}"
 
+class NoticeCatalogState(models.Model):
+    """
+    Singleton: the last notice catalog version served and when it was first seen. Its
+    `changed_at` is the catalog's Last-Modified, so deletes and bulk updates move it too.
+    """
+
+    version = models.CharField(max_length=255)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Notice catalog changed at {self.changed_at.isoformat()}"
+
 class NoticeFeedback(models.Model):
     STATUS_CHOICES = [
         ("new", "New"),
@@ -223,6 +248,34 @@ class ParserExtraction(models.Model):
         return f"Extraction#{self.id} ({self.review_status})"
 
 
+class QueuedParserUpload(models.Model):
+    """
+    DB-backed work item for a parser job accepted in async mode.
+    The row holds the uploaded bytes until a parser worker finishes the job, then it is deleted.
+    """
+
+    parser_job = models.OneToOneField(
+        ParserJob,
+        on_delete=models.CASCADE,
+        related_name="queued_upload",
+    )
+    file_content = models.BinaryField()
+    notice_code_hint = models.CharField(max_length=80, blank=True)
+    credit_reserved = models.BooleanField(default=False)
+    # Ledger reference of the upload's credit reservation; settling the credit reuses it.
+    credit_reference = models.CharField(max_length=120, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    claimed_by = models.CharField(max_length=120, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"QueuedParserUpload#{self.id} job={self.parser_job_id}"
+
+
 class ParserBenchmarkRun(models.Model):
     sample_count = models.PositiveIntegerField(default=0)
     notice_precision = models.FloatField(default=0.0)
@@ -247,3 +300,26 @@ class ParserBenchmarkRun(models.Model):
 
     def __str__(self):
         return f"ParserBenchmarkRun#{self.id} ({self.overall_f1:.2f})"
+
+
+class OCRCacheEntry(models.Model):
+    """
+    Provider OCR text for one page image, keyed by SHA-256 of the producing provider's OCR
+    namespace and the image bytes. Entries never outlive the parser privacy window (PARSER_EPHEMERAL_TTL_HOURS).
+    """
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    provider = models.CharField(max_length=40)
+    text = models.TextField()
+    # len(text), kept so size-based eviction can total the cache without reading every text.
+    text_chars = models.PositiveIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-last_used_at"]
+
+    def __str__(self):
+        return f"OCRCacheEntry#{self.id} {self.provider}"
@@ -0,0 +1,162 @@
+import hashlib
+import threading
+import time
+from datetime import timedelta
+from typing import BinaryIO, Iterable
+
+from django.conf import settings
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import OCRCacheEntry
+
+# Bump when provider response handling changes so older cached text is not reused.
+OCR_CACHE_VERSION = "1"
+EVICTION_BATCH_SIZE = 500
+HASH_CHUNK_SIZE = 64 * 1024
+# Size eviction trims the cache to this share of OCR_CACHE_MAX_CHARS, so the next few writes
+# do not each trigger another eviction pass.
+EVICTION_LOW_WATER = 0.9
+
+_maintenance_lock = threading.Lock()
+_last_maintenance_at: float | None = None
+
+
+def _ocr_cache_namespace(provider: str) -> str:
+    if provider == "azure_vision":
+        flavour = f"read-v3.2@{settings.AZURE_VISION_ENDPOINT}"
+    else:
+        flavour = "DOCUMENT_TEXT_DETECTION"
+    return f"v{OCR_CACHE_VERSION}:{provider}:{flavour}"
+
+
+def ocr_cache_enabled() -> bool:
+    return bool(getattr(settings, "OCR_CACHE_ENABLED", False))
+
+
+def ocr_cache_ttl() -> timedelta:
+    privacy_hours = max(int(settings.PARSER_EPHEMERAL_TTL_HOURS), 1)
+    ttl_hours = int(getattr(settings, "OCR_CACHE_TTL_HOURS", privacy_hours))
+    return timedelta(hours=min(max(ttl_hours, 1), privacy_hours))
+
+
+def ocr_cache_keys(image_stream: BinaryIO, providers: Iterable[str], variant: str = "") -> dict[str, str]:
+    """
+    Returns {provider: cache key} for the image, hashing it in one chunked pass and rewinding
+    the stream for the provider call. Each provider's text is cached under its own key.
+    `variant` separates results derived differently from the same bytes (e.g. a PDF's page limit).
+    """
+    digests = {}
+    for provider in providers:
+        digest = hashlib.sha256()
+        digest.update(_ocr_cache_namespace(provider).encode("utf-8"))
+        digest.update(b"\x00")
+        if variant:
+            digest.update(variant.encode("utf-8"))
+            digest.update(b"\x00")
+        digests[provider] = digest
+    image_stream.seek(0)
+    while True:
+        chunk = image_stream.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        for digest in digests.values():
+            digest.update(chunk)
+    image_stream.seek(0)
+    return {provider: digest.hexdigest() for provider, digest in digests.items()}
+
+
+def ocr_cache_key(image_stream: BinaryIO, variant: str = "", provider: str | None = None) -> str:
+    """Cache key for `provider`'s text of the image (OCR_PROVIDER when omitted)."""
+    provider = provider or settings.OCR_PROVIDER
+    return ocr_cache_keys(image_stream, [provider], variant)[provider]
+
+
+def get_cached_ocr_text(*cache_keys: str) -> tuple[str, str] | None:
+    """Returns (text, provider that produced it) for the first of `cache_keys` with a live entry."""
+    if not ocr_cache_enabled() or not cache_keys:
+        return None
+    now = timezone.now()
+    entries = {
+        entry.cache_key: entry
+        for entry in OCRCacheEntry.objects.filter(cache_key__in=cache_keys, expires_at__gt=now).only("id", "cache_key", "provider", "text")
+    }
+    entry = next((entries[cache_key] for cache_key in cache_keys if cache_key in entries), None)
+    if entry is None:
+        return None
+    OCRCacheEntry.objects.filter(pk=entry.pk).update(last_used_at=now, hit_count=F("hit_count") + 1)
+    return entry.text, entry.provider
+
+
+def store_ocr_texts(entries: dict[str, tuple[str, str]]) -> None:
+    """
+    Caches freshly OCR'd page text; `entries` maps cache key -> (provider that produced the
+    text, text). Expiry is fixed at creation (hits do not extend it). At most once per
+    OCR_CACHE_MAINTENANCE_INTERVAL_SEC per process, expired rows are purged and the least
+    recently used rows are evicted until the cached text fits OCR_CACHE_MAX_CHARS.
+    """
+    if not ocr_cache_enabled() or not entries:
+        return
+    now = timezone.now()
+    expires_at = now + ocr_cache_ttl()
+    OCRCacheEntry.objects.bulk_create(
+        [
+            OCRCacheEntry(
+                cache_key=cache_key,
+                provider=provider[:40],
+                text=text,
+                text_chars=len(text),
+                last_used_at=now,
+                expires_at=expires_at,
+            )
+            for cache_key, (provider, text) in entries.items()
+        ],
+        ignore_conflicts=True,
+    )
+    if _maintenance_due():
+        purge_expired_ocr_cache()
+        evict_least_recently_used_ocr_cache()
+
+
+def _maintenance_due() -> bool:
+    global _last_maintenance_at
+    interval = max(float(getattr(settings, "OCR_CACHE_MAINTENANCE_INTERVAL_SEC", 0)), 0.0)
+    now = time.monotonic()
+    with _maintenance_lock:
+        if _last_maintenance_at is not None and now - _last_maintenance_at < interval:
+            return False
+        _last_maintenance_at = now
+        return True
+
+
+def purge_expired_ocr_cache() -> int:
+    deleted_count, _details = OCRCacheEntry.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted_count
+
+
+def evict_least_recently_used_ocr_cache() -> int:
+    """
+    Deletes least recently used entries until the cached text is back under
+    EVICTION_LOW_WATER x OCR_CACHE_MAX_CHARS (0 disables the bound). Returns the rows deleted.
+    """
+    max_chars = int(getattr(settings, "OCR_CACHE_MAX_CHARS", 0))
+    if max_chars < 1:
+        return 0
+    total_chars = OCRCacheEntry.objects.aggregate(total=Sum("text_chars"))["total"] or 0
+    if total_chars <= max_chars:
+        return 0
+    to_free = total_chars - int(max_chars * EVICTION_LOW_WATER)
+    deleted_count = 0
+    while to_free > 0:
+        batch = list(OCRCacheEntry.objects.order_by("last_used_at", "id").values_list("id", "text_chars")[:EVICTION_BATCH_SIZE])
+        if not batch:
+            break
+        evict_ids = []
+        for entry_id, text_chars in batch:
+            evict_ids.append(entry_id)
+            to_free -= text_chars
+            if to_free <= 0:
+                break
+        deleted, _details = OCRCacheEntry.objects.filter(id__in=evict_ids).delete()
+        deleted_count += deleted
+    return deleted_count
@@ -0,0 +1,116 @@
+"""
+In-process OCR latency histograms, one per provider.
+
+Every successful provider call records its end-to-end latency (for Azure Read this includes the
+analyze POST and status polls). Hedged routing (OCR_ROUTING=hedged) reads the primary provider's
+OCR_HEDGE_PERCENTILE latency as its hedge delay, so the secondary only sees the slow tail.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+
+from django.conf import settings
+
+# Bucket upper bounds in seconds; the last bucket catches everything slower.
+BUCKET_BOUNDS_SEC = (0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0)
+# Counts are halved once a histogram holds this many samples, so it follows the provider's
+# current behaviour rather than its all-time average.
+DECAY_AT_SAMPLES = 1000
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self._counts = [0] * (len(BUCKET_BOUNDS_SEC) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_sec: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(BUCKET_BOUNDS_SEC, elapsed_sec)] += 1
+            if sum(self._counts) >= DECAY_AT_SAMPLES:
+                self._counts = [count // 2 for count in self._counts]
+
+    @property
+    def samples(self) -> int:
+        with self._lock:
+            return sum(self._counts)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Upper bound of the bucket holding the `fraction` quantile, or None without samples."""
+        with self._lock:
+            counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return None
+        target = min(max(fraction, 0.0), 1.0) * total
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if running >= target and count:
+                return BUCKET_BOUNDS_SEC[index] if index < len(BUCKET_BOUNDS_SEC) else BUCKET_BOUNDS_SEC[-1]
+        return BUCKET_BOUNDS_SEC[-1]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+        labels = [f"le_{bound:g}s" for bound in BUCKET_BOUNDS_SEC] + [f"gt_{BUCKET_BOUNDS_SEC[-1]:g}s"]
+        return {"samples": sum(counts), "buckets": dict(zip(labels, counts))}
+
+
+_lock = threading.Lock()
+_histograms: dict[str, LatencyHistogram] = {}
+_hedge_counts: dict[str, dict[str, int]] = {}
+
+
+def _histogram(provider: str) -> LatencyHistogram:
+    with _lock:
+        if provider not in _histograms:
+            _histograms[provider] = LatencyHistogram()
+        return _histograms[provider]
+
+
+def record_ocr_latency(provider: str, elapsed_sec: float) -> None:
+    _histogram(provider).record(elapsed_sec)
+
+
+def record_hedge(primary: str, winner: str | None) -> None:
+    """Counts a fired hedge for `primary` and which provider answered first (None: neither)."""
+    with _lock:
+        counts = _hedge_counts.setdefault(primary, {"fired": 0, "primary_won": 0, "secondary_won": 0, "failed": 0})
+        counts["fired"] += 1
+        if winner is None:
+            counts["failed"] += 1
+        else:
+            counts["primary_won" if winner == primary else "secondary_won"] += 1
+
+
+def hedge_delay_sec(provider: str) -> float:
+    """
+    Seconds to wait for `provider` before hedging: its observed OCR_HEDGE_PERCENTILE latency once
+    OCR_HEDGE_MIN_SAMPLES calls were recorded, OCR_HEDGE_DELAY_SEC until then.
+    """
+    histogram = _histogram(provider)
+    if histogram.samples < max(int(settings.OCR_HEDGE_MIN_SAMPLES), 1):
+        return max(float(settings.OCR_HEDGE_DELAY_SEC), 0.0)
+    return histogram.percentile(float(settings.OCR_HEDGE_PERCENTILE)) or max(float(settings.OCR_HEDGE_DELAY_SEC), 0.0)
+
+
+def ocr_latency_snapshot() -> dict[str, dict]:
+    with _lock:
+        providers = sorted(set(_histograms) | set(_hedge_counts))
+        hedges = {provider: dict(counts) for provider, counts in _hedge_counts.items()}
+    return {
+        provider: {
+            **_histogram(provider).snapshot(),
+            "hedge_delay_sec": hedge_delay_sec(provider),
+            "hedges": hedges.get(provider, {}),
+        }
+        for provider in providers
+    }
+
+
+def reset_ocr_latency() -> None:
+    with _lock:
+        _histograms.clear()
+        _hedge_counts.clear()
@@ -1,16 +1,95 @@
 import base64
+import functools
+import io
+import json
+import logging
+import os
+import threading
 import time
-from typing import Any
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
+from typing import Any, BinaryIO, Callable, ContextManager, Iterable, Iterator, Union
 
 import fitz
 import requests
 from django.conf import settings
 
+from complia_backend import circuit_breakers, http_client
+
+from .ocr_cache import get_cached_ocr_text, ocr_cache_key, ocr_cache_keys, store_ocr_texts
+from .ocr_latency import hedge_delay_sec, record_hedge, record_ocr_latency
+
+logger = logging.getLogger(__name__)
+
+
+# Uploads arrive either as bytes (queued jobs) or as the path of the spooled upload file.
+DocumentSource = Union[bytes, str, os.PathLike]
+
 
 class OCRProcessingError(ValueError):
     """Raised when OCR extraction fails with a user-actionable message."""
 
 
+class OCRTimeoutError(OCRProcessingError):
+    """Raised when an OCR request or the document deadline runs out before text came back."""
+
+
+@contextmanager
+def open_document_source(source: DocumentSource) -> Iterator[BinaryIO]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+        return
+    with open(source, "rb") as handle:
+        yield handle
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+class _VisionRequestBody:
+    """
+    images:annotate JSON body that base64-encodes the image chunk by chunk while it is sent,
+    so neither the encoded image nor the JSON document is ever held in memory as a whole.
+    Re-iterable, and sized so requests sends a Content-Length instead of chunked encoding.
+    """
+
+    CHUNK_SIZE = 3 * 64 * 1024  # multiple of 3 so encoded chunks concatenate cleanly
+    _PLACEHOLDER = "__IMAGE_CONTENT__"
+
+    def __init__(self, image_stream: BinaryIO):
+        self._image_stream = image_stream
+        self._image_size = _stream_size(image_stream)
+        payload = {
+            "requests": [
+                {
+                    "image": {"content": self._PLACEHOLDER},
+                    "features": [{"type": "DOCUMENT_TEXT_DETECTION"}],
+                }
+            ]
+        }
+        prefix, suffix = json.dumps(payload).split(self._PLACEHOLDER)
+        self._prefix = prefix.encode("ascii")
+        self._suffix = suffix.encode("ascii")
+
+    def __len__(self) -> int:
+        encoded_size = 4 * ((self._image_size + 2) // 3)
+        return len(self._prefix) + encoded_size + len(self._suffix)
+
+    def __iter__(self) -> Iterator[bytes]:
+        self._image_stream.seek(0)
+        yield self._prefix
+        while True:
+            chunk = self._image_stream.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            yield base64.b64encode(chunk)
+        yield self._suffix
+
+
 def _readable_char_count(text: str) -> int:
     compact = "".join(ch for ch in text if not ch.isspace())
     return len(compact)
@@ -45,23 +124,54 @@ def _assert_ocr_configured() -> None:
             )
 
 
-def _vision_ocr_image_bytes(image_bytes: bytes) -> str:
-    encoded = base64.b64encode(image_bytes).decode("ascii")
-    payload = {
-        "requests": [
-            {
-                "image": {"content": encoded},
-                "features": [{"type": "DOCUMENT_TEXT_DETECTION"}],
-            }
-        ]
-    }
-    endpoint = (
-        "https://vision.googleapis.com/v1/images:annotate"
-        f"?key={settings.GOOGLE_VISION_API_KEY}"
-    )
+def _request_timeout_sec(deadline: float | None = None) -> int:
     timeout_sec = max(int(settings.OCR_REQUEST_TIMEOUT_SEC), 1)
+    if deadline is not None:
+        timeout_sec = max(min(timeout_sec, int(deadline - time.monotonic())), 1)
+    return timeout_sec
+
+
+def _provider_circuit(provider: str):
+    """
+    Runs the wrapped OCR call under `provider`'s circuit breaker and bulkhead, so a degraded
+    provider fails fast with an OCRProcessingError instead of waiting out OCR_REQUEST_TIMEOUT_SEC.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                with circuit_breakers.guard(provider):
+                    return func(*args, **kwargs)
+            except circuit_breakers.ProviderUnavailableError as exc:
+                raise OCRProcessingError(
+                    "OCR service is temporarily unavailable. Please retry in a few minutes."
+                ) from exc
+
+        return wrapper
+
+    return decorator
+
+
+@_provider_circuit("google_vision")
+def _vision_ocr_image(
+    image_stream: BinaryIO,
+    deadline: float | None = None,
+    cancel_event: threading.Event | None = None,
+) -> str:
+    # images:annotate is a single request: a hedge that already lost only skips sending it.
+    if cancel_event is not None and cancel_event.is_set():
+        raise OCRProcessingError("OCR request was cancelled.")
+    endpoint = f"{settings.GOOGLE_VISION_ENDPOINT}?key={settings.GOOGLE_VISION_API_KEY}"
+    timeout_sec = _request_timeout_sec(deadline)
     try:
-        response = requests.post(endpoint, json=payload, timeout=timeout_sec)
+        response = http_client.post(
+            "google_vision",
+            endpoint,
+            data=_VisionRequestBody(image_stream),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout_sec,
+        )
     except requests.RequestException as exc:
         raise OCRProcessingError(
             "OCR request failed. Please retry in a moment or upload a clearer file."
@@ -106,20 +216,38 @@ def _vision_ocr_image_bytes(image_bytes: bytes) -> str:
     return sanitized
 
 
-def _azure_read_ocr_image_bytes(image_bytes: bytes) -> str:
+@_provider_circuit("azure_vision")
+def _azure_read_analyze(
+    document_stream: BinaryIO,
+    deadline: float | None = None,
+    cancel_event: threading.Event | None = None,
+    content_type: str = "application/octet-stream",
+) -> list[dict[str, Any]]:
+    """
+    Runs one Azure Read operation (analyze POST, then status polls) and returns its `readResults`,
+    one entry per page. Read accepts images and whole PDFs alike.
+    `cancel_event` stops the status polling once a hedged request has been won elsewhere.
+    """
+    cancel_event = cancel_event or threading.Event()
+    if cancel_event.is_set():
+        raise OCRProcessingError("OCR request was cancelled.")
     endpoint = f"{settings.AZURE_VISION_ENDPOINT}/vision/v3.2/read/analyze"
     headers = {
         "Ocp-Apim-Subscription-Key": settings.AZURE_VISION_API_KEY,
-        "Content-Type": "application/octet-stream",
+        "Content-Type": content_type,
     }
-    timeout_sec = max(int(settings.OCR_REQUEST_TIMEOUT_SEC), 1)
+    timeout_sec = _request_timeout_sec(deadline)
+    document_stream.seek(0)
     try:
-        analyze_resp = requests.post(
+        analyze_resp = http_client.post(
+            "azure_vision",
             endpoint,
             headers=headers,
-            data=image_bytes,
+            data=document_stream,
             timeout=timeout_sec,
         )
+    except requests.Timeout as exc:
+        raise OCRTimeoutError("OCR request timed out. Please retry with a smaller or clearer file.") from exc
     except requests.RequestException as exc:
         raise OCRProcessingError(
             "Azure OCR request failed. Please retry in a moment or upload a clearer file."
@@ -146,14 +274,21 @@ def _azure_read_ocr_image_bytes(image_bytes: bytes) -> str:
     if not operation_location:
         raise OCRProcessingError("OCR service did not return a valid operation ID.")
 
-    deadline = time.monotonic() + max(timeout_sec, 8)
-    while time.monotonic() < deadline:
+    poll_deadline = time.monotonic() + max(timeout_sec, 8)
+    if deadline is not None:
+        poll_deadline = min(poll_deadline, deadline)
+    while time.monotonic() < poll_deadline:
+        if cancel_event.is_set():
+            raise OCRProcessingError("OCR request was cancelled.")
         try:
-            result_resp = requests.get(
+            result_resp = http_client.get(
+                "azure_vision",
                 operation_location,
                 headers={"Ocp-Apim-Subscription-Key": settings.AZURE_VISION_API_KEY},
                 timeout=timeout_sec,
             )
+        except requests.Timeout as exc:
+            raise OCRTimeoutError("OCR status check timed out. Please retry.") from exc
         except requests.RequestException as exc:
             raise OCRProcessingError("OCR status check failed. Please retry.") from exc
 
@@ -174,34 +309,185 @@ def _azure_read_ocr_image_bytes(image_bytes: bytes) -> str:
 
         state = (result_body.get("status") or "").lower()
         if state == "succeeded":
-            pages = result_body.get("analyzeResult", {}).get("readResults", [])
-            lines: list[str] = []
-            for page in pages:
-                for line in page.get("lines", []):
-                    line_text = (line.get("text") or "").strip()
-                    if line_text:
-                        lines.append(line_text)
-            extracted = sanitize_ocr_text("\n".join(lines))
-            if not extracted:
-                raise OCRProcessingError(
-                    "Could not extract readable text from this image. Upload a clearer scan or a text file."
-                )
-            return extracted
+            return result_body.get("analyzeResult", {}).get("readResults", [])
         if state == "failed":
             provider_message = result_body.get("analyzeResult", {}).get("message", "")
             raise OCRProcessingError(
                 f"OCR processing failed: {provider_message}" if provider_message else "OCR processing failed."
             )
 
-        time.sleep(1)
+        cancel_event.wait(1)
+
+    raise OCRTimeoutError("OCR request timed out. Please retry with a smaller or clearer file.")
+
 
-    raise OCRProcessingError("OCR request timed out. Please retry with a smaller or clearer file.")
+def _azure_read_page_text(read_result: dict[str, Any]) -> str:
+    lines = [(line.get("text") or "").strip() for line in read_result.get("lines", [])]
+    return sanitize_ocr_text("\n".join(line for line in lines if line))
+
+
+def _azure_read_ocr_image(
+    image_stream: BinaryIO,
+    deadline: float | None = None,
+    cancel_event: threading.Event | None = None,
+) -> str:
+    read_results = _azure_read_analyze(image_stream, deadline, cancel_event)
+    page_texts = (_azure_read_page_text(page) for page in read_results)
+    extracted = sanitize_ocr_text("\n".join(text for text in page_texts if text))
+    if not extracted:
+        raise OCRProcessingError(
+            "Could not extract readable text from this image. Upload a clearer scan or a text file."
+        )
+    return extracted
 
 
-def _provider_ocr_image_bytes(image_bytes: bytes) -> str:
-    if settings.OCR_PROVIDER == "azure_vision":
-        return _azure_read_ocr_image_bytes(image_bytes)
-    return _vision_ocr_image_bytes(image_bytes)
+OCR_PROVIDER_CALLS = {
+    "google_vision": _vision_ocr_image,
+    "azure_vision": _azure_read_ocr_image,
+}
+
+
+def _ocr_provider_configured(provider: str) -> bool:
+    if provider == "google_vision":
+        return bool(settings.GOOGLE_VISION_API_KEY)
+    if provider == "azure_vision":
+        return bool(settings.AZURE_VISION_API_KEY and settings.AZURE_VISION_ENDPOINT)
+    return False
+
+
+def _hedge_secondary_provider() -> str | None:
+    """The provider hedged requests go to, or None when OCR_ROUTING does not hedge."""
+    if settings.OCR_ROUTING != "hedged":
+        return None
+    primary = settings.OCR_PROVIDER
+    secondary = settings.OCR_SECONDARY_PROVIDER or ("google_vision" if primary == "azure_vision" else "azure_vision")
+    if secondary == primary or secondary not in OCR_PROVIDER_CALLS or not _ocr_provider_configured(secondary):
+        return None
+    return secondary
+
+
+def _timed_provider_ocr(
+    provider: str,
+    image_stream: BinaryIO,
+    deadline: float | None = None,
+    cancel_event: threading.Event | None = None,
+) -> str:
+    started = time.monotonic()
+    text = OCR_PROVIDER_CALLS[provider](image_stream, deadline, cancel_event)
+    record_ocr_latency(provider, time.monotonic() - started)
+    return text
+
+
+def _stream_opener(image_stream: BinaryIO) -> Callable[[], ContextManager[BinaryIO]] | None:
+    """
+    Returns a callable giving the hedge its own copy of `image_stream` (the primary is still
+    reading the original), or None when the stream cannot be reopened.
+    """
+    if isinstance(image_stream, io.BytesIO):
+        return lambda: nullcontext(io.BytesIO(image_stream.getvalue()))
+    name = getattr(image_stream, "name", None)
+    if isinstance(name, str) and os.path.exists(name):
+        return lambda: open(name, "rb")
+    return None
+
+
+def _hedged_provider_ocr_image(
+    primary: str,
+    secondary: str,
+    image_stream: BinaryIO,
+    deadline: float | None = None,
+) -> tuple[str, str]:
+    """
+    Sends the image to `primary` and, when it has not answered within its hedge delay (or failed
+    sooner), sends the same image to `secondary`. The first successful text wins and the other
+    request is cancelled: an unstarted call is dropped and Azure stops polling. Returns
+    (text, provider that produced it); raises the primary's error when both fail.
+    """
+    open_copy = _stream_opener(image_stream)
+    if open_copy is None:
+        return _timed_provider_ocr(primary, image_stream, deadline), primary
+
+    def run_secondary(cancel_event: threading.Event) -> str:
+        with open_copy() as secondary_stream:
+            return _timed_provider_ocr(secondary, secondary_stream, deadline, cancel_event)
+
+    cancel_events = {primary: threading.Event(), secondary: threading.Event()}
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-hedge")
+    try:
+        primary_future = executor.submit(_timed_provider_ocr, primary, image_stream, deadline, cancel_events[primary])
+        delay = hedge_delay_sec(primary)
+        if deadline is not None:
+            delay = min(delay, max(deadline - time.monotonic(), 0))
+        wait([primary_future], timeout=delay)
+        if primary_future.done() and primary_future.exception() is None:
+            return primary_future.result(), primary
+
+        futures = {
+            primary_future: primary,
+            executor.submit(run_secondary, cancel_events[secondary]): secondary,
+        }
+        failures: dict[str, BaseException] = {}
+        pending = set(futures)
+        while pending:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                failure = future.exception()
+                if failure is None:
+                    winner = futures[future]
+                    for other_future, other in futures.items():
+                        if other_future is not future:
+                            cancel_events[other].set()
+                            other_future.cancel()
+                    record_hedge(primary, winner)
+                    return future.result(), winner
+                failures[futures[future]] = failure
+        record_hedge(primary, None)
+    finally:
+        for cancel_event in cancel_events.values():
+            cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    failure = failures.get(primary) or failures.get(secondary)
+    if failure is not None:
+        raise failure
+    raise OCRTimeoutError("OCR request timed out. Please retry with a smaller or clearer file.")
+
+
+def _ocr_routing_providers() -> list[str]:
+    """Providers whose text a page may come back with: OCR_PROVIDER, then the hedge target."""
+    secondary = _hedge_secondary_provider()
+    return [settings.OCR_PROVIDER] if secondary is None else [settings.OCR_PROVIDER, secondary]
+
+
+def _provider_ocr_image(image_stream: BinaryIO, deadline: float | None = None) -> tuple[str, str]:
+    """Returns (text, provider that produced it)."""
+    primary = settings.OCR_PROVIDER
+    secondary = _hedge_secondary_provider()
+    if secondary is None:
+        return _timed_provider_ocr(primary, image_stream, deadline), primary
+    return _hedged_provider_ocr_image(primary, secondary, image_stream, deadline)
+
+
+def _cached_provider_ocr_image(image_stream: BinaryIO) -> tuple[str, str, bool]:
+    """
+    Returns (text, provider that produced it, cache_hit). Text is cached under the content hash
+    and the producing provider, and any routed provider's cached text is a hit.
+    """
+    cache_keys = ocr_cache_keys(image_stream, _ocr_routing_providers())
+    cached = get_cached_ocr_text(*cache_keys.values())
+    if cached is not None:
+        return *cached, True
+    text, provider = _provider_ocr_image(image_stream)
+    store_ocr_texts({cache_keys[provider]: (provider, text)})
+    return text, provider, False
+
+
+def _ocr_engine_label(providers: Iterable[str]) -> str:
+    """`ocr_engine` for a document: its page providers in first-use order, e.g. "azure_vision+google_vision"."""
+    return "+".join(dict.fromkeys(providers)) or settings.OCR_PROVIDER
 
 
 def _extract_pdf_embedded_text(pdf_doc: fitz.Document, page_limit: int) -> tuple[str, int]:
@@ -212,28 +498,196 @@ def _extract_pdf_embedded_text(pdf_doc: fitz.Document, page_limit: int) -> tuple
     return sanitize_ocr_text("\n\n".join(parts)), page_count
 
 
-def _extract_pdf_via_raster_ocr(pdf_doc: fitz.Document, page_limit: int) -> tuple[str, int]:
+def _rasterize_pdf_page(pdf_doc: fitz.Document, page_index: int) -> bytes:
+    pixmap = pdf_doc[page_index].get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+    return pixmap.tobytes("png")
+
+
+def _extract_pdf_via_raster_ocr(
+    pdf_doc: fitz.Document,
+    page_limit: int,
+    deadline: float,
+) -> tuple[str, dict[str, Any]]:
+    """
+    OCRs up to `page_limit` pages concurrently and joins the text back in page order.
+
+    Pages are rasterized on the calling thread (PyMuPDF documents are not thread-safe) while
+    earlier pages are already with the provider. OCR_PAGE_CONCURRENCY bounds in-flight pages and
+    `deadline` (time.monotonic() based) bounds the whole document. Cache lookups and writes also stay on
+    the calling thread so pool threads never open DB connections.
+
+    Returns:
+        tuple[text, stats]:
+            stats keys: ocr_engine, ocr_pages_processed, ocr_page_errors, ocr_cache_hits, ocr_cache_misses
+            ocr_engine names the provider(s) whose text made it into the document
+            ocr_page_errors items: {"page": 1-based page number, "error": user-facing message}
+    """
     page_count = min(max(page_limit, 1), pdf_doc.page_count)
-    parts: list[str] = []
+    workers = min(max(int(settings.OCR_PAGE_CONCURRENCY), 1), page_count)
+
+    providers = _ocr_routing_providers()
+    page_texts: dict[int, str] = {}
+    page_providers: dict[int, str] = {}
+    page_failures: dict[int, Exception] = {}
+    page_cache_keys: dict[int, dict[str, str]] = {}
+    cache_hits = 0
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-page")
+    try:
+        futures = {}
+        for page_index in range(page_count):
+            if time.monotonic() >= deadline:
+                break
+            page_stream = io.BytesIO(_rasterize_pdf_page(pdf_doc, page_index))
+            cache_keys = ocr_cache_keys(page_stream, providers)
+            cached = get_cached_ocr_text(*cache_keys.values())
+            if cached is not None:
+                page_texts[page_index], page_providers[page_index] = cached
+                cache_hits += 1
+                continue
+            page_cache_keys[page_index] = cache_keys
+            futures[executor.submit(_provider_ocr_image, page_stream, deadline)] = page_index
+
+        done, _not_done = wait(futures, timeout=max(deadline - time.monotonic(), 0))
+        for future in done:
+            page_index = futures[future]
+            try:
+                page_texts[page_index], page_providers[page_index] = future.result()
+            except Exception as exc:
+                page_failures[page_index] = exc
+    finally:
+        # Stragglers past the deadline are abandoned; their own request timeouts end them.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    store_ocr_texts(
+        {
+            cache_keys[page_providers[page_index]]: (page_providers[page_index], page_texts[page_index])
+            for page_index, cache_keys in page_cache_keys.items()
+            if page_index in page_texts
+        }
+    )
+
+    page_errors: list[dict[str, Any]] = []
     for page_index in range(page_count):
-        page = pdf_doc[page_index]
-        pixmap = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-        image_bytes = pixmap.tobytes("png")
-        parts.append(_provider_ocr_image_bytes(image_bytes))
-    return sanitize_ocr_text("\n\n".join(parts)), page_count
+        if page_index in page_texts:
+            continue
+        failure = page_failures.get(page_index)
+        if isinstance(failure, OCRProcessingError):
+            message = str(failure)
+        elif failure is not None:
+            message = "OCR failed for this page."
+        else:
+            message = "OCR timed out for this page."
+        page_errors.append({"page": page_index + 1, "error": message})
+
+    if not page_texts:
+        first_failure = next(
+            (page_failures[index] for index in sorted(page_failures) if isinstance(page_failures[index], OCRProcessingError)),
+            None,
+        )
+        if first_failure is not None:
+            raise first_failure
+        raise OCRTimeoutError("OCR request timed out. Please retry with a smaller or clearer file.")
+
+    ordered_text = "\n\n".join(page_texts[index] for index in sorted(page_texts))
+    stats = {
+        "ocr_engine": _ocr_engine_label(page_providers[index] for index in sorted(page_providers)),
+        "ocr_pages_processed": len(page_texts),
+        "ocr_page_errors": page_errors,
+        "ocr_cache_hits": cache_hits,
+        "ocr_cache_misses": len(page_cache_keys),
+    }
+    return sanitize_ocr_text(ordered_text), stats
+
+
+def _pdf_native_ocr_enabled() -> bool:
+    return bool(settings.OCR_PDF_NATIVE_ENABLED) and settings.OCR_PROVIDER == "azure_vision"
+
+
+@contextmanager
+def _open_pdf_for_submission(pdf_doc: fitz.Document, page_count: int, source: DocumentSource) -> Iterator[BinaryIO]:
+    """
+    Yields the PDF to submit: the original upload when it is within the page limit, otherwise
+    a copy holding only its first `page_count` pages.
+    """
+    if page_count >= pdf_doc.page_count:
+        with open_document_source(source) as pdf_stream:
+            yield pdf_stream
+        return
+    with fitz.open() as trimmed:
+        trimmed.insert_pdf(pdf_doc, from_page=0, to_page=page_count - 1)
+        trimmed_bytes = trimmed.tobytes(garbage=3, deflate=True)
+    yield io.BytesIO(trimmed_bytes)
+
+
+def _extract_pdf_via_native_ocr(
+    pdf_doc: fitz.Document,
+    page_limit: int,
+    source: DocumentSource,
+    deadline: float,
+) -> tuple[str, dict[str, Any]]:
+    """
+    Submits the PDF itself to Azure Read as a single operation and joins `readResults` back in
+    page order. No page is rasterized and the document costs one analyze+poll cycle instead of
+    one per page. The result is cached under the hash of the uploaded PDF and the page limit.
+
+    Raises OCRProcessingError when the operation fails; pages that come back without text are
+    reported in `ocr_page_errors`. Stats use the same keys as `_extract_pdf_via_raster_ocr`.
+    """
+    page_count = min(max(page_limit, 1), pdf_doc.page_count)
+    # Keyed on the upload itself: re-saving a trimmed copy does not give stable bytes.
+    with open_document_source(source) as original_stream:
+        cache_key = ocr_cache_key(original_stream, variant=f"pdf-read:{page_count}")
+    cached = get_cached_ocr_text(cache_key)
+    if cached is not None:
+        cached_text, provider = cached
+        stats = {
+            "ocr_engine": provider,
+            "ocr_pages_processed": page_count,
+            "ocr_page_errors": [],
+            "ocr_cache_hits": 1,
+            "ocr_cache_misses": 0,
+        }
+        return cached_text, stats
+    with _open_pdf_for_submission(pdf_doc, page_count, source) as pdf_stream:
+        read_results = _azure_read_analyze(pdf_stream, deadline)
+
+    page_texts: dict[int, str] = {}
+    for read_result in read_results[:page_count]:
+        page_number = int(read_result.get("page") or len(page_texts) + 1)
+        page_texts[page_number] = _azure_read_page_text(read_result)
+    page_errors = [
+        {"page": page_number, "error": "Could not extract readable text from this page."}
+        for page_number in range(1, page_count + 1)
+        if not page_texts.get(page_number)
+    ]
+    text = sanitize_ocr_text("\n\n".join(page_texts[number] for number in sorted(page_texts) if page_texts[number]))
+    if text:
+        store_ocr_texts({cache_key: (settings.OCR_PROVIDER, text)})
+    stats = {
+        "ocr_engine": settings.OCR_PROVIDER,
+        "ocr_pages_processed": sum(1 for page_text in page_texts.values() if page_text),
+        "ocr_page_errors": page_errors,
+        "ocr_cache_hits": 0,
+        "ocr_cache_misses": 1,
+    }
+    return text, stats
 
 
 def extract_text_from_binary_document(
-    raw_bytes: bytes,
+    source: DocumentSource,
     mime_type: str,
     filename: str,
 ) -> tuple[str, dict[str, Any]]:
     """
     Extract text from binary notice uploads using OCR + PDF fallback strategy.
 
+    `source` is the upload's bytes or the path of its spooled file. Paths are never read into
+    memory whole: PDFs are opened by PyMuPDF from disk and images are streamed to the provider.
+
     Returns:
         tuple[text, metadata]:
-            metadata keys: ocr_engine, ocr_pages_processed, ocr_used, ocr_text_chars
+            metadata keys: ocr_engine, ocr_pages_processed, ocr_used, ocr_text_chars, ocr_page_errors,
+            ocr_cache_hits, ocr_cache_misses
     """
 
     _assert_ocr_configured()
@@ -244,23 +698,31 @@ def extract_text_from_binary_document(
     min_text_chars = max(int(settings.OCR_MIN_TEXT_CHARS), 20)
 
     if mime.startswith("image/"):
-        image_text = _provider_ocr_image_bytes(raw_bytes)
+        with open_document_source(source) as image_stream:
+            image_text, ocr_engine, cache_hit = _cached_provider_ocr_image(image_stream)
         text_chars = _readable_char_count(image_text)
         if text_chars < min_text_chars:
             raise OCRProcessingError(
                 "OCR extracted too little text from this image. Upload a clearer file or .txt."
             )
         metadata = {
-            "ocr_engine": settings.OCR_PROVIDER,
+            "ocr_engine": ocr_engine,
             "ocr_pages_processed": 1,
             "ocr_used": True,
             "ocr_text_chars": text_chars,
+            "ocr_page_errors": [],
+            "ocr_cache_hits": 1 if cache_hit else 0,
+            "ocr_cache_misses": 0 if cache_hit else 1,
         }
         return image_text, metadata
 
     if mime == "application/pdf" or lower_name.endswith(".pdf"):
         try:
-            with fitz.open(stream=raw_bytes, filetype="pdf") as pdf_doc:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                pdf_doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                pdf_doc = fitz.open(source, filetype="pdf")
+            with pdf_doc:
                 if pdf_doc.page_count < 1:
                     raise OCRProcessingError("The PDF appears empty. Please upload a valid notice file.")
 
@@ -272,10 +734,25 @@ def extract_text_from_binary_document(
                         "ocr_pages_processed": processed_pages,
                         "ocr_used": False,
                         "ocr_text_chars": embedded_chars,
+                        "ocr_page_errors": [],
+                        "ocr_cache_hits": 0,
+                        "ocr_cache_misses": 0,
                     }
                     return embedded_text, metadata
 
-                ocr_text, ocr_pages = _extract_pdf_via_raster_ocr(pdf_doc, page_limit)
+                # One deadline for the document, shared by the native attempt and any raster fallback.
+                deadline = time.monotonic() + max(int(settings.OCR_DOCUMENT_DEADLINE_SEC), 1)
+                ocr_text, ocr_stats = None, {}
+                if _pdf_native_ocr_enabled():
+                    try:
+                        ocr_text, ocr_stats = _extract_pdf_via_native_ocr(pdf_doc, page_limit, source, deadline)
+                    except OCRProcessingError as exc:
+                        # A timeout or an open breaker would only repeat per page against the same provider.
+                        if isinstance(exc, OCRTimeoutError) or isinstance(exc.__cause__, circuit_breakers.ProviderUnavailableError):
+                            raise
+                        logger.warning("Native PDF OCR failed for %s; falling back to page rasterization.", filename)
+                if ocr_text is None:
+                    ocr_text, ocr_stats = _extract_pdf_via_raster_ocr(pdf_doc, page_limit, deadline)
                 ocr_chars = _readable_char_count(ocr_text)
                 if ocr_chars < min_text_chars:
                     raise OCRProcessingError(
@@ -283,9 +760,9 @@ def extract_text_from_binary_document(
                     )
                 metadata = {
                     "ocr_engine": settings.OCR_PROVIDER,
-                    "ocr_pages_processed": ocr_pages,
                     "ocr_used": True,
                     "ocr_text_chars": ocr_chars,
+                    **ocr_stats,
                 }
                 return ocr_text, metadata
         except OCRProcessingError:
@@ -0,0 +1,363 @@
+import codecs
+import logging
+import string
+import uuid
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from accounts.models import AnalyticsEvent
+from accounts.payment_ops import PARSER_UPLOAD_REFERENCE_PREFIX, consume_parser_credit, refund_parser_credit
+from .models import ParserExtraction, ParserJob, QueuedParserUpload
+from .ocr_utils import (
+    DocumentSource,
+    OCRProcessingError,
+    extract_text_from_binary_document,
+    open_document_source,
+    sanitize_ocr_text,
+)
+from .parser_utils import NonNoticeDocumentError, NoticeText, analyze_notice_likelihood, parse_notice_document
+
+logger = logging.getLogger(__name__)
+
+NOT_A_NOTICE_MESSAGE = (
+    "This file does not appear to be a tax or compliance notice. Please upload the actual notice PDF/image/text."
+)
+UNREADABLE_TEXT_MESSAGE = (
+    "Could not extract readable text from this file. Please upload a clearer scan or .txt file."
+)
+WORKER_FAILURE_MESSAGE = "Parser processing failed. Please retry the upload."
+TEXT_UPLOAD_MAX_BYTES = 60000
+TEXT_READ_CHUNK_SIZE = 8192
+
+
+class QueuedUploadLeaseLost(Exception):
+    """The worker's claim on a queued upload expired and another worker re-claimed it."""
+
+
+def new_credit_reference() -> str:
+    """One ledger reference per upload, shared by its credit reservation and settlement."""
+    return f"{PARSER_UPLOAD_REFERENCE_PREFIX}{uuid.uuid4().hex}"
+
+
+def looks_like_readable_text(raw_text: str) -> bool:
+    compact = "".join(ch for ch in raw_text if not ch.isspace())
+    if len(compact) < 30:
+        return False
+    alpha_count = sum(ch.isalpha() for ch in compact)
+    alpha_ratio = alpha_count / max(len(compact), 1)
+    printable_count = sum(ch in string.printable for ch in raw_text)
+    printable_ratio = printable_count / max(len(raw_text), 1)
+    return alpha_count >= 30 and alpha_ratio >= 0.2 and printable_ratio >= 0.7
+
+
+def is_binary_upload(mime_type: str, filename: str) -> bool:
+    mime = (mime_type or "").lower()
+    return mime.startswith("image/") or mime == "application/pdf" or (filename or "").lower().endswith(".pdf")
+
+
+def read_text_upload(source: DocumentSource) -> str:
+    """Decodes at most TEXT_UPLOAD_MAX_BYTES of a text upload, one chunk at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    parts: list[str] = []
+    remaining = TEXT_UPLOAD_MAX_BYTES
+    with open_document_source(source) as stream:
+        while remaining > 0:
+            chunk = stream.read(min(TEXT_READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            parts.append(decoder.decode(chunk))
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def extract_upload_text(source: DocumentSource, mime_type: str, filename: str) -> tuple[str, dict[str, Any]]:
+    """
+    Turns an upload (bytes or spooled file path) into readable text, using OCR for images/PDFs.
+    Raises ValueError (or OCRProcessingError) with a user-facing message when no usable text comes out.
+    """
+    ocr_metadata: dict[str, Any] = {
+        "ocr_engine": "none",
+        "ocr_pages_processed": 0,
+        "ocr_used": False,
+        "ocr_text_chars": 0,
+        "ocr_page_errors": [],
+        "ocr_cache_hits": 0,
+        "ocr_cache_misses": 0,
+    }
+    if is_binary_upload(mime_type, filename):
+        raw_text, ocr_metadata = extract_text_from_binary_document(
+            source=source,
+            mime_type=mime_type,
+            filename=filename,
+        )
+    else:
+        raw_text = sanitize_ocr_text(read_text_upload(source))
+        ocr_metadata["ocr_text_chars"] = len("".join(ch for ch in raw_text if not ch.isspace()))
+    if not looks_like_readable_text(raw_text):
+        raise ValueError(UNREADABLE_TEXT_MESSAGE)
+    return raw_text, ocr_metadata
+
+
+def record_parser_result(
+    *,
+    user,
+    raw_text: str,
+    filename: str,
+    mime_type: str,
+    notice_code: str,
+    ocr_metadata: dict[str, Any],
+    credit_reserved: bool,
+    credit_reference: str = "",
+    parser_job: ParserJob | None = None,
+    queued: QueuedParserUpload | None = None,
+) -> ParserJob:
+    """
+    Parses extracted text and stores the job outcome plus its extraction row.
+    A queued `parser_job` is finalized in place and its `queued` row removed; otherwise a new job is created.
+    A reserved credit is consumed under `credit_reference`, the reference its reservation was logged with.
+    Raises NonNoticeDocumentError when the text does not look like a notice, and QueuedUploadLeaseLost
+    (writing nothing) when `queued` was re-claimed by another worker in the meantime.
+    """
+    document = NoticeText(raw_text)
+    notice_likelihood = analyze_notice_likelihood(document, filename)
+    if not notice_likelihood["is_likely_notice"]:
+        raise NonNoticeDocumentError(NOT_A_NOTICE_MESSAGE)
+
+    parsed = parse_notice_document(document, filename, notice_code)
+    deadline_date = parsed["deadline_date"]
+    legal_section = parsed["legal_section"]
+    amount_claimed = parsed["amount_claimed"]
+    notice = parsed["notice"]
+    confidence = parsed["confidence"]
+
+    now = timezone.now()
+    requires_review = confidence < settings.PARSER_REVIEW_THRESHOLD
+    job_status = "review_required" if requires_review else "completed"
+    delete_after = now + timedelta(hours=settings.PARSER_EPHEMERAL_TTL_HOURS)
+
+    payload = {
+        "notice_code_detected": notice.code if notice else "",
+        "deadline_date": deadline_date.isoformat() if deadline_date else "",
+        "legal_section": legal_section,
+        "amount_claimed": str(amount_claimed) if amount_claimed is not None else "",
+        "confidence": confidence,
+        "ocr_engine": ocr_metadata["ocr_engine"],
+        "ocr_pages_processed": ocr_metadata["ocr_pages_processed"],
+        "ocr_used": ocr_metadata["ocr_used"],
+        "ocr_text_chars": ocr_metadata["ocr_text_chars"],
+        "ocr_page_errors": ocr_metadata.get("ocr_page_errors", []),
+        "ocr_cache_hits": ocr_metadata.get("ocr_cache_hits", 0),
+        "ocr_cache_misses": ocr_metadata.get("ocr_cache_misses", 0),
+        "notice_likelihood_score": notice_likelihood["score"],
+        "notice_likelihood_positive_signals": notice_likelihood["positives"],
+        "notice_likelihood_negative_signals": notice_likelihood["negatives"],
+    }
+
+    with transaction.atomic():
+        # Deleting the queue row under our claim is what makes this worker the one that settles the job.
+        if queued is not None and not _held_claim(queued).delete()[0]:
+            raise QueuedUploadLeaseLost(f"Lease on queued upload {queued.pk} was lost.")
+        if parser_job is None:
+            parser_job = ParserJob.objects.create(
+                user=user,
+                notice=notice,
+                original_filename=filename,
+                mime_type=mime_type,
+                status=job_status,
+                confidence=confidence,
+                is_private_beta=True,
+                delete_after=delete_after,
+                processed_at=now,
+            )
+        else:
+            parser_job.notice = notice
+            parser_job.status = job_status
+            parser_job.confidence = confidence
+            parser_job.delete_after = delete_after
+            parser_job.processed_at = now
+            parser_job.error_message = ""
+            parser_job.save(
+                update_fields=[
+                    "notice",
+                    "status",
+                    "confidence",
+                    "delete_after",
+                    "processed_at",
+                    "error_message",
+                    "updated_at",
+                ]
+            )
+
+        ParserExtraction.objects.create(
+            parser_job=parser_job,
+            deadline_date=deadline_date,
+            legal_section=legal_section,
+            amount_claimed=amount_claimed,
+            notice_type_detected=(notice.title if notice else "Unknown")[:120],
+            confidence=confidence,
+            normalized_payload=payload,
+            raw_text_excerpt=raw_text[:1200],
+            review_status="pending" if requires_review else "approved",
+        )
+
+        if credit_reserved:
+            consume_parser_credit(user, reference=credit_reference)
+            AnalyticsEvent.objects.create(
+                user=user,
+                session_id=f"parser-{parser_job.id}",
+                event_name="credit_consumed",
+                path="/parser/upload",
+                metadata={"parser_job_id": parser_job.id, "credits_used": 1},
+            )
+
+    return parser_job
+
+
+def enqueue_parser_upload(
+    *,
+    user,
+    raw_bytes: bytes,
+    filename: str,
+    mime_type: str,
+    notice_code: str,
+    credit_reserved: bool,
+    credit_reference: str = "",
+) -> ParserJob:
+    """
+    Stores an upload as a `queued` parser job for `run_parser_workers` to pick up.
+    The privacy TTL restarts when the job finishes, and cleanup never deletes a job while it is still queued.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        parser_job = ParserJob.objects.create(
+            user=user,
+            original_filename=filename,
+            mime_type=mime_type,
+            status="queued",
+            is_private_beta=True,
+            delete_after=now + timedelta(hours=settings.PARSER_EPHEMERAL_TTL_HOURS),
+        )
+        QueuedParserUpload.objects.create(
+            parser_job=parser_job,
+            file_content=raw_bytes,
+            notice_code_hint=notice_code,
+            credit_reserved=credit_reserved,
+            credit_reference=credit_reference,
+        )
+    return parser_job
+
+
+def claim_queued_parser_uploads(worker_id: str, limit: int) -> list[int]:
+    """
+    Leases up to `limit` queued uploads to `worker_id` and returns their ids.
+    Rows whose lease expired (crashed worker) become claimable again.
+    """
+    if limit < 1:
+        return []
+
+    now = timezone.now()
+    lease_cutoff = now - timedelta(seconds=max(int(settings.PARSER_JOB_LEASE_SEC), 1))
+    claimable = Q(claimed_at__isnull=True) | Q(claimed_at__lt=lease_cutoff)
+    worker_id = worker_id[:120]
+    candidates = QueuedParserUpload.objects.filter(claimable).order_by("created_at", "id")
+
+    # SKIP LOCKED lets concurrent workers pick disjoint rows. Backends without it (SQLite) read
+    # outside a transaction instead, so a read lock is never upgraded while another worker writes.
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    with transaction.atomic() if skip_locked else nullcontext():
+        if skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        candidate_ids = list(candidates.values_list("id", flat=True)[:limit])
+        if not candidate_ids:
+            return []
+        # The UPDATE re-checks the lease, so two workers racing for the same rows cannot both win.
+        QueuedParserUpload.objects.filter(claimable, id__in=candidate_ids).update(
+            claimed_by=worker_id,
+            claimed_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(
+        QueuedParserUpload.objects.filter(id__in=candidate_ids, claimed_by=worker_id, claimed_at=now)
+        .order_by("created_at", "id")
+        .values_list("id", flat=True)
+    )
+
+
+def _held_claim(queued: QueuedParserUpload):
+    """Matches the queue row only while it still carries the claim this worker loaded."""
+    return QueuedParserUpload.objects.filter(pk=queued.pk, claimed_by=queued.claimed_by, claimed_at=queued.claimed_at)
+
+
+def _fail_queued_upload(queued: QueuedParserUpload, message: str, refund_credit: bool) -> bool:
+    """Fails the job and settles its credit; returns False when the claim was lost (nothing written)."""
+    now = timezone.now()
+    with transaction.atomic():
+        deleted_count, _details = _held_claim(queued).delete()
+        if not deleted_count:
+            return False
+        ParserJob.objects.filter(pk=queued.parser_job_id).update(
+            status="failed",
+            error_message=message,
+            delete_after=now + timedelta(hours=settings.PARSER_EPHEMERAL_TTL_HOURS),
+            processed_at=now,
+            updated_at=now,
+        )
+        if queued.credit_reserved and queued.parser_job.user_id:
+            settle_credit = refund_parser_credit if refund_credit else consume_parser_credit
+            settle_credit(queued.parser_job.user, reference=queued.credit_reference)
+    return True
+
+
+def process_queued_parser_upload(queued_id: int) -> str:
+    """
+    Runs OCR + parsing for one claimed queue row.
+    Returns the final job status, "retry" when the row was released for another attempt,
+    "missing" when the row no longer exists, or "lease_lost" when the job outlived
+    PARSER_JOB_LEASE_SEC and another worker re-claimed it (that worker settles the job).
+    """
+    try:
+        queued = QueuedParserUpload.objects.select_related("parser_job__user").get(pk=queued_id)
+    except QueuedParserUpload.DoesNotExist:
+        return "missing"
+
+    parser_job = queued.parser_job
+    try:
+        raw_text, ocr_metadata = extract_upload_text(
+            bytes(queued.file_content),
+            parser_job.mime_type,
+            parser_job.original_filename,
+        )
+        parser_job = record_parser_result(
+            user=parser_job.user,
+            raw_text=raw_text,
+            filename=parser_job.original_filename,
+            mime_type=parser_job.mime_type,
+            notice_code=queued.notice_code_hint,
+            ocr_metadata=ocr_metadata,
+            credit_reserved=queued.credit_reserved,
+            credit_reference=queued.credit_reference,
+            parser_job=parser_job,
+            queued=queued,
+        )
+        return parser_job.status
+    except QueuedUploadLeaseLost:
+        logger.warning("Parser worker lost the lease on queued upload %s; leaving it to the new claimant.", queued.pk)
+        return "lease_lost"
+    except NonNoticeDocumentError as exc:
+        # Same policy as the synchronous upload: the credit stays consumed for non-notice files.
+        return "failed" if _fail_queued_upload(queued, str(exc), refund_credit=False) else "lease_lost"
+    except (ValueError, OCRProcessingError) as exc:
+        return "failed" if _fail_queued_upload(queued, str(exc), refund_credit=True) else "lease_lost"
+    except Exception:
+        logger.exception("Parser worker failed on queued upload %s (attempt %s).", queued.pk, queued.attempts)
+        if queued.attempts >= max(int(settings.PARSER_JOB_MAX_ATTEMPTS), 1):
+            return "failed" if _fail_queued_upload(queued, WORKER_FAILURE_MESSAGE, refund_credit=True) else "lease_lost"
+        _held_claim(queued).update(claimed_at=None, claimed_by="")
+        return "retry"
@@ -1,6 +1,11 @@
 import re
+import threading
+import time
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
+from functools import cached_property
+
+from django.conf import settings
 
 from .models import NoticeType
 
@@ -9,40 +14,163 @@ class NonNoticeDocumentError(ValueError):
     pass
 
 
-def _normalize_text(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", value.lower())
-
-
-def _non_empty_lines(text: str):
-    return [line.strip() for line in text.splitlines() if line.strip()]
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_WHITESPACE_RE = re.compile(r"\s+")
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter.
+_IGNORECASE_ASCII_ALIASES = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
 
 
-def analyze_notice_likelihood(text: str, filename: str = "") -> dict:
-    haystack = f"{filename}\n{text}".lower()
-    positive_patterns = {
-        "notice": r"\bnotice\b",
-        "gst": r"\bgst\b|\bgstr[-\s]?\d[a-z]?\b|\bgstin\b",
-        "income_tax": r"income\s*tax|\bitr\b|\bpan\b|\bais\b|\b26as\b|\be-?proceedings\b",
-        "legal_reference": r"\bsection\b|\bu/s\b|\bsec\.?\b|\brule\b",
-        "response_language": r"reply|respond|show cause|intimation|scrutiny|demand|assessment|hearing",
-        "official_markers": r"reference\s*no|din|document\s*identification\s*number|order\s*no|tax\s*period",
-        "department_markers": r"commissioner|assessing\s*officer|deputy\s*commissioner|central\s*board|department",
-    }
-    negative_patterns = {
-        "resume": r"resume|curriculum\s+vitae|objective|work\s+experience|employment\s+history|linkedin",
-        "education": r"education|university|college|bachelor|master|cgpa|gpa",
-        "skills": r"\bskills\b|python|javascript|react|node\.?js|sql|c\+\+|java|typescript",
-        "portfolio": r"portfolio|github|projects|achievements|hobbies|interests|references",
-    }
-
-    positives = [label for label, pattern in positive_patterns.items() if re.search(pattern, haystack)]
-    negatives = [label for label, pattern in negative_patterns.items() if re.search(pattern, haystack)]
+def _normalize_text(value: str) -> str:
+    return _NON_ALNUM_RE.sub("", value.lower())
+
+
+class NoticeText:
+    """
+    One document's text with the derived forms the extractors share, each computed at most once.
+
+    Pass the same instance to `analyze_notice_likelihood`, the `extract_*` helpers and
+    `parse_notice_document` so a large OCR text is lowercased and split into lines only once.
+    """
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+    @classmethod
+    def of(cls, value: "str | NoticeText") -> "NoticeText":
+        return value if isinstance(value, NoticeText) else cls(value)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.raw.lower()
+
+    @cached_property
+    def folded(self) -> str:
+        """
+        Lowercase form for literal prefilters of `(?i)` patterns: the few non-ASCII characters
+        that IGNORECASE matches against ASCII letters are mapped to those letters first.
+        """
+        return self.raw.translate(_IGNORECASE_ASCII_ALIASES).lower()
+
+    @cached_property
+    def lines(self) -> list[str]:
+        return [stripped for stripped in (line.strip() for line in self.raw.splitlines()) if stripped]
+
+    @cached_property
+    def normalized_lines(self) -> list[str]:
+        return [_WHITESPACE_RE.sub(" ", line).strip() for line in self.lines]
+
+    def haystack(self, filename: str, separator: str) -> str:
+        # Lowercasing the parts separately equals lowercasing the joined string: the separator
+        # is whitespace, so no case mapping depends on characters across the join.
+        return f"{filename.lower()}{separator}{self.lower}"
+
+
+class _AnchoredPattern:
+    """
+    Compiled pattern plus lowercase literals of which every match contains at least one.
+
+    Most patterns never match a given notice, and scanning a long OCR text for a failing
+    alternation costs far more than a few substring checks, so the regex only runs when an
+    anchor occurs in the folded text. Anchors must be exact or a match would be missed.
+    """
+
+    def __init__(self, pattern: str, anchors: tuple[str, ...]):
+        self.regex = re.compile(pattern)
+        self.anchors = anchors
+
+    def could_match(self, folded: str) -> bool:
+        return any(anchor in folded for anchor in self.anchors)
+
+    def search(self, text: str, folded: str):
+        return self.regex.search(text) if self.could_match(folded) else None
+
+
+# Likelihood patterns run on the lowercased haystack without IGNORECASE, so their anchors are
+# plain substrings of it. Only presence matters here, so a label is a set of branches and matches
+# when any branch does; `\b`-delimited words whose anchors also occur inside common words
+# ("company", "raised") get their own branch so a miss does not rescan the whole alternation.
+_LIKELIHOOD_POSITIVE_PATTERNS = {
+    "notice": (_AnchoredPattern(r"\bnotice\b", ("notice",)),),
+    "gst": (_AnchoredPattern(r"\bgst\b|\bgstr[-\s]?\d[a-z]?\b|\bgstin\b", ("gst",)),),
+    "income_tax": (
+        _AnchoredPattern(r"income\s*tax", ("income",)),
+        _AnchoredPattern(r"\bitr\b", ("itr",)),
+        _AnchoredPattern(r"\bpan\b", ("pan",)),
+        _AnchoredPattern(r"\bais\b", ("ais",)),
+        _AnchoredPattern(r"\b26as\b", ("26as",)),
+        _AnchoredPattern(r"\be-?proceedings\b", ("e-proceedings", "eproceedings")),
+    ),
+    "legal_reference": (
+        _AnchoredPattern(r"\bsection\b", ("section",)),
+        _AnchoredPattern(r"\bu/s\b", ("u/s",)),
+        _AnchoredPattern(r"\bsec\.?\b", ("sec",)),
+        _AnchoredPattern(r"\brule\b", ("rule",)),
+    ),
+    "response_language": (
+        _AnchoredPattern(
+            r"reply|respond|show cause|intimation|scrutiny|demand|assessment|hearing",
+            ("reply", "respond", "show cause", "intimation", "scrutiny", "demand", "assessment", "hearing"),
+        ),
+    ),
+    "official_markers": (
+        _AnchoredPattern(
+            r"reference\s*no|din|document\s*identification\s*number|order\s*no|tax\s*period",
+            ("reference", "din", "document", "order", "period"),
+        ),
+    ),
+    "department_markers": (
+        _AnchoredPattern(
+            r"commissioner|assessing\s*officer|deputy\s*commissioner|central\s*board|department",
+            ("commissioner", "officer", "central", "department"),
+        ),
+    ),
+}
+_LIKELIHOOD_NEGATIVE_PATTERNS = {
+    "resume": (
+        _AnchoredPattern(
+            r"resume|curriculum\s+vitae|objective|work\s+experience|employment\s+history|linkedin",
+            ("resume", "curriculum", "objective", "experience", "employment", "linkedin"),
+        ),
+    ),
+    "education": (
+        _AnchoredPattern(
+            r"education|university|college|bachelor|master|cgpa|gpa",
+            ("education", "university", "college", "bachelor", "master", "gpa"),
+        ),
+    ),
+    "skills": (
+        _AnchoredPattern(r"\bskills\b", ("skills",)),
+        _AnchoredPattern(
+            r"python|javascript|react|node\.?js|sql|c\+\+|java|typescript",
+            ("python", "java", "react", "node", "sql", "c++", "typescript"),
+        ),
+    ),
+    "portfolio": (
+        _AnchoredPattern(
+            r"portfolio|github|projects|achievements|hobbies|interests|references",
+            ("portfolio", "github", "projects", "achievements", "hobbies", "interests", "references"),
+        ),
+    ),
+}
+_SHORT_DATE_RE = re.compile(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}")
+
+
+def _any_branch_matches(branches, haystack: str) -> bool:
+    return any(branch.search(haystack, haystack) for branch in branches)
+
+
+def analyze_notice_likelihood(text: "str | NoticeText", filename: str = "") -> dict:
+    document = NoticeText.of(text)
+    haystack = document.haystack(filename, "\n")
+
+    positives = [label for label, branches in _LIKELIHOOD_POSITIVE_PATTERNS.items() if _any_branch_matches(branches, haystack)]
+    negatives = [label for label, branches in _LIKELIHOOD_NEGATIVE_PATTERNS.items() if _any_branch_matches(branches, haystack)]
 
     score = (len(positives) * 2) - (len(negatives) * 3)
-    line_count = len(_non_empty_lines(text))
+    line_count = len(document.lines)
     if line_count >= 8:
         score += 1
-    if re.search(r"\d{1,2}[/-]\d{1,2}[/-]\d{2,4}", haystack):
+    if _SHORT_DATE_RE.search(haystack):
         score += 1
 
     is_likely_notice = len(positives) >= 2 and score >= 3 and "resume" not in negatives
@@ -55,25 +183,43 @@ def analyze_notice_likelihood(text: str, filename: str = "") -> dict:
     }
 
 
-def extract_amount(text: str):
-    contextual_patterns = [
+_AMOUNT_KEYWORD_ANCHORS = ("amount", "tax", "demand", "penalty", "interest", "liability", "paid", "payable")
+_AMOUNT_CONTEXT_PATTERNS = [
+    _AnchoredPattern(
         r"(?i)(?:amount|tax|demand|penalty|interest|liability|short[\s-]?paid|payable)[^\n]{0,60}?(?:rs\.?|inr)\s*([\d,]+(?:\.\d{1,2})?)",
+        _AMOUNT_KEYWORD_ANCHORS,
+    ),
+    _AnchoredPattern(
         r"(?i)(?:amount|tax|demand|penalty|interest|liability|short[\s-]?paid|payable)[^\n]{0,40}?([\d,]+(?:\.\d{1,2})?)",
+        _AMOUNT_KEYWORD_ANCHORS,
+    ),
+    _AnchoredPattern(
         r"(?i)(?:demand\s+of|liability\s+of|tax\s+payable\s+of)[^\n]{0,30}?([\d,]+(?:\.\d{1,2})?)",
-    ]
-    fallback_pattern = r"(?i)(?:rs\.?|inr)\s*([\d,]+(?:\.\d{1,2})?)"
-
-    for pattern in contextual_patterns:
-        amount_match = re.search(pattern, text)
+        ("demand", "liability", "payable"),
+    ),
+]
+_AMOUNT_LINE_KEYWORD_RE = _AnchoredPattern(
+    r"(?i)(amount|tax|demand|penalty|interest|liability|payable|short[\s-]?paid)",
+    _AMOUNT_KEYWORD_ANCHORS,
+)
+_AMOUNT_FALLBACK_RE = _AnchoredPattern(r"(?i)(?:rs\.?|inr)\s*([\d,]+(?:\.\d{1,2})?)", ("rs", "inr"))
+
+
+def extract_amount(text: "str | NoticeText"):
+    document = NoticeText.of(text)
+    for pattern in _AMOUNT_CONTEXT_PATTERNS:
+        amount_match = pattern.search(document.raw, document.folded)
         if amount_match:
             parsed = _parse_amount_candidate(amount_match.group(1))
             if parsed is not None:
                 return parsed
 
-    for line in _non_empty_lines(text):
-        if not re.search(r"(?i)(amount|tax|demand|penalty|interest|liability|payable|short[\s-]?paid)", line):
+    if not (_AMOUNT_LINE_KEYWORD_RE.could_match(document.folded) and _AMOUNT_FALLBACK_RE.could_match(document.folded)):
+        return None
+    for line in document.lines:
+        if not _AMOUNT_LINE_KEYWORD_RE.regex.search(line):
             continue
-        amount_match = re.search(fallback_pattern, line)
+        amount_match = _AMOUNT_FALLBACK_RE.regex.search(line)
         if amount_match:
             parsed = _parse_amount_candidate(amount_match.group(1))
             if parsed is not None:
@@ -100,16 +246,28 @@ def _parse_amount_candidate(raw_value: str):
         return None
 
 
-def extract_legal_section(text: str) -> str:
-    patterns = [
+_SECTION_PATTERNS = [
+    _AnchoredPattern(
         r"(?i)section\s+under\s+which\s+notice\s+is\s+issued\s*[:\-]?\s*([0-9A-Za-z()\-/.]+)",
-        r"(?i)act\s*/?\s*rules?\s+provisions?\s*[:\-]?\s*([0-9A-Za-z()\-/.]+)",
-        r"(?i)\bu/s\.?\s*([0-9A-Za-z()\-/.]+)",
-        r"(?i)\bsec(?:tion)?\.?\s*([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)",
-        r"(?i)\bsection\s+([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)",
-    ]
-    for pattern in patterns:
-        section_match = re.search(pattern, text)
+        ("issued",),
+    ),
+    _AnchoredPattern(r"(?i)act\s*/?\s*rules?\s+provisions?\s*[:\-]?\s*([0-9A-Za-z()\-/.]+)", ("provision",)),
+    _AnchoredPattern(r"(?i)\bu/s\.?\s*([0-9A-Za-z()\-/.]+)", ("u/s",)),
+    _AnchoredPattern(r"(?i)\bsec(?:tion)?\.?\s*([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)", ("sec",)),
+    _AnchoredPattern(r"(?i)\bsection\s+([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)", ("section",)),
+]
+_RULE_RE = _AnchoredPattern(r"(?i)\brule\s+([0-9]{1,3}(?:\([0-9A-Za-z]+\))?)", ("rule",))
+_EXPLICIT_SECTION_LINE_RE = _AnchoredPattern(
+    r"(?i)(section|rule)\s*(?:under\s+which\s+notice\s+is\s+issued)?\s*[:\-]?\s*([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)",
+    ("section", "rule"),
+)
+_LEGAL_TOKEN_RE = re.compile(r"([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)")
+
+
+def extract_legal_section(text: "str | NoticeText") -> str:
+    document = NoticeText.of(text)
+    for pattern in _SECTION_PATTERNS:
+        section_match = pattern.search(document.raw, document.folded)
         if section_match:
             token = _clean_legal_token(section_match.group(1))
             if token:
@@ -117,18 +275,16 @@ def extract_legal_section(text: str) -> str:
                     return token[:120]
                 return f"Section {token}"[:120]
 
-    rule_match = re.search(r"(?i)\brule\s+([0-9]{1,3}(?:\([0-9A-Za-z]+\))?)", text)
+    rule_match = _RULE_RE.search(document.raw, document.folded)
     if rule_match:
         token = _clean_legal_token(rule_match.group(1))
         if token:
             return f"Rule {token}"[:120]
 
-    for line in _non_empty_lines(text):
-        normalized_line = re.sub(r"\s+", " ", line).strip()
-        explicit_match = re.search(
-            r"(?i)(section|rule)\s*(?:under\s+which\s+notice\s+is\s+issued)?\s*[:\-]?\s*([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)",
-            normalized_line,
-        )
+    if not _EXPLICIT_SECTION_LINE_RE.could_match(document.folded):
+        return ""
+    for normalized_line in document.normalized_lines:
+        explicit_match = _EXPLICIT_SECTION_LINE_RE.regex.search(normalized_line)
         if explicit_match:
             prefix = explicit_match.group(1).title()
             token = _clean_legal_token(explicit_match.group(2))
@@ -141,51 +297,181 @@ def _clean_legal_token(token: str) -> str:
     cleaned = token.strip().strip(":.-,;")
     if not cleaned:
         return ""
-    match = re.search(r"([0-9]{1,3}[A-Za-z]?(?:\([0-9A-Za-z]+\))?)", cleaned)
+    match = _LEGAL_TOKEN_RE.search(cleaned)
     if match:
         return match.group(1)[:100]
     return cleaned[:100]
 
 
-def detect_notice_type(text: str, filename: str):
-    haystack = f"{filename} {text}".lower()
-    haystack_normalized = _normalize_text(haystack)
-
-    best_notice = None
-    best_score = 0
-    notices = NoticeType.objects.filter(is_active=True).prefetch_related("triggers")
-    for notice in notices:
-        score = 0
-        normalized_code = _normalize_text(notice.code)
-        if normalized_code and normalized_code in haystack_normalized:
-            score += 5
-
-        title = (notice.title or "").lower()
-        if title and title in haystack:
-            score += 2
-
-        for trigger in notice.triggers.all():
-            keyword = (trigger.keyword or "").strip().lower()
-            if not keyword:
-                continue
-            if keyword in haystack:
-                score += 1
+class NoticeClassifierIndex:
+    """
+    Compiled matcher over every active notice code, title and trigger keyword.
+
+    Phrases are folded into a prefix trie and emitted as a single lookahead regex, so one
+    `finditer` pass reports the longest phrase starting at each offset. Shorter phrases that
+    share the offset are recovered from a precomputed prefix closure, which keeps the scores
+    identical to the per-notice substring checks this replaces.
+    """
+
+    CODE_WEIGHT = 5
+    TITLE_WEIGHT = 2
+    KEYWORD_WEIGHT = 1
+
+    def __init__(self, entries):
+        # entries: (notice_id, code, title, [keywords]) in catalog (pk) order.
+        self.notice_ids: list[int] = []
+        phrase_weights: dict[str, list[tuple[int, int]]] = {}
+        code_weights: dict[str, list[tuple[int, int]]] = {}
+        for position, (notice_id, code, title, keywords) in enumerate(entries):
+            self.notice_ids.append(notice_id)
+            normalized_code = _normalize_text(code or "")
+            if normalized_code:
+                code_weights.setdefault(normalized_code, []).append((position, self.CODE_WEIGHT))
+            title_phrase = (title or "").lower()
+            if title_phrase:
+                phrase_weights.setdefault(title_phrase, []).append((position, self.TITLE_WEIGHT))
+            for keyword in keywords:
+                keyword_phrase = (keyword or "").strip().lower()
+                if keyword_phrase:
+                    phrase_weights.setdefault(keyword_phrase, []).append((position, self.KEYWORD_WEIGHT))
+
+        self._phrase_matcher = _PhraseMatcher(phrase_weights)
+        self._code_matcher = _PhraseMatcher(code_weights)
+
+    @classmethod
+    def from_catalog(cls) -> "NoticeClassifierIndex":
+        notices = NoticeType.objects.filter(is_active=True).prefetch_related("triggers").order_by("pk")
+        return cls(
+            (notice.id, notice.code, notice.title, [trigger.keyword for trigger in notice.triggers.all()])
+            for notice in notices
+        )
 
-        if score > best_score:
-            best_notice = notice
-            best_score = score
+    def rank(self, text: "str | NoticeText", filename: str) -> list[int]:
+        """Return notice ids with a positive score, best first (ties keep catalog order)."""
+        haystack = NoticeText.of(text).haystack(filename, " ")
+        scores: dict[int, int] = {}
+        for position, weight in self._phrase_matcher.contributions(haystack):
+            scores[position] = scores.get(position, 0) + weight
+        for position, weight in self._code_matcher.contributions(_normalize_text(haystack)):
+            scores[position] = scores.get(position, 0) + weight
+
+        ranked = sorted((position for position, score in scores.items() if score > 0), key=lambda pos: (-scores[pos], pos))
+        return [self.notice_ids[position] for position in ranked]
+
+
+class _PhraseMatcher:
+    def __init__(self, phrase_weights: dict[str, list[tuple[int, int]]]):
+        self._phrase_weights = phrase_weights
+        self._pattern = None
+        if phrase_weights:
+            self._pattern = re.compile(f"(?=({_trie_regex(phrase_weights)}))")
+        # Every phrase that is a prefix of a longer phrase is also present wherever the longer one
+        # matched, because both start at the same offset.
+        self._prefix_closure = {
+            phrase: [other for other in phrase_weights if phrase.startswith(other)]
+            for phrase in phrase_weights
+        }
+
+    def contributions(self, haystack: str):
+        if self._pattern is None:
+            return
+        seen: set[str] = set()
+        for match in self._pattern.finditer(haystack):
+            for phrase in self._prefix_closure[match.group(1)]:
+                if phrase not in seen:
+                    seen.add(phrase)
+                    yield from self._phrase_weights[phrase]
+
+
+def _trie_regex(phrases) -> str:
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _emit(node: dict) -> str:
+        branches = [re.escape(char) + _emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional tail keeps the longest phrase at each offset.
+        return f"(?:{body})?" if "" in node else body
+
+    return _emit(trie)
+
+
+_notice_classifier_lock = threading.Lock()
+_notice_classifier: NoticeClassifierIndex | None = None
+_notice_classifier_built_at = 0.0
+
+
+def get_notice_classifier() -> NoticeClassifierIndex:
+    """
+    Process-wide classifier, rebuilt lazily after catalog signals or NOTICE_INDEX_TTL_SEC.
+
+    The TTL bounds staleness in other worker processes, which never see this process's signals.
+    """
+    global _notice_classifier, _notice_classifier_built_at
+
+    ttl_sec = int(getattr(settings, "NOTICE_INDEX_TTL_SEC", 300))
+
+    def _is_fresh(index) -> bool:
+        return index is not None and (ttl_sec <= 0 or time.monotonic() - _notice_classifier_built_at < ttl_sec)
+
+    index = _notice_classifier
+    if _is_fresh(index):
+        return index
+
+    with _notice_classifier_lock:
+        index = _notice_classifier
+        if not _is_fresh(index):
+            index = NoticeClassifierIndex.from_catalog()
+            _notice_classifier = index
+            _notice_classifier_built_at = time.monotonic()
+        return index
+
+
+def invalidate_notice_classifier() -> None:
+    global _notice_classifier
+    _notice_classifier = None
+
+
+def detect_notice_type(text: "str | NoticeText", filename: str):
+    ranked_ids = get_notice_classifier().rank(text, filename)
+    if not ranked_ids:
+        return None
 
-    return best_notice if best_score > 0 else None
+    # The index may lag a catalog edit made by another process, so the winner is re-read by
+    # primary key and skipped if it has since been deactivated or deleted.
+    batch_size = 5
+    for offset in range(0, len(ranked_ids), batch_size):
+        batch = ranked_ids[offset:offset + batch_size]
+        notices = NoticeType.objects.filter(is_active=True).in_bulk(batch)
+        for notice_id in batch:
+            if notice_id in notices:
+                return notices[notice_id]
+    return None
 
 
-def extract_deadline_date(text: str):
-    patterns = [
+_DEADLINE_PATTERNS = [
+    _AnchoredPattern(
         r"(?i)(?:date\s+by\s+which\s+reply(?:\s+has\s+to\s+be)?\s+submitted|reply\s+by|last\s+date|due\s+date)[^\d]{0,30}(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
+        ("date", "reply"),
+    ),
+    _AnchoredPattern(
         r"(?i)(?:respond\s+before|reply\s+before|submit\s+before)[^\d]{0,20}(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-        r"(?i)(?:hearing\s+date|date\s+of\s+hearing)[^\d]{0,30}(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+        ("before",),
+    ),
+    _AnchoredPattern(r"(?i)(?:hearing\s+date|date\s+of\s+hearing)[^\d]{0,30}(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})", ("hearing",)),
+]
+
+
+def extract_deadline_date(text: "str | NoticeText"):
+    document = NoticeText.of(text)
+    for pattern in _DEADLINE_PATTERNS:
+        match = pattern.search(document.raw, document.folded)
         if not match:
             continue
         raw_date = match.group(1)
@@ -197,16 +483,40 @@ def extract_deadline_date(text: str):
     return None
 
 
-def parse_notice_document(raw_text: str, filename: str, notice_code_hint: str = ""):
-    legal_section = extract_legal_section(raw_text)
-    amount_claimed = extract_amount(raw_text)
-    deadline_date = extract_deadline_date(raw_text)
+def _timed(stage_timings: dict | None, stage: str, func, *args):
+    if stage_timings is None:
+        return func(*args)
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        stage_timings[stage] = (time.perf_counter() - started) * 1000
+
+
+def _notice_from_hint(notice_code_hint: str):
+    return NoticeType.objects.filter(code__iexact=notice_code_hint, is_active=True).first()
+
+
+def parse_notice_document(
+    raw_text: "str | NoticeText",
+    filename: str,
+    notice_code_hint: str = "",
+    stage_timings: dict | None = None,
+):
+    """
+    Extracts the notice type, deadline, legal section and amount from a document's text.
+    When `stage_timings` is a dict, each stage's wall time in milliseconds is stored in it.
+    """
+    document = NoticeText.of(raw_text)
+    legal_section = _timed(stage_timings, "legal_section", extract_legal_section, document)
+    amount_claimed = _timed(stage_timings, "amount", extract_amount, document)
+    deadline_date = _timed(stage_timings, "deadline", extract_deadline_date, document)
 
     notice = None
     if notice_code_hint:
-        notice = NoticeType.objects.filter(code__iexact=notice_code_hint, is_active=True).first()
+        notice = _timed(stage_timings, "notice_hint", _notice_from_hint, notice_code_hint)
     if notice is None:
-        notice = detect_notice_type(raw_text, filename)
+        notice = _timed(stage_timings, "notice_type", detect_notice_type, document, filename)
 
     confidence = 0.48
     if notice:
@@ -0,0 +1,98 @@
+"""
+Indexed full-text search over the public notice catalog.
+
+Every NoticeType keeps a precomputed `search_document` (code, slug, title, summary and trigger
+keywords). Migration 0013 indexes it per backend: a GIN index on `to_tsvector('simple', ...)` on
+PostgreSQL and an FTS5 external-content table kept in sync by SQL triggers on SQLite. Queries
+match every search term as a word prefix and rank by relevance; other backends (or SQLite
+builds without FTS5) fall back to per-term `icontains` on the document.
+"""
+
+import re
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_SOURCE_FIELDS = ("code", "slug", "title", "summary")
+FTS_TABLE = "notices_noticetype_fts"
+_TERM_RE = re.compile(r"[^\W_]+")
+
+
+def build_search_document(notice, keywords) -> str:
+    parts = [getattr(notice, field) or "" for field in SEARCH_SOURCE_FIELDS]
+    parts.extend(keyword for keyword in keywords if keyword)
+    return "\n".join(part.strip() for part in parts if part.strip()).lower()
+
+
+def refresh_search_document(notice_id: int, **extra_updates) -> None:
+    """Rebuilds one notice's search document (after trigger keyword changes), applying `extra_updates` in the same UPDATE."""
+    from .models import NoticeType, TriggerKeyword
+
+    notice = NoticeType.objects.filter(pk=notice_id).only(*SEARCH_SOURCE_FIELDS).first()
+    if notice is None:
+        return
+    keywords = TriggerKeyword.objects.filter(notice_type_id=notice_id).order_by("id").values_list("keyword", flat=True)
+    NoticeType.objects.filter(pk=notice_id).update(search_document=build_search_document(notice, keywords), **extra_updates)
+
+
+def search_terms(value: str) -> list[str]:
+    return _TERM_RE.findall((value or "").lower())
+
+
+@lru_cache(maxsize=None)
+def _sqlite_fts_available(alias: str) -> bool:
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def search_notices(queryset, value: str, rank: bool = True):
+    """
+    Filters `queryset` to notices matching every term of `value` as a word prefix.
+    With `rank`, results are ordered by relevance (best first, ties by code).
+    """
+    terms = search_terms(value)
+    if not terms:
+        return queryset
+
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT id FROM {table} WHERE to_tsvector('simple', search_document) @@ to_tsquery('simple', %s)",
+                [tsquery],
+            )
+        )
+        if rank:
+            queryset = queryset.annotate(
+                search_rank=RawSQL(
+                    f"ts_rank(to_tsvector('simple', {table}.search_document), to_tsquery('simple', %s))",
+                    [tsquery],
+                    output_field=FloatField(),
+                )
+            )
+    elif connection.vendor == "sqlite" and _sqlite_fts_available(queryset.db):
+        match = " ".join(f'"{term}"*' for term in terms)
+        queryset = queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+        if rank:
+            # bm25() is lower for better matches, so it is negated to sort like ts_rank.
+            queryset = queryset.annotate(
+                search_rank=RawSQL(
+                    f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+                    [match],
+                    output_field=FloatField(),
+                )
+            )
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= Q(search_document__icontains=term)
+        return queryset.filter(condition)
+
+    if rank:
+        queryset = queryset.order_by(F("search_rank").desc(), "code")
+    return queryset
@@ -1,4 +1,6 @@
-﻿from django.utils import timezone
+﻿from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 from rest_framework import serializers
 
 from .models import (
@@ -151,6 +153,26 @@ class AdminFeedbackSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "notice", "notice_code", "notice_title", "reviewed_at", "created_at"]
 
 
+def latest_ca_requests_by_notice_code(user, notice_codes) -> dict[str, CAHelpRequest]:
+    """The user's newest CA request per notice code, fetched in one windowed query."""
+    notice_codes = set(notice_codes)
+    if not notice_codes:
+        return {}
+    requests = (
+        CAHelpRequest.objects.filter(user=user, notice_code__in=notice_codes)
+        .select_related("assigned_ca")
+        .annotate(
+            recency=Window(
+                RowNumber(),
+                partition_by=[F("notice_code")],
+                order_by=[F("created_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(recency=1)
+    )
+    return {request.notice_code: request for request in requests}
+
+
 class SavedNoticeSerializer(serializers.ModelSerializer):
     notice = NoticeTypeSerializer(read_only=True)
     notice_id = serializers.PrimaryKeyRelatedField(
@@ -187,12 +209,17 @@ class SavedNoticeSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "notice", "parser_job_id", "created_at", "updated_at"]
 
     def get_ca_request(self, obj):
-        request = (
-            CAHelpRequest.objects.filter(user=obj.user, notice_code=obj.notice.code)
-            .select_related("assigned_ca")
-            .order_by("-created_at")
-            .first()
-        )
+        # List responses pass every row's latest request in one batch (see latest_ca_requests_by_notice_code).
+        latest_requests = self.context.get("latest_ca_requests")
+        if latest_requests is not None:
+            request = latest_requests.get(obj.notice.code)
+        else:
+            request = (
+                CAHelpRequest.objects.filter(user=obj.user, notice_code=obj.notice.code)
+                .select_related("assigned_ca")
+                .order_by("-created_at")
+                .first()
+            )
         if not request:
             return None
         return SafeCARequestSummarySerializer(request).data
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import NoticeType, TriggerKeyword
+from .parser_utils import invalidate_notice_classifier
+from .search import refresh_search_document
+from .suggest import invalidate_notice_suggest_index
+
+
+@receiver([post_save, post_delete], sender=NoticeType)
+@receiver([post_save, post_delete], sender=TriggerKeyword)
+def invalidate_notice_indexes(sender, **kwargs):
+    invalidate_notice_classifier()
+    invalidate_notice_suggest_index()
+    # A rebuild racing the open transaction could cache pre-commit rows, so drop it again once visible.
+    transaction.on_commit(invalidate_notice_classifier)
+    transaction.on_commit(invalidate_notice_suggest_index)
+
+
+@receiver([post_save, post_delete], sender=TriggerKeyword)
+def touch_trigger_notice(sender, instance, **kwargs):
+    # Keywords are part of the public notice payload, so an edit must move the notice's
+    # updated_at, which the catalog ETag and Last-Modified are derived from, and its search document.
+    refresh_search_document(instance.notice_type_id, updated_at=timezone.now())
@@ -0,0 +1,107 @@
+"""
+In-process typeahead over the active notice catalog.
+
+Codes, titles and trigger keywords are normalized like the parser's `_normalize_text` (lowercase
+alphanumerics only) and stored as a sorted key array, so a prefix lookup is two bisections plus a
+scan of the matching keys. Every phrase is also indexed from each later word start (weighted
+lowest), so "drc01" finds "GST-DRC-01" and "cause" finds "Show Cause Notice".
+"""
+
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+from .models import NoticeType
+from .parser_utils import _normalize_text
+
+_WORD_START_RE = re.compile(r"[a-z0-9]+")
+# Keys are cut to this length; longer queries are cut the same way before the lookup.
+MAX_KEY_LENGTH = 48
+# Sorts after every normalized character, so `prefix + _KEY_UPPER_BOUND` bounds the prefix range.
+_KEY_UPPER_BOUND = "{"
+
+
+class NoticeSuggestIndex:
+    CODE_WEIGHT = 3
+    TITLE_WEIGHT = 2
+    WORD_WEIGHT = 1
+
+    def __init__(self, entries):
+        # entries: (code, title, severity, [keywords]) in code order.
+        self.hits: list[dict] = []
+        weights: dict[tuple[str, int], int] = {}
+
+        def _add(key: str, position: int, weight: int) -> None:
+            key = key[:MAX_KEY_LENGTH]
+            if key and weights.get((key, position), 0) < weight:
+                weights[(key, position)] = weight
+
+        for position, (code, title, severity, keywords) in enumerate(entries):
+            self.hits.append({"code": code, "title": title, "severity": severity})
+            phrases = [(code, self.CODE_WEIGHT), (title, self.TITLE_WEIGHT), *((keyword, self.WORD_WEIGHT) for keyword in keywords)]
+            for phrase, weight in phrases:
+                lowered = (phrase or "").lower()
+                for match in _WORD_START_RE.finditer(lowered):
+                    _add(_normalize_text(lowered[match.start():]), position, weight if match.start() == 0 else self.WORD_WEIGHT)
+
+        ordered = sorted(weights.items())
+        self._keys = [key for (key, _), _ in ordered]
+        self._postings = [(position, weight) for (_, position), weight in ordered]
+
+    @classmethod
+    def from_catalog(cls) -> "NoticeSuggestIndex":
+        notices = NoticeType.objects.filter(is_active=True).prefetch_related("triggers").order_by("code")
+        return cls(
+            (notice.code, notice.title, notice.severity, [trigger.keyword for trigger in notice.triggers.all()])
+            for notice in notices.only("id", "code", "title", "severity")
+        )
+
+    def suggest(self, query: str, limit: int = 8) -> list[dict]:
+        """Top `limit` notices with a key starting with `query`, best weight first, ties in code order."""
+        prefix = _normalize_text(query or "")[:MAX_KEY_LENGTH]
+        if not prefix or limit <= 0:
+            return []
+        start = bisect_left(self._keys, prefix)
+        stop = bisect_left(self._keys, prefix + _KEY_UPPER_BOUND, lo=start)
+        best: dict[int, int] = {}
+        for position, weight in self._postings[start:stop]:
+            if best.get(position, 0) < weight:
+                best[position] = weight
+        top = heapq.nsmallest(limit, best, key=lambda position: (-best[position], position))
+        return [self.hits[position] for position in top]
+
+
+_notice_suggest_lock = threading.Lock()
+_notice_suggest_index: NoticeSuggestIndex | None = None
+_notice_suggest_built_at = 0.0
+
+
+def get_notice_suggest_index() -> NoticeSuggestIndex:
+    """Process-wide index, rebuilt lazily after catalog signals or NOTICE_INDEX_TTL_SEC (see get_notice_classifier)."""
+    global _notice_suggest_index, _notice_suggest_built_at
+
+    ttl_sec = int(getattr(settings, "NOTICE_INDEX_TTL_SEC", 300))
+
+    def _is_fresh(index) -> bool:
+        return index is not None and (ttl_sec <= 0 or time.monotonic() - _notice_suggest_built_at < ttl_sec)
+
+    index = _notice_suggest_index
+    if _is_fresh(index):
+        return index
+
+    with _notice_suggest_lock:
+        index = _notice_suggest_index
+        if not _is_fresh(index):
+            index = NoticeSuggestIndex.from_catalog()
+            _notice_suggest_index = index
+            _notice_suggest_built_at = time.monotonic()
+        return index
+
+
+def invalidate_notice_suggest_index() -> None:
+    global _notice_suggest_index
+    _notice_suggest_index = None
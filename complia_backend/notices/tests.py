@@ -1,24 +1,68 @@
+import base64
+import io
 import json
 import os
 import tempfile
+import threading
+import time
 from datetime import timedelta
+from concurrent.futures import Executor, Future
 from io import StringIO
 from unittest.mock import Mock, patch
 
+import fitz
 import requests
-from django.core.management import call_command
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import override_settings
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
-from .models import NoticeFeedback, NoticeType, ParserBenchmarkRun, ParserExtraction, ParserJob, SavedNotice, TriggerKeyword
-from .parser_utils import parse_notice_document
-from accounts.models import CAHelpRequest, User, UserEntitlement
+
+from complia_backend import circuit_breakers
+
+from .models import (
+    NoticeFeedback,
+    NoticeType,
+    OCRCacheEntry,
+    ParserBenchmarkRun,
+    ParserExtraction,
+    ParserJob,
+    QueuedParserUpload,
+    SavedNotice,
+    TriggerKeyword,
+)
+from . import ocr_latency, ocr_utils, parser_jobs
+from .loadtest import FakeOCRServer, build_upload
+from .ocr_utils import OCRProcessingError, OCRTimeoutError, extract_text_from_binary_document
+from .parser_jobs import claim_queued_parser_uploads, process_queued_parser_upload, read_text_upload
+from .parser_utils import (
+    NoticeText,
+    analyze_notice_likelihood,
+    detect_notice_type,
+    extract_amount,
+    extract_legal_section,
+    get_notice_classifier,
+    parse_notice_document,
+)
+from accounts.models import AnalyticsEvent, CAHelpRequest, ParserCreditLedgerEntry, User, UserEntitlement
+
+
+class InlineExecutor(Executor):
+    """Runs submitted work on the calling thread so it shares the test transaction."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
 
 class NoticeAPITests(APITestCase):
     def setUp(self):
+        # Upload throttles are keyed by user pk, which rolled-back tests hand out again.
+        cache.clear()
         self.user = User.objects.create_user(email="tester@complia.in", password="testpass123")
         # Create a sample notice
         self.notice = NoticeType.objects.create(
@@ -68,6 +112,51 @@ class NoticeAPITests(APITestCase):
         self.assertIn("TEST-001", result_codes)
         self.assertIn("HIGH-001", result_codes)
 
+    def test_notice_catalog_conditional_get(self):
+        url = reverse("noticetype-list")
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", first)
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        with self.assertNumQueries(3):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+        self.assertEqual(not_modified.content, b"")
+
+        since = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Each URL is its own representation.
+        searched = self.client.get(url, {"search": "TEST-001"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(searched.status_code, status.HTTP_200_OK)
+
+        detail_url = reverse("noticetype-detail", kwargs={"code": "TEST-001"})
+        detail_etag = self.client.get(detail_url)["ETag"]
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Trigger keyword edits and deactivations both change the catalog version.
+        trigger = TriggerKeyword.objects.get(notice_type=self.notice)
+        trigger.keyword = "scrutiny of returns"
+        trigger.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+        etag = changed["ETag"]
+        NoticeType.objects.filter(pk=self.high_severity_notice.pk).update(is_active=False)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+        # Deletes leave Max(updated_at) alone but still move Last-Modified for If-Modified-Since-only clients.
+        last_modified = self.client.get(url)["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.high_severity_notice.delete()
+        after_delete = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(after_delete.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(after_delete["Last-Modified"], last_modified)
+
     def test_search_notices_by_code(self):
         """Search by notice code."""
         url = reverse('noticetype-list')
@@ -89,6 +178,63 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['code'], "TEST-001")
 
+    def test_search_ranks_by_relevance_and_tracks_keyword_edits(self):
+        url = reverse("noticetype-list")
+        NoticeType.objects.create(
+            code="AAA-001",
+            title="Scrutiny Scrutiny of Returns",
+            summary="Scrutiny notice for mismatched returns.",
+            detailed_explanation="Explanation",
+            consequences_of_ignoring="Bad things",
+            next_steps="Reply",
+            is_active=True,
+        )
+
+        ranked = self.client.get(url, {"search": "scrut"})
+        self.assertEqual([item["code"] for item in ranked.data["results"]], ["AAA-001", "TEST-001"])
+
+        ordered = self.client.get(url, {"search": "scrut", "ordering": "code"})
+        self.assertEqual([item["code"] for item in ordered.data["results"]], ["AAA-001", "TEST-001"])
+        self.assertEqual(self.client.get(url, {"search": "scrutiny returns"}).data["count"], 1)
+
+        trigger = self.notice.triggers.get()
+        trigger.keyword = "asmt-10"
+        trigger.save()
+        self.assertEqual(
+            [item["code"] for item in self.client.get(url, {"search": "asmt 10"}).data["results"]],
+            ["TEST-001"],
+        )
+        self.assertEqual(self.client.get(url, {"search": "scrutiny"}).data["count"], 1)
+
+        self.notice.title = "Demand Order"
+        self.notice.save(update_fields=["title"])
+        self.assertEqual(self.client.get(url, {"search": "demand"}).data["count"], 1)
+
+    def test_notice_suggest_prefix_hits_and_rebuild(self):
+        url = reverse("notice-suggest")
+        with self.assertNumQueries(2):
+            first = self.client.get(url, {"q": "test"})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            first.data["results"],
+            [{"code": "TEST-001", "title": "Test Notice Title", "severity": "medium"}],
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, {"q": "Scrut"}).data["results"][0]["code"], "TEST-001")
+        self.assertEqual([hit["code"] for hit in self.client.get(url, {"q": "001"}).data["results"]], ["HIGH-001", "TEST-001"])
+        self.assertEqual([hit["code"] for hit in self.client.get(url, {"q": "notice"}).data["results"]], ["HIGH-001", "TEST-001"])
+        self.assertEqual(self.client.get(url, {"q": "  "}).data["results"], [])
+        self.assertEqual(self.client.get(url, {"q": "test", "limit": "x"}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        TriggerKeyword.objects.create(notice_type=self.high_severity_notice, keyword="scrutiny of returns")
+        codes = [hit["code"] for hit in self.client.get(url, {"q": "scrutiny", "limit": 5}).data["results"]]
+        self.assertEqual(codes, ["HIGH-001", "TEST-001"])
+        self.assertEqual(len(self.client.get(url, {"q": "scrutiny", "limit": 1}).data["results"]), 1)
+
+        self.notice.is_active = False
+        self.notice.save()
+        self.assertEqual(self.client.get(url, {"q": "test"}).data["results"], [])
+
     def test_get_notice_detail(self):
         """Retrieve a specific notice by code."""
         url = reverse('noticetype-detail', kwargs={'code': 'TEST-001'})
@@ -187,6 +333,32 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(list_response.status_code, status.HTTP_200_OK)
         self.assertEqual(list_response.data["results"][0]["ca_request"]["status"], "contacted")
 
+    def test_saved_notice_list_resolves_ca_requests_in_one_query(self):
+        self.client.force_authenticate(user=self.user)
+        other_user = User.objects.create_user(email="other@complia.in", password="testpass123")
+        for saved_for in (self.notice, self.high_severity_notice):
+            SavedNotice.objects.create(user=self.user, notice=saved_for)
+        base_time = timezone.now()
+        for offset, (owner, code, request_status) in enumerate(
+            [
+                (self.user, self.notice.code, "new"),
+                (self.user, self.notice.code, "engaged"),
+                (other_user, self.notice.code, "closed"),
+                (self.user, "GENERAL", "resolved"),
+            ]
+        ):
+            ca_request = CAHelpRequest.objects.create(
+                user=owner, notice_code=code, name="Tester", email=owner.email, status=request_status
+            )
+            CAHelpRequest.objects.filter(pk=ca_request.pk).update(created_at=base_time + timedelta(minutes=offset))
+
+        # count, page, notice triggers, latest CA requests
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("saved-notice-list"))
+        ca_requests = {item["notice"]["code"]: item["ca_request"] for item in response.data["results"]}
+        self.assertEqual(ca_requests[self.notice.code]["status"], "engaged")
+        self.assertIsNone(ca_requests[self.high_severity_notice.code])
+
     def test_save_notice_delete(self):
         self.client.force_authenticate(user=self.user)
         create_url = reverse("saved-notice-list")
@@ -499,6 +671,11 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(entitlement.parser_credits, 0)
         self.assertEqual(entitlement.lifetime_consumed_credits, 1)
         self.assertEqual(ParserJob.objects.count(), 0)
+        ledger = list(ParserCreditLedgerEntry.objects.filter(user=beta_user).order_by("id").values_list("kind", "reference"))
+        self.assertEqual([kind for kind, _reference in ledger], ["reserve", "consume"])
+        # Filenames are not unique, so the reservation and its settlement share a per-upload token.
+        self.assertTrue(ledger[0][1].startswith("parser-upload-"))
+        self.assertEqual(ledger[0][1], ledger[1][1])
 
     def test_parse_notice_document_ignores_noise_amount_and_reads_act_rules_section(self):
         NoticeType.objects.create(
@@ -574,6 +751,34 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(parsed["legal_section"], "Section 148")
         self.assertEqual(parsed["deadline_date"].isoformat(), "2026-04-14")
 
+    def test_detect_notice_type_scores_overlapping_phrases_in_one_pass(self):
+        drc = NoticeType.objects.create(
+            code="GST-DRC-01",
+            title="Show Cause Notice for Demand",
+            detailed_explanation="Explanation",
+            consequences_of_ignoring="Penalty",
+            next_steps="Reply",
+            is_active=True,
+        )
+        TriggerKeyword.objects.create(notice_type=drc, keyword="show cause")
+        TriggerKeyword.objects.create(notice_type=drc, keyword="show cause notice")
+        TriggerKeyword.objects.create(notice_type=self.high_severity_notice, keyword="show cause notice for")
+
+        text = "Show Cause Notice for Demand issued in FORM GST DRC 01."
+        self.assertEqual(get_notice_classifier().rank(text, "scan.txt")[:2], [drc.id, self.high_severity_notice.id])
+        with self.assertNumQueries(1):
+            self.assertEqual(detect_notice_type(text, "scan.txt"), drc)
+
+    def test_detect_notice_type_index_follows_catalog_changes(self):
+        self.assertEqual(detect_notice_type("Selected for scrutiny.", "notice.txt"), self.notice)
+
+        self.notice.is_active = False
+        self.notice.save(update_fields=["is_active"])
+        self.assertIsNone(detect_notice_type("Selected for scrutiny.", "notice.txt"))
+
+        TriggerKeyword.objects.create(notice_type=self.high_severity_notice, keyword="scrutiny")
+        self.assertEqual(detect_notice_type("Selected for scrutiny.", "notice.txt"), self.high_severity_notice)
+
     @override_settings(PARSER_PRIVATE_BETA_ENABLED=True, PARSER_BETA_EMAILS={"beta5@complia.in"})
     def test_parser_upload_sanitizes_nul_bytes_for_text_payload(self):
         beta_user = User.objects.create_user(email="beta5@complia.in", password="pass123456", user_type="taxpayer")
@@ -615,6 +820,150 @@ class NoticeAPITests(APITestCase):
         entitlement = UserEntitlement.objects.get(user=beta_user)
         self.assertEqual(entitlement.parser_credits, 1)
         self.assertEqual(entitlement.lifetime_consumed_credits, 0)
+        self.assertEqual(
+            list(ParserCreditLedgerEntry.objects.filter(user=beta_user).order_by("id").values_list("kind", "amount")),
+            [("reserve", -1), ("refund", 1)],
+        )
+
+    @override_settings(
+        PARSER_PRIVATE_BETA_ENABLED=True,
+        PARSER_BETA_EMAILS={"betaasync@complia.in"},
+        PARSER_ASYNC_ENABLED=True,
+    )
+    def test_parser_upload_async_mode_queues_job_for_workers(self):
+        beta_user = User.objects.create_user(email="betaasync@complia.in", password="pass123456", user_type="taxpayer")
+        UserEntitlement.objects.create(
+            user=beta_user,
+            parser_credits=1,
+            lifetime_purchased_credits=1,
+            lifetime_consumed_credits=0,
+        )
+        self.client.force_authenticate(user=beta_user)
+        upload = SimpleUploadedFile(
+            "GST-DRC-01-notice.txt",
+            b"This is a demand notice. Section 73. INR 125000 due.",
+            content_type="text/plain",
+        )
+        response = self.client.post("/api/v1/parser/upload/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], "queued")
+        self.assertIsNone(response.data["extraction"])
+        parser_job_id = response.data["id"]
+        self.assertEqual(response["Location"], f"/api/v1/parser/results/{parser_job_id}/")
+        self.assertTrue(QueuedParserUpload.objects.filter(parser_job_id=parser_job_id, credit_reserved=True).exists())
+
+        pending = self.client.get(f"/api/v1/parser/results/{parser_job_id}/")
+        self.assertEqual(pending.status_code, status.HTTP_200_OK)
+        self.assertEqual(pending.data["status"], "queued")
+        self.assertIn("Retry-After", pending)
+
+        out = StringIO()
+        with patch(
+            "complia_backend.notices.management.commands.run_parser_workers._build_executor",
+            return_value=InlineExecutor(),
+        ):
+            call_command("run_parser_workers", "--once", stdout=out)
+        self.assertIn("processed 1 job(s)", out.getvalue())
+
+        detail = self.client.get(f"/api/v1/parser/results/{parser_job_id}/")
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertIn(detail.data["status"], {"completed", "review_required"})
+        self.assertEqual(detail.data["extraction"]["legal_section"], "Section 73")
+        self.assertNotIn("Retry-After", detail)
+        self.assertFalse(QueuedParserUpload.objects.exists())
+        self.assertTrue(
+            AnalyticsEvent.objects.filter(event_name="credit_consumed", metadata__parser_job_id=parser_job_id).exists()
+        )
+        entitlement = UserEntitlement.objects.get(user=beta_user)
+        self.assertEqual(entitlement.parser_credits, 0)
+        self.assertEqual(entitlement.lifetime_consumed_credits, 1)
+
+    @override_settings(
+        PARSER_PRIVATE_BETA_ENABLED=True,
+        PARSER_BETA_EMAILS={"betaasync2@complia.in"},
+        PARSER_ASYNC_ENABLED=True,
+    )
+    def test_parser_worker_fails_unreadable_queued_upload_and_refunds_credit(self):
+        beta_user = User.objects.create_user(email="betaasync2@complia.in", password="pass123456", user_type="taxpayer")
+        UserEntitlement.objects.create(
+            user=beta_user,
+            parser_credits=1,
+            lifetime_purchased_credits=1,
+            lifetime_consumed_credits=0,
+        )
+        self.client.force_authenticate(user=beta_user)
+        upload = SimpleUploadedFile("scan.jpg", b"\xff\xd8\xff\xe0\x00\x10JFIF", content_type="image/jpeg")
+        response = self.client.post("/api/v1/parser/upload/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(UserEntitlement.objects.get(user=beta_user).parser_credits, 0)
+
+        with patch(
+            "complia_backend.notices.management.commands.run_parser_workers._build_executor",
+            return_value=InlineExecutor(),
+        ):
+            call_command("run_parser_workers", "--once", stdout=StringIO())
+
+        parser_job = ParserJob.objects.get(pk=response.data["id"])
+        self.assertEqual(parser_job.status, "failed")
+        self.assertIn("OCR is disabled", parser_job.error_message)
+        self.assertFalse(QueuedParserUpload.objects.exists())
+        entitlement = UserEntitlement.objects.get(user=beta_user)
+        self.assertEqual(entitlement.parser_credits, 1)
+        self.assertEqual(entitlement.lifetime_consumed_credits, 0)
+
+    @override_settings(
+        PARSER_PRIVATE_BETA_ENABLED=True,
+        PARSER_BETA_EMAILS={"betaasync3@complia.in"},
+        PARSER_ASYNC_ENABLED=True,
+    )
+    def test_parser_worker_does_not_settle_upload_after_losing_its_lease(self):
+        beta_user = User.objects.create_user(email="betaasync3@complia.in", password="pass123456", user_type="taxpayer")
+        UserEntitlement.objects.create(user=beta_user, parser_credits=1, lifetime_purchased_credits=1)
+        self.client.force_authenticate(user=beta_user)
+        upload = SimpleUploadedFile("notice.txt", b"This is a demand notice. Section 73. INR 125000 due.", content_type="text/plain")
+        parser_job_id = self.client.post("/api/v1/parser/upload/", {"file": upload}, format="multipart").data["id"]
+        [queued_id] = claim_queued_parser_uploads("worker-a", 1)
+        real_extract = parser_jobs.extract_upload_text
+
+        def slow_extract(*args, **kwargs):
+            # The job outlives its lease and another worker re-claims the row meanwhile.
+            QueuedParserUpload.objects.filter(pk=queued_id).update(
+                claimed_by="worker-b", claimed_at=timezone.now() + timedelta(seconds=1)
+            )
+            return real_extract(*args, **kwargs)
+
+        with patch("complia_backend.notices.parser_jobs.extract_upload_text", side_effect=slow_extract):
+            self.assertEqual(process_queued_parser_upload(queued_id), "lease_lost")
+
+        self.assertEqual(ParserJob.objects.get(pk=parser_job_id).status, "queued")
+        self.assertEqual(QueuedParserUpload.objects.get(pk=queued_id).claimed_by, "worker-b")
+        self.assertFalse(ParserExtraction.objects.filter(parser_job_id=parser_job_id).exists())
+        ledger = ParserCreditLedgerEntry.objects.filter(user=beta_user)
+        self.assertFalse(ledger.filter(kind="consume").exists())
+
+        self.assertIn(process_queued_parser_upload(queued_id), {"completed", "review_required"})
+        self.assertEqual(ledger.filter(kind="consume").count(), 1)
+        self.assertEqual(ledger.get(kind="consume").reference, ledger.get(kind="reserve").reference)
+
+    @override_settings(PARSER_ASYNC_ENABLED=True, PARSER_PRIVATE_BETA_ENABLED=True, PARSER_BETA_EMAILS={"betaasync4@complia.in"})
+    def test_cleanup_keeps_queued_jobs_past_their_ttl_until_a_worker_finishes_them(self):
+        beta_user = User.objects.create_user(email="betaasync4@complia.in", password="pass123456", user_type="taxpayer")
+        UserEntitlement.objects.create(user=beta_user, parser_credits=1, lifetime_purchased_credits=1)
+        self.client.force_authenticate(user=beta_user)
+        upload = SimpleUploadedFile("notice.txt", b"This is a demand notice. Section 73. INR 125000 due.", content_type="text/plain")
+        parser_job_id = self.client.post("/api/v1/parser/upload/", {"file": upload}, format="multipart").data["id"]
+        # The workers were down for longer than the privacy TTL.
+        ParserJob.objects.filter(pk=parser_job_id).update(delete_after=timezone.now() - timedelta(hours=2))
+
+        call_command("cleanup_expired_parser_jobs", stdout=StringIO())
+        self.assertEqual(ParserJob.objects.get(pk=parser_job_id).status, "queued")
+        [queued_id] = claim_queued_parser_uploads("worker-a", 1)
+
+        self.assertIn(process_queued_parser_upload(queued_id), {"completed", "review_required"})
+        self.assertGreater(ParserJob.objects.get(pk=parser_job_id).delete_after, timezone.now())
+        call_command("cleanup_expired_parser_jobs", stdout=StringIO())
+        self.assertTrue(ParserJob.objects.filter(pk=parser_job_id).exists())
+        self.assertTrue(ParserCreditLedgerEntry.objects.filter(user=beta_user, kind="consume").exists())
 
     @override_settings(PARSER_PRIVATE_BETA_ENABLED=True, PARSER_BETA_EMAILS={"beta7@complia.in"})
     def test_parser_upload_image_rejected_even_if_decodable(self):
@@ -645,7 +994,7 @@ class NoticeAPITests(APITestCase):
         OCR_MIN_TEXT_CHARS=20,
         OCR_REQUEST_TIMEOUT_SEC=5,
     )
-    @patch("complia_backend.notices.ocr_utils.requests.post")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
     def test_parser_upload_image_runs_ocr_and_returns_metadata(self, mock_post):
         beta_user = User.objects.create_user(email="betaocr1@complia.in", password="pass123456", user_type="taxpayer")
         UserEntitlement.objects.create(
@@ -701,7 +1050,7 @@ class NoticeAPITests(APITestCase):
         OCR_MAX_PAGES=3,
         OCR_MIN_TEXT_CHARS=20,
     )
-    @patch("complia_backend.notices.ocr_utils.requests.post")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
     @patch("complia_backend.notices.ocr_utils.fitz.open")
     def test_parser_upload_pdf_embedded_text_bypasses_vision(self, mock_fitz_open, mock_post):
         beta_user = User.objects.create_user(email="betaocr2@complia.in", password="pass123456", user_type="taxpayer")
@@ -763,7 +1112,7 @@ class NoticeAPITests(APITestCase):
         OCR_PROVIDER="google_vision",
         GOOGLE_VISION_API_KEY="test-key",
     )
-    @patch("complia_backend.notices.ocr_utils.requests.post")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
     def test_parser_upload_ocr_failure_returns_400_and_refunds_credit(self, mock_post):
         beta_user = User.objects.create_user(email="betaocr3@complia.in", password="pass123456", user_type="taxpayer")
         UserEntitlement.objects.create(
@@ -784,6 +1133,35 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(entitlement.parser_credits, 1)
         self.assertEqual(entitlement.lifetime_consumed_credits, 0)
 
+    @override_settings(
+        PARSER_PRIVATE_BETA_ENABLED=True,
+        PARSER_BETA_EMAILS={"betaocrbreaker@complia.in"},
+        OCR_ENABLED=True,
+        OCR_PROVIDER="google_vision",
+        GOOGLE_VISION_API_KEY="test-key",
+    )
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
+    def test_parser_upload_fails_fast_while_ocr_circuit_is_open(self, mock_post):
+        circuit_breakers.reset_breakers()
+        self.addCleanup(circuit_breakers.reset_breakers)
+        breaker = circuit_breakers.get_breaker("google_vision")
+        breaker.state = "open"
+        breaker.opened_until = time.monotonic() + 60
+
+        beta_user = User.objects.create_user(email="betaocrbreaker@complia.in", password="pass123456", user_type="taxpayer")
+        UserEntitlement.objects.create(user=beta_user, parser_credits=1, lifetime_purchased_credits=1)
+        self.client.force_authenticate(user=beta_user)
+
+        upload = SimpleUploadedFile("scan.jpg", b"\x89JPEG-BYTES", content_type="image/jpeg")
+        response = self.client.post("/api/v1/parser/upload/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("temporarily unavailable", response.data["detail"])
+        mock_post.assert_not_called()
+        self.assertEqual(UserEntitlement.objects.get(user=beta_user).parser_credits, 1)
+
+        ready = self.client.get(reverse("readiness-check")).json()
+        self.assertEqual(ready["circuit_breakers"]["google_vision"]["state"], "open")
+
     @override_settings(
         PARSER_PRIVATE_BETA_ENABLED=True,
         PARSER_BETA_EMAILS={"betaocrpdf@complia.in"},
@@ -793,7 +1171,7 @@ class NoticeAPITests(APITestCase):
         OCR_MAX_PAGES=2,
         OCR_MIN_TEXT_CHARS=20,
     )
-    @patch("complia_backend.notices.ocr_utils.requests.post")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
     @patch("complia_backend.notices.ocr_utils.fitz.open")
     def test_parser_upload_pdf_ocr_failure_returns_400_and_refunds_credit(self, mock_fitz_open, mock_post):
         beta_user = User.objects.create_user(email="betaocrpdf@complia.in", password="pass123456", user_type="taxpayer")
@@ -842,6 +1220,322 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(entitlement.parser_credits, 1)
         self.assertEqual(entitlement.lifetime_consumed_credits, 0)
 
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="google_vision",
+        GOOGLE_VISION_API_KEY="test-key",
+        OCR_MAX_PAGES=3,
+        OCR_MIN_TEXT_CHARS=20,
+        OCR_PAGE_CONCURRENCY=3,
+    )
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
+    @patch("complia_backend.notices.ocr_utils.fitz.open")
+    def test_pdf_raster_ocr_fans_out_pages_and_reports_page_failures(self, mock_fitz_open, mock_post):
+        class FakePixmap:
+            def __init__(self, page_number):
+                self.page_number = page_number
+
+            def tobytes(self, _fmt):
+                return f"page-{self.page_number}".encode("ascii")
+
+        class FakePage:
+            def __init__(self, page_number):
+                self.page_number = page_number
+
+            def get_text(self, _kind):
+                return ""
+
+            def get_pixmap(self, *args, **kwargs):
+                return FakePixmap(self.page_number)
+
+        class FakePdfDocument:
+            page_count = 3
+
+            def __getitem__(self, index):
+                return FakePage(index + 1)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, exc_type, exc_val, exc_tb):
+                return False
+
+        def fake_vision(provider, endpoint, data, headers, timeout):
+            body = json.loads(b"".join(data))
+            page_marker = base64.b64decode(body["requests"][0]["image"]["content"]).decode("ascii")
+            if page_marker == "page-2":
+                raise requests.Timeout("network timeout")
+            if page_marker == "page-1":
+                # Finish last so the result has to be put back in page order.
+                time.sleep(0.2)
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "responses": [{"fullTextAnnotation": {"text": f"Text recovered from {page_marker} of the notice."}}]
+            }
+            return response
+
+        mock_fitz_open.return_value = FakePdfDocument()
+        mock_post.side_effect = fake_vision
+
+        text, metadata = extract_text_from_binary_document(b"%PDF-1.7 fake", "application/pdf", "scan.pdf")
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertLess(text.index("page-1"), text.index("page-3"))
+        self.assertNotIn("page-2", text)
+        self.assertEqual(metadata["ocr_pages_processed"], 2)
+        self.assertEqual(len(metadata["ocr_page_errors"]), 1)
+        self.assertEqual(metadata["ocr_page_errors"][0]["page"], 2)
+        self.assertIn("OCR request failed", metadata["ocr_page_errors"][0]["error"])
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="azure_vision",
+        AZURE_VISION_API_KEY="test-key",
+        OCR_PDF_NATIVE_ENABLED=True,
+        OCR_MAX_PAGES=3,
+        OCR_MIN_TEXT_CHARS=20,
+        OCR_CACHE_ENABLED=True,
+    )
+    def test_scanned_pdf_is_sent_to_azure_read_as_one_trimmed_document(self):
+        with fitz.open() as document:
+            for seed in range(4):
+                page = document.new_page(width=595, height=842)
+                page.insert_image(page.rect, stream=build_upload("image", seed)[2])
+            pdf_bytes = document.tobytes()
+
+        with FakeOCRServer(azure_polls=1) as fake_ocr, override_settings(AZURE_VISION_ENDPOINT=fake_ocr.base_url):
+            with patch("complia_backend.notices.ocr_utils._rasterize_pdf_page") as rasterize:
+                text, metadata = extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+                cached_text, cached_metadata = extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+
+        rasterize.assert_not_called()
+        self.assertEqual(fake_ocr.calls["azure_analyze"], 1)
+        self.assertEqual(fake_ocr.calls["azure_analyze_pdf"], 1)
+        self.assertEqual(metadata["ocr_pages_processed"], 3)
+        self.assertEqual(metadata["ocr_page_errors"], [])
+        self.assertEqual(text.count("\n\n"), 2)
+        self.assertEqual((cached_text, cached_metadata["ocr_cache_hits"]), (text, 1))
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="azure_vision",
+        AZURE_VISION_API_KEY="test-key",
+        AZURE_VISION_ENDPOINT="https://azure.example.com",
+        OCR_PDF_NATIVE_ENABLED=True,
+        OCR_MIN_TEXT_CHARS=20,
+    )
+    @patch("complia_backend.notices.ocr_utils._extract_pdf_via_raster_ocr")
+    @patch("complia_backend.notices.ocr_utils._azure_read_analyze")
+    def test_native_pdf_ocr_failure_falls_back_to_rasterized_pages(self, mock_analyze, mock_raster):
+        mock_analyze.side_effect = OCRProcessingError("OCR service rejected the file.")
+        mock_raster.return_value = (
+            "Text recovered from the rasterized notice page.",
+            {"ocr_pages_processed": 1, "ocr_page_errors": [], "ocr_cache_hits": 0, "ocr_cache_misses": 1},
+        )
+        with fitz.open() as document:
+            document.new_page()
+            pdf_bytes = document.tobytes()
+
+        text, metadata = extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+        mock_raster.assert_called_once()
+        # Both paths share the document deadline instead of each getting OCR_DOCUMENT_DEADLINE_SEC.
+        self.assertEqual(mock_raster.call_args.args[2], mock_analyze.call_args.args[1])
+        self.assertIn("rasterized", text)
+        self.assertEqual(metadata["ocr_pages_processed"], 1)
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="azure_vision",
+        AZURE_VISION_API_KEY="test-key",
+        AZURE_VISION_ENDPOINT="https://azure.example.com",
+        OCR_PDF_NATIVE_ENABLED=True,
+        OCR_MIN_TEXT_CHARS=20,
+        CIRCUIT_BREAKER_ENABLED=True,
+    )
+    @patch("complia_backend.notices.ocr_utils._extract_pdf_via_raster_ocr")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
+    def test_native_pdf_ocr_timeout_or_open_breaker_does_not_fall_back(self, mock_post, mock_raster):
+        with fitz.open() as document:
+            document.new_page()
+            pdf_bytes = document.tobytes()
+
+        circuit_breakers.reset_breakers()
+        self.addCleanup(circuit_breakers.reset_breakers)
+        mock_post.side_effect = requests.Timeout("read timed out")
+        with self.assertRaises(OCRTimeoutError):
+            extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+
+        breaker = circuit_breakers.get_breaker("azure_vision")
+        breaker.state = "open"
+        breaker.opened_until = time.monotonic() + 60
+        with self.assertRaisesMessage(OCRProcessingError, "temporarily unavailable"):
+            extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(mock_post.call_args.kwargs["headers"]["Content-Type"], "application/octet-stream")
+        mock_raster.assert_not_called()
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="google_vision",
+        GOOGLE_VISION_API_KEY="test-key",
+        OCR_MIN_TEXT_CHARS=20,
+        OCR_CACHE_ENABLED=True,
+        OCR_CACHE_MAX_CHARS=60,
+        OCR_CACHE_MAINTENANCE_INTERVAL_SEC=0,
+        PARSER_EPHEMERAL_TTL_HOURS=1,
+        OCR_CACHE_TTL_HOURS=24,
+    )
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
+    def test_ocr_cache_reuses_text_for_identical_images(self, mock_post):
+        vision_response = Mock()
+        vision_response.status_code = 200
+        vision_response.json.return_value = {
+            "responses": [{"fullTextAnnotation": {"text": "Notice under Section 61 with reply due in 15 days."}}]
+        }
+        mock_post.return_value = vision_response
+
+        first_text, first_meta = extract_text_from_binary_document(b"\x89PNG-same-scan", "image/png", "scan.png")
+        second_text, second_meta = extract_text_from_binary_document(b"\x89PNG-same-scan", "image/png", "again.png")
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(first_text, second_text)
+        self.assertEqual((first_meta["ocr_cache_hits"], first_meta["ocr_cache_misses"]), (0, 1))
+        self.assertEqual((second_meta["ocr_cache_hits"], second_meta["ocr_cache_misses"]), (1, 0))
+        entry = OCRCacheEntry.objects.get()
+        self.assertEqual(entry.hit_count, 1)
+        self.assertEqual(entry.text_chars, len(first_text))
+        # TTL is clamped to the parser privacy window even when configured longer.
+        self.assertLessEqual(entry.expires_at, timezone.now() + timedelta(hours=1))
+
+        extract_text_from_binary_document(b"\x89PNG-other-scan", "image/png", "other.png")
+        self.assertEqual(mock_post.call_count, 2)
+        # Two pages exceed OCR_CACHE_MAX_CHARS=60, so the least recently used one is evicted.
+        self.assertEqual(OCRCacheEntry.objects.count(), 1)
+        self.assertNotEqual(OCRCacheEntry.objects.get().cache_key, entry.cache_key)
+
+    @override_settings(
+        OCR_PROVIDER="azure_vision",
+        OCR_ROUTING="hedged",
+        OCR_SECONDARY_PROVIDER="",
+        AZURE_VISION_API_KEY="azure-key",
+        AZURE_VISION_ENDPOINT="https://azure.example.com",
+        GOOGLE_VISION_API_KEY="vision-key",
+        OCR_HEDGE_DELAY_SEC=0.05,
+        OCR_CACHE_ENABLED=True,
+    )
+    def test_ocr_cache_keys_hedged_text_by_the_provider_that_produced_it(self):
+        ocr_latency.reset_ocr_latency()
+        self.addCleanup(ocr_latency.reset_ocr_latency)
+
+        def slow_azure(image_stream, deadline=None, cancel_event=None):
+            cancel_event.wait(5)
+            raise OCRProcessingError("OCR request was cancelled.")
+
+        def vision(image_stream, deadline=None, cancel_event=None):
+            return "vision text"
+
+        azure = Mock(side_effect=slow_azure)
+        with patch.dict(ocr_utils.OCR_PROVIDER_CALLS, {"azure_vision": azure, "google_vision": vision}):
+            self.assertEqual(ocr_utils._cached_provider_ocr_image(io.BytesIO(b"page")), ("vision text", "google_vision", False))
+            entry = OCRCacheEntry.objects.get()
+            self.assertEqual(entry.provider, "google_vision")
+            self.assertEqual(entry.cache_key, ocr_utils.ocr_cache_key(io.BytesIO(b"page"), provider="google_vision"))
+
+            # Hedged lookups find the secondary's text; single-provider Azure routing does not reuse it.
+            azure.reset_mock()
+            self.assertEqual(ocr_utils._cached_provider_ocr_image(io.BytesIO(b"page")), ("vision text", "google_vision", True))
+            azure.assert_not_called()
+            azure.side_effect = lambda image_stream, deadline=None, cancel_event=None: "azure text"
+            with override_settings(OCR_ROUTING="single"):
+                self.assertEqual(ocr_utils._cached_provider_ocr_image(io.BytesIO(b"page")), ("azure text", "azure_vision", False))
+        self.assertEqual(sorted(OCRCacheEntry.objects.values_list("provider", flat=True)), ["azure_vision", "google_vision"])
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="azure_vision",
+        OCR_ROUTING="hedged",
+        OCR_SECONDARY_PROVIDER="",
+        AZURE_VISION_API_KEY="azure-key",
+        AZURE_VISION_ENDPOINT="https://azure.example.com",
+        GOOGLE_VISION_API_KEY="vision-key",
+        OCR_HEDGE_DELAY_SEC=0.05,
+        OCR_PDF_NATIVE_ENABLED=False,
+        OCR_MIN_TEXT_CHARS=20,
+        OCR_CACHE_ENABLED=True,
+    )
+    def test_ocr_engine_reports_the_provider_that_answered_a_hedged_request(self):
+        ocr_latency.reset_ocr_latency()
+        self.addCleanup(ocr_latency.reset_ocr_latency)
+
+        def slow_azure(image_stream, deadline=None, cancel_event=None):
+            cancel_event.wait(5)
+            raise OCRProcessingError("OCR request was cancelled.")
+
+        def vision(image_stream, deadline=None, cancel_event=None):
+            return "Notice under Section 61 recovered by the secondary provider."
+
+        with fitz.open() as document:
+            for seed in range(2):
+                page = document.new_page(width=595, height=842)
+                page.insert_image(page.rect, stream=build_upload("image", seed)[2])
+            pdf_bytes = document.tobytes()
+
+        with patch.dict(ocr_utils.OCR_PROVIDER_CALLS, {"azure_vision": slow_azure, "google_vision": vision}):
+            _text, image_meta = extract_text_from_binary_document(b"\x89PNG-hedged", "image/png", "scan.png")
+            _text, cached_image_meta = extract_text_from_binary_document(b"\x89PNG-hedged", "image/png", "scan.png")
+            _text, pdf_meta = extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+            _text, cached_pdf_meta = extract_text_from_binary_document(pdf_bytes, "application/pdf", "scan.pdf")
+
+        self.assertEqual((image_meta["ocr_engine"], cached_image_meta["ocr_engine"]), ("google_vision", "google_vision"))
+        self.assertEqual(cached_image_meta["ocr_cache_hits"], 1)
+        self.assertEqual((pdf_meta["ocr_engine"], cached_pdf_meta["ocr_engine"]), ("google_vision", "google_vision"))
+        self.assertEqual(cached_pdf_meta["ocr_cache_hits"], 2)
+
+    @override_settings(
+        OCR_ENABLED=True,
+        OCR_PROVIDER="google_vision",
+        GOOGLE_VISION_API_KEY="test-key",
+        OCR_MIN_TEXT_CHARS=20,
+        OCR_CACHE_ENABLED=False,
+    )
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
+    def test_image_ocr_streams_spooled_upload_to_vision(self, mock_post):
+        image_bytes = bytes(range(256)) * 1200 + b"tail"
+        captured = {}
+
+        def fake_vision(provider, endpoint, data, headers, timeout):
+            captured["declared_length"] = len(data)
+            captured["body"] = b"".join(data)
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {
+                "responses": [{"fullTextAnnotation": {"text": "Notice under Section 61 with reply due in 15 days."}}]
+            }
+            return response
+
+        mock_post.side_effect = fake_vision
+        with tempfile.NamedTemporaryFile(suffix=".png") as spooled:
+            spooled.write(image_bytes)
+            spooled.flush()
+            text, metadata = extract_text_from_binary_document(spooled.name, "image/png", "scan.png")
+
+        self.assertIn("Section 61", text)
+        self.assertEqual(metadata["ocr_pages_processed"], 1)
+        self.assertEqual(captured["declared_length"], len(captured["body"]))
+        body = json.loads(captured["body"])
+        self.assertEqual(base64.b64decode(body["requests"][0]["image"]["content"]), image_bytes)
+        self.assertEqual(body["requests"][0]["features"], [{"type": "DOCUMENT_TEXT_DETECTION"}])
+
+    def test_read_text_upload_decodes_spooled_file_incrementally(self):
+        # Multi-byte characters straddle the 8 KB read boundaries.
+        text = "Demand notice ₹ under Section 73. " * 3000
+        with tempfile.NamedTemporaryFile(suffix=".txt") as spooled:
+            spooled.write(text.encode("utf-8"))
+            spooled.flush()
+            decoded = read_text_upload(spooled.name)
+        self.assertEqual(decoded, text.encode("utf-8")[:60000].decode("utf-8", errors="ignore"))
+
     @override_settings(PARSER_PRIVATE_BETA_ENABLED=True, PARSER_BETA_EMAILS={"betaocr4@complia.in"}, OCR_ENABLED=False)
     def test_parser_upload_binary_returns_actionable_message_when_ocr_disabled(self):
         beta_user = User.objects.create_user(email="betaocr4@complia.in", password="pass123456", user_type="taxpayer")
@@ -868,8 +1562,8 @@ class NoticeAPITests(APITestCase):
         OCR_MIN_TEXT_CHARS=20,
         OCR_REQUEST_TIMEOUT_SEC=2,
     )
-    @patch("complia_backend.notices.ocr_utils.requests.get")
-    @patch("complia_backend.notices.ocr_utils.requests.post")
+    @patch("complia_backend.notices.ocr_utils.http_client.get")
+    @patch("complia_backend.notices.ocr_utils.http_client.post")
     def test_parser_upload_image_runs_azure_ocr_and_returns_metadata(self, mock_post, mock_get):
         beta_user = User.objects.create_user(email="betaazure1@complia.in", password="pass123456", user_type="taxpayer")
         UserEntitlement.objects.create(
@@ -989,9 +1683,37 @@ class NoticeAPITests(APITestCase):
             processed_at=timezone.now(),
         )
 
-        call_command("cleanup_expired_parser_jobs")
+        OCRCacheEntry.objects.create(
+            cache_key="a" * 64,
+            provider="google_vision",
+            text="expired OCR text",
+            last_used_at=timezone.now() - timedelta(hours=2),
+            expires_at=timezone.now() - timedelta(hours=1),
+        )
+
+        call_command("cleanup_expired_parser_jobs", stdout=StringIO())
         self.assertEqual(ParserJob.objects.count(), 1)
         self.assertEqual(ParserJob.objects.first().original_filename, "active.txt")
+        self.assertFalse(OCRCacheEntry.objects.exists())
+
+    def test_extractors_match_ignorecase_aliases_and_shared_document(self):
+        # U+017F and U+0130 match "s" and "i" under IGNORECASE, so the literal prefilter must still let them through.
+        text = "Demand raised u/\u017f 73(1)\nTax payable: R\u017f. 45,000\nRule 86A applies"
+        self.assertEqual(extract_legal_section(text), "Section 73(1)")
+        self.assertEqual(str(extract_amount(text)), "45000")
+        self.assertIsNone(extract_amount("Notice without any payable figure"))
+
+        document = NoticeText("SHOW CAUSE NOTICE\nIssued under Section 74 of the CGST Act\nTax period: 2023-24")
+        likelihood = analyze_notice_likelihood(document, "scn.pdf")
+        self.assertEqual(likelihood, analyze_notice_likelihood(document.raw, "scn.pdf"))
+        self.assertIn("legal_reference", likelihood["positives"])
+        self.assertEqual(extract_legal_section(document), "Section 74")
+
+    def test_benchmark_parser_extraction_command_reports_speedup(self):
+        out = StringIO()
+        call_command("benchmark_parser_extraction", "--sizes-kb", "4", "--repeat", "1", stdout=out)
+        self.assertIn("4 KB:", out.getvalue())
+        self.assertIn("speedup", out.getvalue())
 
     def test_run_parser_benchmark_command_stores_run(self):
         sample_payload = [
@@ -1015,6 +1737,50 @@ class NoticeAPITests(APITestCase):
             if os.path.exists(tmp_path):
                 os.remove(tmp_path)
 
+    def test_run_parser_benchmark_streams_jsonl_and_records_latency(self):
+        sample = {
+            "filename": "GST-DRC-01-test.txt",
+            "text": "GST-DRC-01 under Section 73 for INR 1000.",
+            "expected_notice_code": "GST-DRC-01",
+            "expected_legal_section": "Section 73",
+            "expected_amount": "1000",
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset_path = os.path.join(tmp_dir, "samples.jsonl")
+            samples_path = os.path.join(tmp_dir, "per-sample.jsonl")
+            with open(dataset_path, "w", encoding="utf-8") as dataset:
+                dataset.write("\n".join(json.dumps(sample) for _ in range(3)) + "\n\n")
+
+            call_command("run_parser_benchmark", "--dataset", dataset_path, "--shard-size", "2", "--samples-output", samples_path, stdout=StringIO())
+            with open(samples_path, encoding="utf-8") as per_sample:
+                records = [json.loads(line) for line in per_sample]
+
+        run = ParserBenchmarkRun.objects.get()
+        self.assertEqual(run.sample_count, 3)
+        self.assertEqual(run.metrics["section_counts"], {"tp": 3, "fp": 0, "fn": 0})
+        self.assertGreater(run.metrics["latency"]["p95_ms"], 0)
+        self.assertGreater(run.metrics["throughput_samples_per_sec"], 0)
+        self.assertIn("legal_section", run.metrics["stage_latency"])
+        self.assertEqual(sorted(record["index"] for record in records), [0, 1, 2])
+        self.assertIn("likelihood", records[0]["stage_ms"])
+
+    def test_run_parser_benchmark_fails_on_latency_regression(self):
+        dataset_path = "complia_backend/notices/data/parser_benchmark_samples.json"
+        previous_metrics = {"dataset_path": dataset_path, "workers": 1, "latency": {"p95_ms": 0.0001}}
+        ParserBenchmarkRun.objects.create(sample_count=1, metrics=previous_metrics)
+        gate = ["--max-latency-regression", "25"]
+
+        with self.assertRaisesMessage(CommandError, "p95 latency regressed"):
+            call_command("run_parser_benchmark", "--dataset", dataset_path, *gate, "--min-latency-regression-ms", "0", stdout=StringIO())
+        self.assertEqual(ParserBenchmarkRun.objects.count(), 2)
+
+        # The gate is off by default, ignores growth under the ms floor and only compares runs with the same worker count.
+        ParserBenchmarkRun.objects.update(metrics=previous_metrics)
+        call_command("run_parser_benchmark", "--dataset", dataset_path, "--no-store", stdout=StringIO())
+        call_command("run_parser_benchmark", "--dataset", dataset_path, "--no-store", *gate, "--min-latency-regression-ms", "1000", stdout=StringIO())
+        ParserBenchmarkRun.objects.update(metrics={**previous_metrics, "workers": 2})
+        call_command("run_parser_benchmark", "--dataset", dataset_path, "--no-store", *gate, "--min-latency-regression-ms", "0", stdout=StringIO())
+
     def test_ensure_notice_baseline_command(self):
         call_command("ensure_notice_baseline", "--target", "30", "--verified-by", "QA Team")
         self.assertGreaterEqual(NoticeType.objects.filter(is_active=True).count(), 30)
@@ -1052,7 +1818,7 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(self.notice.source_url, "https://example.com/gst-asmt-10")
         self.assertEqual(self.notice.review_status, "trusted")
 
-    @patch("complia_backend.notices.management.commands.check_notice_sources.requests.get")
+    @patch("complia_backend.notices.management.commands.check_notice_sources.http_client.get")
     def test_check_notice_sources_command_stores_baseline_hash(self, mock_get):
         self.notice.source_url = "https://example.com/asmt-10"
         self.notice.review_status = "watch"
@@ -1074,7 +1840,7 @@ class NoticeAPITests(APITestCase):
         self.assertEqual(self.notice.source_check_error, "")
         self.assertIn("baseline hash stored", out.getvalue())
 
-    @patch("complia_backend.notices.management.commands.check_notice_sources.requests.get")
+    @patch("complia_backend.notices.management.commands.check_notice_sources.http_client.get")
     def test_check_notice_sources_marks_changed_notice_for_review(self, mock_get):
         self.notice.source_url = "https://example.com/asmt-10"
         self.notice.source_content_hash = "old-hash"
@@ -1092,3 +1858,173 @@ class NoticeAPITests(APITestCase):
         self.notice.refresh_from_db()
         self.assertEqual(self.notice.review_status, "needs_review")
         self.assertIsNotNone(self.notice.source_last_changed_at)
+
+    @patch("complia_backend.notices.management.commands.check_notice_sources.http_client.get")
+    def test_check_notice_sources_uses_stored_validators_for_conditional_requests(self, mock_get):
+        self.notice.source_url = "https://example.com/asmt-10"
+        self.notice.source_content_hash = "baseline-hash"
+        self.notice.source_etag = '"v1"'
+        self.notice.source_last_modified = "Mon, 05 Oct 2026 10:00:00 GMT"
+        self.notice.review_status = "trusted"
+        self.notice.save(
+            update_fields=["source_url", "source_content_hash", "source_etag", "source_last_modified", "review_status"]
+        )
+
+        not_modified = Mock(status_code=304, headers={"ETag": '"v1"'})
+        mock_get.return_value = not_modified
+
+        out = StringIO()
+        call_command("check_notice_sources", "--code", self.notice.code, "--host-delay", "0", stdout=out)
+
+        sent_headers = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(sent_headers["If-None-Match"], '"v1"')
+        self.assertEqual(sent_headers["If-Modified-Since"], "Mon, 05 Oct 2026 10:00:00 GMT")
+        not_modified.raise_for_status.assert_not_called()
+        self.notice.refresh_from_db()
+        self.assertEqual(self.notice.source_content_hash, "baseline-hash")
+        self.assertEqual(self.notice.review_status, "trusted")
+        self.assertEqual(self.notice.source_last_modified, "Mon, 05 Oct 2026 10:00:00 GMT")
+        self.assertIsNotNone(self.notice.source_last_checked_at)
+        self.assertIn("unchanged (not modified)", out.getvalue())
+
+    def test_check_notice_sources_caps_concurrency_per_host(self):
+        for idx in range(6):
+            NoticeType.objects.create(
+                code=f"SRC-{idx}",
+                title=f"Source Notice {idx}",
+                detailed_explanation="Explanation",
+                consequences_of_ignoring="Risk",
+                next_steps="Next",
+                is_active=True,
+                source_url=f"https://{'gst.gov.in' if idx % 2 else 'incometax.gov.in'}/notice/{idx}",
+            )
+
+        in_flight: dict[str, int] = {}
+        peak: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def fake_get(provider, url, headers, timeout, allow_redirects):
+            host = url.split("/")[2]
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.05)
+            with lock:
+                in_flight[host] -= 1
+            return Mock(status_code=200, content=f"body for {url}".encode(), headers={"ETag": f'"{url}"'})
+
+        with patch(
+            "complia_backend.notices.management.commands.check_notice_sources.http_client.get",
+            side_effect=fake_get,
+        ):
+            call_command(
+                "check_notice_sources",
+                "--workers",
+                "6",
+                "--per-host",
+                "1",
+                "--host-delay",
+                "0",
+                stdout=StringIO(),
+            )
+
+        self.assertEqual(peak, {"gst.gov.in": 1, "incometax.gov.in": 1})
+        checked = NoticeType.objects.filter(code__startswith="SRC-")
+        self.assertFalse(checked.filter(source_content_hash="").exists())
+        self.assertEqual(checked.get(code="SRC-1").source_etag, '"https://gst.gov.in/notice/1"')
+
+
+class ParserUploadLoadTestCommandTests(TransactionTestCase):
+    """Runs the load-test harness for real: worker threads need committed users, hence no test transaction."""
+
+    def setUp(self):
+        # Throttle history is keyed by user pk, and pks are reused once earlier tests flush their users.
+        cache.clear()
+
+    def test_load_test_drives_uploads_through_fake_azure_polling(self):
+        out = StringIO()
+        call_command(
+            "load_test_parser_upload",
+            "--requests",
+            "4",
+            "--concurrency",
+            "1",
+            "--mix",
+            "text=1,pdf=1,scanned_pdf=1,image=1",
+            "--ocr-latency-ms",
+            "0",
+            "--json",
+            stdout=out,
+        )
+        report = json.loads(out.getvalue())
+
+        self.assertEqual(report["statuses"], {"201": 4})
+        self.assertEqual(report["stages"]["request"]["count"], 4)
+        self.assertIn("p99_ms", report["stages"]["extract"])
+        self.assertGreater(report["stages"]["parse_and_store"]["avg_queries"], 0)
+        self.assertGreaterEqual(report["fake_ocr_calls"].get("azure_poll", 0), 2 * report["fake_ocr_calls"].get("azure_analyze", 0))
+        self.assertFalse(User.objects.filter(email__startswith="loadtest-").exists())
+
+
+@override_settings(
+    OCR_PROVIDER="azure_vision",
+    OCR_ROUTING="hedged",
+    OCR_SECONDARY_PROVIDER="",
+    AZURE_VISION_API_KEY="azure-key",
+    AZURE_VISION_ENDPOINT="https://azure.example.com",
+    GOOGLE_VISION_API_KEY="vision-key",
+    OCR_HEDGE_DELAY_SEC=0.05,
+    OCR_HEDGE_MIN_SAMPLES=5,
+    OCR_HEDGE_PERCENTILE=0.9,
+)
+class OCRHedgedRoutingTests(SimpleTestCase):
+    def setUp(self):
+        ocr_latency.reset_ocr_latency()
+        self.addCleanup(ocr_latency.reset_ocr_latency)
+        self.azure_cancelled = threading.Event()
+
+    def slow_azure(self, image_stream, deadline=None, cancel_event=None):
+        if cancel_event.wait(5):
+            self.azure_cancelled.set()
+            raise OCRProcessingError("OCR request was cancelled.")
+        return "azure text"
+
+    def fast_vision(self, image_stream, deadline=None, cancel_event=None):
+        return f"vision text: {image_stream.read().decode()}"
+
+    def test_slow_primary_is_hedged_to_secondary_and_cancelled(self):
+        with patch.dict(ocr_utils.OCR_PROVIDER_CALLS, {"azure_vision": self.slow_azure, "google_vision": self.fast_vision}):
+            text, provider = ocr_utils._provider_ocr_image(io.BytesIO(b"page-1"))
+
+        self.assertEqual((text, provider), ("vision text: page-1", "google_vision"))
+        self.assertTrue(self.azure_cancelled.wait(2))
+        snapshot = ocr_latency.ocr_latency_snapshot()
+        self.assertEqual(snapshot["azure_vision"]["hedges"], {"fired": 1, "primary_won": 0, "secondary_won": 1, "failed": 0})
+        self.assertEqual(snapshot["google_vision"]["samples"], 1)
+
+    def test_failed_primary_fails_over_without_waiting_for_hedge_delay(self):
+        def failing_azure(image_stream, deadline=None, cancel_event=None):
+            raise OCRProcessingError("Azure OCR request failed.")
+
+        with override_settings(OCR_HEDGE_DELAY_SEC=30), patch.dict(
+            ocr_utils.OCR_PROVIDER_CALLS, {"azure_vision": failing_azure, "google_vision": self.fast_vision}
+        ):
+            started = time.monotonic()
+            self.assertEqual(ocr_utils._provider_ocr_image(io.BytesIO(b"p")), ("vision text: p", "google_vision"))
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_hedge_delay_follows_primary_latency_histogram(self):
+        self.assertEqual(ocr_latency.hedge_delay_sec("azure_vision"), 0.05)
+        for elapsed in (0.2, 0.3, 0.4, 0.6, 1.8):
+            ocr_latency.record_ocr_latency("azure_vision", elapsed)
+        self.assertEqual(ocr_latency.hedge_delay_sec("azure_vision"), 2.0)
+        for _ in range(20):
+            ocr_latency.record_ocr_latency("azure_vision", 0.3)
+        self.assertEqual(ocr_latency.hedge_delay_sec("azure_vision"), 0.5)
+
+    @override_settings(OCR_ROUTING="single")
+    def test_single_routing_never_calls_secondary(self):
+        vision = Mock(return_value="vision text")
+        with patch.dict(ocr_utils.OCR_PROVIDER_CALLS, {"azure_vision": Mock(return_value="azure text"), "google_vision": vision}):
+            self.assertEqual(ocr_utils._provider_ocr_image(io.BytesIO(b"p")), ("azure text", "azure_vision"))
+        vision.assert_not_called()
@@ -1,24 +1,31 @@
+import hashlib
 import os
-import string
 import tempfile
 from datetime import timedelta
 
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Max, Q
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from rest_framework import filters, generics, mixins, permissions, serializers, status, viewsets
+from rest_framework.filters import BaseFilterBackend
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle as DRFScopedRateThrottle, UserRateThrottle
 from rest_framework.views import APIView
 
-from accounts.models import AnalyticsEvent, UserEntitlement
+from accounts.payment_ops import consume_parser_credit, refund_parser_credit, reserve_parser_credit
 from accounts.permissions import IsParserBetaUser, IsSuperAdmin
 from accounts.throttles import CompliaScopedRateThrottle
-from .models import NoticeFeedback, NoticeType, ParserBenchmarkRun, ParserExtraction, ParserJob, SavedNotice
-from .ocr_utils import OCRProcessingError, extract_text_from_binary_document, sanitize_ocr_text
-from .parser_utils import NonNoticeDocumentError, analyze_notice_likelihood, parse_notice_document
+from .models import NoticeCatalogState, NoticeFeedback, NoticeType, ParserBenchmarkRun, ParserJob, SavedNotice, TriggerKeyword
+from .ocr_utils import OCRProcessingError
+from .parser_jobs import enqueue_parser_upload, extract_upload_text, new_credit_reference, record_parser_result
+from .parser_utils import NonNoticeDocumentError
+from .search import search_notices
+from .suggest import get_notice_suggest_index
 from .serializers import (
     AdminFeedbackSerializer,
     AdminNoticeTypeSerializer,
@@ -29,16 +36,66 @@ from .serializers import (
     ParserJobSerializer,
     ParserUploadSerializer,
     SavedNoticeSerializer,
+    latest_ca_requests_by_notice_code,
 )
 
 ScopedRateThrottle = CompliaScopedRateThrottle or DRFScopedRateThrottle
+CATALOG_STATE_PK = 1
+
+
+def notice_catalog_version() -> tuple[str, int]:
+    """
+    Returns (version, last_modified_timestamp) for the public notice catalog in two aggregate
+    queries plus a read of NoticeCatalogState (and a write when the version just changed).
+
+    Any change the API can show moves the version: edits bump `updated_at` (trigger keyword edits
+    touch their notice, see signals), deactivations change the active count, and bulk-created or
+    deleted triggers change the trigger count or max id. Deletes and bulk updates leave
+    Max(updated_at) alone, so Last-Modified is instead the moment this version was first seen,
+    kept at least a second past the previous one so If-Modified-Since always notices the change.
+    """
+    notices = NoticeType.objects.aggregate(
+        last_modified=Max("updated_at"),
+        active=Count("id", filter=Q(is_active=True)),
+        total=Count("id"),
+    )
+    triggers = TriggerKeyword.objects.aggregate(count=Count("id"), max_id=Max("id"))
+    last_modified = notices["last_modified"]
+    version = (
+        f"{last_modified.isoformat() if last_modified else ''}:{notices['active']}:{notices['total']}:"
+        f"{triggers['count']}:{triggers['max_id'] or 0}"
+    )
+    state = NoticeCatalogState.objects.filter(pk=CATALOG_STATE_PK).first()
+    if state is None or state.version != version:
+        changed_at = timezone.now()
+        if state is not None:
+            changed_at = max(changed_at, state.changed_at + timedelta(seconds=1))
+        state, _created = NoticeCatalogState.objects.update_or_create(
+            pk=CATALOG_STATE_PK, defaults={"version": version, "changed_at": changed_at}
+        )
+    return version, int(state.changed_at.timestamp())
+
+
+class NoticeSearchFilter(BaseFilterBackend):
+    """
+    `?search=` over the indexed notice search document (see notices.search).
+
+    Every term must match a word prefix. Results are ranked by relevance unless the client
+    asked for an explicit `?ordering=`, so this backend runs after OrderingFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(api_settings.SEARCH_PARAM, "")
+        ordering_param = getattr(view, "ordering_param", api_settings.ORDERING_PARAM)
+        return search_notices(queryset, term, rank=not request.query_params.get(ordering_param))
+
 
 class NoticeTypeViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Read-only endpoint for listing/searching active notice types.
 
     Supports:
-    - full-text search on code/title/summary/trigger keywords
+    - ranked full-text search on code/slug/title/summary/trigger keywords
     - severity filtering via `?severity=low|medium|high`
     - ordering on selected fields
     - global pagination from REST_FRAMEWORK settings
@@ -46,8 +103,7 @@ class NoticeTypeViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = NoticeType.objects.filter(is_active=True).prefetch_related("triggers").order_by("code")
     serializer_class = NoticeTypeSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ["code", "slug", "title", "triggers__keyword", "summary"]
+    filter_backends = [filters.OrderingFilter, NoticeSearchFilter]
     ordering = ["code"]
     ordering_fields = ["code", "title", "updated_at", "severity"]
     lookup_field = "code"
@@ -60,6 +116,54 @@ class NoticeTypeViewSet(viewsets.ReadOnlyModelViewSet):
             queryset = queryset.filter(severity=severity)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(request, super().retrieve, *args, **kwargs)
+
+    def _conditional_response(self, request, handler, *args, **kwargs):
+        """
+        Revalidates against the catalog version before any list query or serializer runs.
+        ETags are strong and per representation: the version plus full path and Accept header.
+        """
+        version, last_modified = notice_catalog_version()
+        representation = f"{version}|{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}"
+        etag = quote_etag(hashlib.sha256(representation.encode("utf-8")).hexdigest()[:40])
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            # Without an explicit directive browsers apply heuristic freshness to Last-Modified
+            # responses and could show a stale catalog; no-cache makes them revalidate instead.
+            patch_cache_control(response, no_cache=True)
+        return response
+
+
+class NoticeSuggestView(APIView):
+    """
+    Typeahead for the notice search box: `?q=<prefix>&limit=<n>` returns compact
+    `{code, title, severity}` hits from the in-process suggest index, without touching the DB.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = "notice_suggest"
+    DEFAULT_LIMIT = 8
+    MAX_LIMIT = 20
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            raise serializers.ValidationError({"limit": ["A valid integer is required."]})
+        limit = min(max(limit, 1), self.MAX_LIMIT)
+        results = get_notice_suggest_index().suggest(request.query_params.get("q", ""), limit)
+        return Response({"results": results})
+
 
 class FeedbackViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     """
@@ -89,7 +193,24 @@ class SavedNoticeViewSet(
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return SavedNotice.objects.filter(user=self.request.user).select_related("notice", "parser_job")
+        return (
+            SavedNotice.objects.filter(user=self.request.user)
+            .select_related("notice", "parser_job")
+            .prefetch_related("notice__triggers")
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        saved_notices = page if page is not None else list(queryset)
+        context = self.get_serializer_context()
+        context["latest_ca_requests"] = latest_ca_requests_by_notice_code(
+            request.user, (saved_notice.notice.code for saved_notice in saved_notices)
+        )
+        serializer = self.get_serializer_class()(saved_notices, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     @staticmethod
     def _build_parser_snapshot(parser_job: ParserJob) -> dict:
@@ -225,22 +346,19 @@ class SuperAdminNoticeTypeViewSet(
 
 
 class ParserUploadView(APIView):
+    """
+    Accepts a notice upload and reserves one parser credit.
+
+    With PARSER_ASYNC_ENABLED the upload is queued and answered with `202` plus a `queued`
+    job; `run_parser_workers` finishes it and clients poll `parser/results/<id>/`.
+    Otherwise OCR + parsing run inline and the finished job is returned with `201`.
+    """
+
     permission_classes = [permissions.IsAuthenticated, IsParserBetaUser]
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = "parser_upload"
     parser_classes = [MultiPartParser, FormParser]
 
-    @staticmethod
-    def _looks_like_readable_text(raw_text: str) -> bool:
-        compact = "".join(ch for ch in raw_text if not ch.isspace())
-        if len(compact) < 30:
-            return False
-        alpha_count = sum(ch.isalpha() for ch in compact)
-        alpha_ratio = alpha_count / max(len(compact), 1)
-        printable_count = sum(ch in string.printable for ch in raw_text)
-        printable_ratio = printable_count / max(len(raw_text), 1)
-        return alpha_count >= 30 and alpha_ratio >= 0.2 and printable_ratio >= 0.7
-
     def post(self, request):
         is_admin_bypass = request.user.is_superuser or getattr(request.user, "user_type", "") == "admin"
 
@@ -253,155 +371,71 @@ class ParserUploadView(APIView):
             return Response({"detail": "Uploaded file exceeds size limit."}, status=status.HTTP_400_BAD_REQUEST)
 
         credit_reserved = False
+        credit_reference = new_credit_reference()
         if not is_admin_bypass:
-            with transaction.atomic():
-                entitlement, _ = UserEntitlement.objects.select_for_update().get_or_create(
-                    user=request.user,
-                    defaults={
-                        "parser_credits": 0,
-                        "lifetime_purchased_credits": 0,
-                        "lifetime_consumed_credits": 0,
+            credit_reserved, credits_remaining = reserve_parser_credit(request.user, reference=credit_reference)
+            if not credit_reserved:
+                return Response(
+                    {
+                        "status": "error",
+                        "message": "Payment required before parser upload.",
+                        "code": "PAYMENT_REQUIRED",
+                        "credits": credits_remaining,
                     },
+                    status=status.HTTP_402_PAYMENT_REQUIRED,
                 )
-                if entitlement.parser_credits < 1:
-                    return Response(
-                        {
-                            "status": "error",
-                            "message": "Payment required before parser upload.",
-                            "code": "PAYMENT_REQUIRED",
-                            "credits": entitlement.parser_credits,
-                        },
-                        status=status.HTTP_402_PAYMENT_REQUIRED,
-                    )
-                entitlement.parser_credits -= 1
-                entitlement.lifetime_consumed_credits += 1
-                entitlement.save(
-                    update_fields=[
-                        "parser_credits",
-                        "lifetime_consumed_credits",
-                        "updated_at",
-                    ]
-                )
-                credit_reserved = True
 
         temp_path = None
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(upload.name)[1]) as tmp:
-                for chunk in upload.chunks():
-                    tmp.write(chunk)
-                temp_path = tmp.name
-
-            with open(temp_path, "rb") as temp_file:
-                raw_bytes = temp_file.read()
+            if hasattr(upload, "temporary_file_path"):
+                # Large uploads are already spooled to disk by Django; read them in place.
+                upload_path = upload.temporary_file_path()
+            else:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(upload.name)[1]) as tmp:
+                    for chunk in upload.chunks():
+                        tmp.write(chunk)
+                    temp_path = tmp.name
+                upload_path = temp_path
 
             mime_type = (getattr(upload, "content_type", "") or "").lower()
-            file_name = (upload.name or "").lower()
-            is_binary_doc = mime_type.startswith("image/") or mime_type == "application/pdf" or file_name.endswith(".pdf")
-            ocr_metadata = {
-                "ocr_engine": "none",
-                "ocr_pages_processed": 0,
-                "ocr_used": False,
-                "ocr_text_chars": 0,
-            }
-            if is_binary_doc:
-                raw_text, ocr_metadata = extract_text_from_binary_document(
+            notice_code = serializer.validated_data.get("notice_code", "").strip()
+
+            if settings.PARSER_ASYNC_ENABLED:
+                # The queue row carries the upload to the worker, so async mode reads it once here.
+                with open(upload_path, "rb") as upload_file:
+                    raw_bytes = upload_file.read()
+                parser_job = enqueue_parser_upload(
+                    user=request.user,
                     raw_bytes=raw_bytes,
-                    mime_type=mime_type,
                     filename=upload.name,
+                    mime_type=mime_type,
+                    notice_code=notice_code,
+                    credit_reserved=credit_reserved,
+                    credit_reference=credit_reference,
                 )
-            else:
-                raw_text = raw_bytes[:60000].decode("utf-8", errors="ignore")
-                raw_text = sanitize_ocr_text(raw_text)
-                ocr_metadata["ocr_text_chars"] = len("".join(ch for ch in raw_text if not ch.isspace()))
-            if not self._looks_like_readable_text(raw_text):
-                raise ValueError(
-                    "Could not extract readable text from this file. Please upload a clearer scan or .txt file."
-                )
-            notice_likelihood = analyze_notice_likelihood(raw_text, upload.name)
-            if not notice_likelihood["is_likely_notice"]:
-                raise NonNoticeDocumentError(
-                    "This file does not appear to be a tax or compliance notice. Please upload the actual notice PDF/image/text."
+                return Response(
+                    ParserJobSerializer(parser_job).data,
+                    status=status.HTTP_202_ACCEPTED,
+                    headers={"Location": reverse("parser-result-detail", kwargs={"pk": parser_job.id})},
                 )
-            notice_code = serializer.validated_data.get("notice_code", "").strip()
-            parsed = parse_notice_document(raw_text, upload.name, notice_code)
-            deadline_date = parsed["deadline_date"]
-            legal_section = parsed["legal_section"]
-            amount_claimed = parsed["amount_claimed"]
-            notice = parsed["notice"]
-            confidence = parsed["confidence"]
-
-            now = timezone.now()
-            requires_review = confidence < settings.PARSER_REVIEW_THRESHOLD
-            parser_job = ParserJob.objects.create(
+
+            raw_text, ocr_metadata = extract_upload_text(upload_path, mime_type, upload.name)
+            parser_job = record_parser_result(
                 user=request.user,
-                notice=notice,
-                original_filename=upload.name,
+                raw_text=raw_text,
+                filename=upload.name,
                 mime_type=mime_type,
-                status="review_required" if requires_review else "completed",
-                confidence=confidence,
-                is_private_beta=True,
-                delete_after=now + timedelta(hours=settings.PARSER_EPHEMERAL_TTL_HOURS),
-                processed_at=now,
-            )
-
-            payload = {
-                "notice_code_detected": notice.code if notice else "",
-                "deadline_date": deadline_date.isoformat() if deadline_date else "",
-                "legal_section": legal_section,
-                "amount_claimed": str(amount_claimed) if amount_claimed is not None else "",
-                "confidence": confidence,
-                "ocr_engine": ocr_metadata["ocr_engine"],
-                "ocr_pages_processed": ocr_metadata["ocr_pages_processed"],
-                "ocr_used": ocr_metadata["ocr_used"],
-                "ocr_text_chars": ocr_metadata["ocr_text_chars"],
-                "notice_likelihood_score": notice_likelihood["score"],
-                "notice_likelihood_positive_signals": notice_likelihood["positives"],
-                "notice_likelihood_negative_signals": notice_likelihood["negatives"],
-            }
-
-            ParserExtraction.objects.create(
-                parser_job=parser_job,
-                deadline_date=deadline_date,
-                legal_section=legal_section,
-                amount_claimed=amount_claimed,
-                notice_type_detected=(notice.title if notice else "Unknown")[:120],
-                confidence=confidence,
-                normalized_payload=payload,
-                raw_text_excerpt=raw_text[:1200],
-                review_status="pending" if requires_review else "approved",
+                notice_code=notice_code,
+                ocr_metadata=ocr_metadata,
+                credit_reserved=credit_reserved,
+                credit_reference=credit_reference,
             )
-
-            if credit_reserved:
-                AnalyticsEvent.objects.create(
-                    user=request.user,
-                    session_id=f"parser-{parser_job.id}",
-                    event_name="credit_consumed",
-                    path="/parser/upload",
-                    metadata={"parser_job_id": parser_job.id, "credits_used": 1},
-                )
-
             return Response(ParserJobSerializer(parser_job).data, status=status.HTTP_201_CREATED)
         except Exception as exc:
-            if credit_reserved and not isinstance(exc, NonNoticeDocumentError):
-                with transaction.atomic():
-                    entitlement, _ = UserEntitlement.objects.select_for_update().get_or_create(
-                        user=request.user,
-                        defaults={
-                            "parser_credits": 0,
-                            "lifetime_purchased_credits": 0,
-                            "lifetime_consumed_credits": 0,
-                        },
-                    )
-                    entitlement.parser_credits += 1
-                    if entitlement.lifetime_consumed_credits > 0:
-                        entitlement.lifetime_consumed_credits -= 1
-                    entitlement.save(
-                        update_fields=[
-                            "parser_credits",
-                            "lifetime_consumed_credits",
-                            "updated_at",
-                        ]
-                    )
+            if credit_reserved:
+                # Non-notice files keep the credit charged; any other failure gives it back.
+                settle_credit = consume_parser_credit if isinstance(exc, NonNoticeDocumentError) else refund_parser_credit
+                settle_credit(request.user, reference=credit_reference)
             if isinstance(exc, NonNoticeDocumentError):
                 return Response(
                     {
@@ -419,9 +453,20 @@ class ParserUploadView(APIView):
 
 
 class ParserResultDetailView(generics.RetrieveAPIView):
+    """
+    Parser job detail, also used to poll jobs accepted in async mode.
+    Queued jobs carry a `Retry-After` hint for the next poll.
+    """
+
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ParserJobSerializer
 
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.data.get("status") == "queued":
+            response["Retry-After"] = str(max(int(settings.PARSER_WORKER_POLL_SEC), 1))
+        return response
+
     def get_queryset(self):
         queryset = ParserJob.objects.select_related("notice", "extraction")
         user = self.request.user
@@ -42,27 +42,90 @@ PARSER_PRIVATE_BETA_ENABLED = os.getenv("PARSER_PRIVATE_BETA_ENABLED", "false").
 PARSER_REVIEW_THRESHOLD = float(os.getenv("PARSER_REVIEW_THRESHOLD", "0.75"))
 PARSER_EPHEMERAL_TTL_HOURS = int(os.getenv("PARSER_EPHEMERAL_TTL_HOURS", "1"))
 PARSER_MAX_UPLOAD_MB = int(os.getenv("PARSER_MAX_UPLOAD_MB", "10"))
+PARSER_ASYNC_ENABLED = os.getenv("PARSER_ASYNC_ENABLED", "false").lower() in ("true", "1", "yes")
+PARSER_WORKER_CONCURRENCY = int(os.getenv("PARSER_WORKER_CONCURRENCY", "2"))
+PARSER_WORKER_POLL_SEC = float(os.getenv("PARSER_WORKER_POLL_SEC", "2"))
+PARSER_JOB_LEASE_SEC = int(os.getenv("PARSER_JOB_LEASE_SEC", "300"))
+PARSER_JOB_MAX_ATTEMPTS = int(os.getenv("PARSER_JOB_MAX_ATTEMPTS", "3"))
+NOTICE_INDEX_TTL_SEC = int(os.getenv("NOTICE_INDEX_TTL_SEC", "300"))
 OCR_ENABLED = os.getenv("OCR_ENABLED", "false").lower() in ("true", "1", "yes")
 OCR_PROVIDER = os.getenv("OCR_PROVIDER", "azure_vision").strip().lower()
 GOOGLE_VISION_API_KEY = os.getenv("GOOGLE_VISION_API_KEY", "").strip()
+GOOGLE_VISION_ENDPOINT = os.getenv("GOOGLE_VISION_ENDPOINT", "https://vision.googleapis.com/v1/images:annotate").strip()
 AZURE_VISION_API_KEY = os.getenv("AZURE_VISION_API_KEY", "").strip()
 AZURE_VISION_ENDPOINT = os.getenv("AZURE_VISION_ENDPOINT", "").strip().rstrip("/")
 OCR_MAX_PAGES = int(os.getenv("OCR_MAX_PAGES", "3"))
 OCR_MIN_TEXT_CHARS = int(os.getenv("OCR_MIN_TEXT_CHARS", "80"))
 OCR_REQUEST_TIMEOUT_SEC = int(os.getenv("OCR_REQUEST_TIMEOUT_SEC", "20"))
+OCR_PAGE_CONCURRENCY = int(os.getenv("OCR_PAGE_CONCURRENCY", "3"))
+OCR_DOCUMENT_DEADLINE_SEC = int(os.getenv("OCR_DOCUMENT_DEADLINE_SEC", "45"))
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+OCR_CACHE_TTL_HOURS = int(os.getenv("OCR_CACHE_TTL_HOURS", str(PARSER_EPHEMERAL_TTL_HOURS)))
+# Total cached text (characters) kept before least recently used entries are evicted.
+OCR_CACHE_MAX_CHARS = int(os.getenv("OCR_CACHE_MAX_CHARS", "10000000"))
+OCR_CACHE_MAINTENANCE_INTERVAL_SEC = int(os.getenv("OCR_CACHE_MAINTENANCE_INTERVAL_SEC", "60"))
+# "single" uses OCR_PROVIDER only; "hedged" also sends pages that OCR_PROVIDER has not answered
+# within its observed OCR_HEDGE_PERCENTILE latency to OCR_SECONDARY_PROVIDER (default: the other one).
+OCR_ROUTING = os.getenv("OCR_ROUTING", "single").strip().lower()
+OCR_SECONDARY_PROVIDER = os.getenv("OCR_SECONDARY_PROVIDER", "").strip().lower()
+OCR_HEDGE_PERCENTILE = float(os.getenv("OCR_HEDGE_PERCENTILE", "0.9"))
+OCR_HEDGE_MIN_SAMPLES = int(os.getenv("OCR_HEDGE_MIN_SAMPLES", "20"))
+OCR_HEDGE_DELAY_SEC = float(os.getenv("OCR_HEDGE_DELAY_SEC", "4"))
+# Scanned PDFs go to Azure Read as one multi-page operation; page rasterization is the fallback
+# (and the only path for Google Vision, whose images:annotate endpoint does not take PDFs).
+OCR_PDF_NATIVE_ENABLED = os.getenv("OCR_PDF_NATIVE_ENABLED", "true").lower() in ("true", "1", "yes")
 ASSISTED_OFFER_ENABLED = os.getenv("ASSISTED_OFFER_ENABLED", "true").lower() in ("true", "1", "yes")
 ASSISTED_OFFER_DEFAULT_KEY = os.getenv("ASSISTED_OFFER_DEFAULT_KEY", "assisted_response_pack_v1")
 ASSISTED_OFFER_TARGET_SEVERITY = os.getenv("ASSISTED_OFFER_TARGET_SEVERITY", "high").strip().lower()
+ANALYTICS_ROLLUP_BATCH_SIZE = int(os.getenv("ANALYTICS_ROLLUP_BATCH_SIZE", "5000"))
+ANALYTICS_ROLLUP_LAG_SEC = int(os.getenv("ANALYTICS_ROLLUP_LAG_SEC", "5"))
+ANALYTICS_ROLLUP_READ_BATCHES = int(os.getenv("ANALYTICS_ROLLUP_READ_BATCHES", "4"))
+ANALYTICS_EXACT_DISTINCT = os.getenv("ANALYTICS_EXACT_DISTINCT", "false").lower() in ("true", "1", "yes")
+ANALYTICS_BATCH_MAX_EVENTS = int(os.getenv("ANALYTICS_BATCH_MAX_EVENTS", "100"))
+CSV_EXPORT_CHUNK_SIZE = int(os.getenv("CSV_EXPORT_CHUNK_SIZE", "500"))
+CSV_EXPORT_GZIP = os.getenv("CSV_EXPORT_GZIP", "true").lower() in ("true", "1", "yes")
 PUBLIC_SITE_URL = os.getenv("PUBLIC_SITE_URL", "").strip().rstrip("/")
 CASHFREE_APP_ID = os.getenv("CASHFREE_APP_ID", "").strip()
 CASHFREE_SECRET_KEY = os.getenv("CASHFREE_SECRET_KEY", "").strip()
 CASHFREE_ENV = os.getenv("CASHFREE_ENV", "sandbox").strip().lower()
 CASHFREE_WEBHOOK_SECRET = os.getenv("CASHFREE_WEBHOOK_SECRET", "").strip()
 CASHFREE_RETURN_URL = os.getenv("CASHFREE_RETURN_URL", "").strip()
+CASHFREE_API_BASE_URL = os.getenv("CASHFREE_API_BASE_URL", "").strip()
 RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "").strip()
 RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "").strip()
 RAZORPAY_WEBHOOK_SECRET = os.getenv("RAZORPAY_WEBHOOK_SECRET", "").strip()
+RAZORPAY_API_BASE_URL = os.getenv("RAZORPAY_API_BASE_URL", "").strip()
 PAYMENT_PROVIDER_DEFAULT = os.getenv("PAYMENT_PROVIDER_DEFAULT", "cashfree").strip().lower()
+PAYMENT_PROVIDER_TIMEOUT_SEC = int(os.getenv("PAYMENT_PROVIDER_TIMEOUT_SEC", "15"))
+# Fast-ack webhooks: store the verified payload and let apply_payment_webhooks grant credits.
+PAYMENT_WEBHOOK_ASYNC_ENABLED = os.getenv("PAYMENT_WEBHOOK_ASYNC_ENABLED", "false").lower() in ("true", "1", "yes")
+PAYMENT_WEBHOOK_BATCH_SIZE = int(os.getenv("PAYMENT_WEBHOOK_BATCH_SIZE", "50"))
+PAYMENT_WEBHOOK_POLL_SEC = float(os.getenv("PAYMENT_WEBHOOK_POLL_SEC", "1"))
+PAYMENT_WEBHOOK_LEASE_SEC = int(os.getenv("PAYMENT_WEBHOOK_LEASE_SEC", "120"))
+PAYMENT_WEBHOOK_MAX_ATTEMPTS = int(os.getenv("PAYMENT_WEBHOOK_MAX_ATTEMPTS", "5"))
+# reconcile_payment_orders asks the provider about payment_pending orders older than this.
+PAYMENT_RECONCILE_STALE_MINUTES = int(os.getenv("PAYMENT_RECONCILE_STALE_MINUTES", "30"))
+PAYMENT_RECONCILE_CONCURRENCY = int(os.getenv("PAYMENT_RECONCILE_CONCURRENCY", "4"))
+PAYMENT_RECONCILE_RATE_PER_SEC = float(os.getenv("PAYMENT_RECONCILE_RATE_PER_SEC", "5"))
+PAYMENT_RECONCILE_BATCH_SIZE = int(os.getenv("PAYMENT_RECONCILE_BATCH_SIZE", "100"))
+GOOGLE_AUTH_TIMEOUT_SEC = int(os.getenv("GOOGLE_AUTH_TIMEOUT_SEC", "8"))
+NOTICE_SOURCE_CHECK_TIMEOUT_SEC = int(os.getenv("NOTICE_SOURCE_CHECK_TIMEOUT_SEC", "15"))
+NOTICE_SOURCE_CHECK_CONCURRENCY = int(os.getenv("NOTICE_SOURCE_CHECK_CONCURRENCY", "8"))
+NOTICE_SOURCE_PER_HOST_CONCURRENCY = int(os.getenv("NOTICE_SOURCE_PER_HOST_CONCURRENCY", "2"))
+NOTICE_SOURCE_HOST_DELAY_SEC = float(os.getenv("NOTICE_SOURCE_HOST_DELAY_SEC", "1.0"))
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_RETRY_BACKOFF_SEC = float(os.getenv("HTTP_RETRY_BACKOFF_SEC", "0.5"))
+# Circuit breakers / bulkheads for OCR and payment providers (see complia_backend/circuit_breakers.py).
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() in ("true", "1", "yes")
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+CIRCUIT_BREAKER_SLOW_CALL_SEC = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SEC", "10"))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+CIRCUIT_BREAKER_WINDOW = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20"))
+CIRCUIT_BREAKER_OPEN_SEC = float(os.getenv("CIRCUIT_BREAKER_OPEN_SEC", "30"))
+CIRCUIT_BREAKER_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "2"))
+PROVIDER_BULKHEAD_MAX_CONCURRENT = int(os.getenv("PROVIDER_BULKHEAD_MAX_CONCURRENT", "8"))
+PROVIDER_BULKHEAD_WAIT_SEC = float(os.getenv("PROVIDER_BULKHEAD_WAIT_SEC", "2"))
 TEST_PAYMENT_API_ENABLED = os.getenv("TEST_PAYMENT_API_ENABLED", "false").lower() in ("true", "1", "yes")
 
 
@@ -187,8 +250,10 @@ REST_FRAMEWORK = {
         "anon": "100/hour",
         "user": "1000/hour",
         "feedback": "30/hour",
+        "notice_suggest": "1800/hour",
         "ca_help": "20/hour",
         "analytics_event": "300/hour",
+        "analytics_event_batch": "360/hour",
         "assisted_intent": "40/hour",
         "experiment_exposure": "100/hour",
         "parser_upload": "20/hour",
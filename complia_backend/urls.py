@@ -6,6 +6,7 @@ from rest_framework_simplejwt.views import (
 )
 from complia_backend.notices.views import (
     FeedbackViewSet,
+    NoticeSuggestView,
     NoticeTypeViewSet,
     ParserResultDetailView,
     ParserUploadView,
@@ -20,6 +21,7 @@ from complia_backend.seo import robots_txt, sitemap_xml
 from accounts.views import (
     AssistedOfferConfigView,
     AssistedIntentCreateView,
+    AnalyticsEventBatchCreateView,
     AnalyticsEventCreateView,
     CashfreeWebhookView,
     CAHelpRequestCreateView,
@@ -38,6 +40,7 @@ from accounts.views import (
     SuperAdminCAHelpRequestViewSet,
     SuperAdminCsvExportView,
     SuperAdminFunnelView,
+    SuperAdminOutboundHttpMetricsView,
     SuperAdminKpiView,
     SuperAdminMetricsView,
     SuperAdminPaymentOrderViewSet,
@@ -67,6 +70,8 @@ urlpatterns = [
     
     # API v1 Namespace
     path('api/v1/', include([
+        # Before the router, whose notice detail route would otherwise claim code "suggest".
+        path('notices/suggest/', NoticeSuggestView.as_view(), name='notice-suggest'),
         path('', include(router_v1.urls)),
         path('ca-help/', CAHelpRequestCreateView.as_view(), name='ca-help-create'),
         path('ca-help/my/', MyCAHelpRequestListView.as_view(), name='ca-help-my-list'),
@@ -83,8 +88,10 @@ urlpatterns = [
         path('parser/upload/', ParserUploadView.as_view(), name='parser-upload'),
         path('parser/results/<int:pk>/', ParserResultDetailView.as_view(), name='parser-result-detail'),
         path('analytics/events/', AnalyticsEventCreateView.as_view(), name='analytics-event-create'),
+        path('analytics/events/batch/', AnalyticsEventBatchCreateView.as_view(), name='analytics-event-batch-create'),
         path('admin/metrics/', SuperAdminMetricsView.as_view(), name='superadmin-metrics'),
         path('admin/funnel/', SuperAdminFunnelView.as_view(), name='superadmin-funnel'),
+        path('admin/outbound-http/', SuperAdminOutboundHttpMetricsView.as_view(), name='superadmin-outbound-http'),
         path('admin/kpis/', SuperAdminKpiView.as_view(), name='superadmin-kpis'),
         path('admin/exports/<str:report_key>/', SuperAdminCsvExportView.as_view(), name='superadmin-export-csv'),
         path('admin/', include(admin_router_v1.urls)),
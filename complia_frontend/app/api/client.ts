@@ -1,4 +1,4 @@
-import type { NoticeType } from "../types/notice";
+import type { NoticeSuggestion, NoticeType } from "../types/notice";
 
 const isProdBuild = import.meta.env.PROD;
 const fallbackApi = isProdBuild ? "https://complia-mzrq.onrender.com/api/v1" : "http://127.0.0.1:8001/api/v1";
@@ -613,6 +613,15 @@ export async function searchNotices(query: string): Promise<NoticeType[]> {
   throw new Error("Unexpected search response format");
 }
 
+export async function suggestNotices(query: string, signal?: AbortSignal): Promise<NoticeSuggestion[]> {
+  const response = await fetch(`${API_BASE}/notices/suggest/?q=${encodeURIComponent(query)}`, { signal });
+  if (!response.ok) {
+    throw new Error(await getApiErrorMessage(response, "Failed to fetch suggestions"));
+  }
+  const data = await response.json();
+  return Array.isArray(data?.results) ? data.results : [];
+}
+
 export async function getNotice(code: string): Promise<NoticeType> {
   const response = await fetch(`${API_BASE}/notices/${code}/`);
   if (!response.ok) {
@@ -811,20 +820,27 @@ export async function confirmTestPayment(payload: PaymentTestConfirmRequest): Pr
   return response.json();
 }
 
-export async function sendAnalyticsEvent(payload: {
-  event_name: string;
-  path?: string;
-  metadata?: Record<string, unknown>;
-  session_id: string;
-}): Promise<void> {
+export async function sendAnalyticsEvents(
+  events: Array<{
+    event_name: string;
+    path?: string;
+    metadata?: Record<string, unknown>;
+    session_id: string;
+  }>,
+  options: { keepalive?: boolean } = {}
+): Promise<void> {
+  if (!events.length) {
+    return;
+  }
   try {
-    await fetch(`${API_BASE}/analytics/events/`, {
+    await fetch(`${API_BASE}/analytics/events/batch/`, {
       method: "POST",
       headers: {
         "Content-Type": "application/json",
         ...getAuthHeaders(),
       },
-      body: JSON.stringify(payload),
+      body: JSON.stringify({ events }),
+      keepalive: options.keepalive,
     });
   } catch {
     // Analytics failures should never block user flow.
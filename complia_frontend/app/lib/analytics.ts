@@ -1,4 +1,4 @@
-import { sendAnalyticsEvent } from "../api/client";
+import { sendAnalyticsEvents } from "../api/client";
 
 type AnalyticsProperties = Record<string, string | number | boolean | null | undefined>;
 
@@ -45,6 +45,44 @@ declare global {
   }
 }
 
+type QueuedAnalyticsEvent = Parameters<typeof sendAnalyticsEvents>[0][number];
+
+const FLUSH_INTERVAL_MS = 5000;
+const MAX_BATCH_SIZE = 25;
+
+let queuedEvents: QueuedAnalyticsEvent[] = [];
+let flushTimer: number | undefined;
+let unloadListenerRegistered = false;
+
+function flushAnalyticsQueue(keepalive = false): void {
+  if (flushTimer !== undefined) {
+    window.clearTimeout(flushTimer);
+    flushTimer = undefined;
+  }
+  while (queuedEvents.length) {
+    const batch = queuedEvents.slice(0, MAX_BATCH_SIZE);
+    queuedEvents = queuedEvents.slice(MAX_BATCH_SIZE);
+    void sendAnalyticsEvents(batch, { keepalive });
+  }
+}
+
+function enqueueServerEvent(event: QueuedAnalyticsEvent): void {
+  queuedEvents.push(event);
+  if (!unloadListenerRegistered) {
+    unloadListenerRegistered = true;
+    document.addEventListener("visibilitychange", () => {
+      if (document.visibilityState === "hidden") {
+        flushAnalyticsQueue(true);
+      }
+    });
+  }
+  if (queuedEvents.length >= MAX_BATCH_SIZE) {
+    flushAnalyticsQueue();
+  } else if (flushTimer === undefined) {
+    flushTimer = window.setTimeout(() => flushAnalyticsQueue(), FLUSH_INTERVAL_MS);
+  }
+}
+
 function analyticsEnabled(): boolean {
   if (import.meta.env.VITE_ENABLE_ANALYTICS === "true") {
     return true;
@@ -80,7 +118,7 @@ export function trackEvent(eventName: string, properties: AnalyticsProperties =
     }
 
     if (SERVER_TRACKED_EVENTS.has(eventName)) {
-      void sendAnalyticsEvent({
+      enqueueServerEvent({
         event_name: eventName,
         path: window.location.pathname,
         metadata: properties,
@@ -1,9 +1,10 @@
 import { useEffect, useState } from "react";
 import { Form, Link, useNavigation, useNavigate } from "react-router";
 
-import { searchNotices } from "../api/client";
+import { searchNotices, suggestNotices } from "../api/client";
 import { trackEvent } from "../lib/analytics";
 import BrandMark from "../lib/brand_mark";
+import type { NoticeSuggestion } from "../types/notice";
 import {
   absoluteSiteUrl,
   DEFAULT_OG_IMAGE_URL,
@@ -70,6 +71,7 @@ export default function Home({ loaderData }: Route.ComponentProps) {
   const navigation = useNavigation();
   const navigate = useNavigate();
   const [searchTerm, setSearchTerm] = useState(query || "");
+  const [suggestions, setSuggestions] = useState<NoticeSuggestion[]>([]);
   const [user, setUser] = useState<{ email: string; user_type?: string } | null>(null);
   const [mobileMenuOpen, setMobileMenuOpen] = useState(false);
   const isSearchNavigation =
@@ -88,6 +90,24 @@ export default function Home({ loaderData }: Route.ComponentProps) {
     }
   }, []);
 
+  useEffect(() => {
+    const term = searchTerm.trim();
+    if (term.length < 2) {
+      setSuggestions([]);
+      return;
+    }
+    const controller = new AbortController();
+    const timer = window.setTimeout(() => {
+      suggestNotices(term, controller.signal)
+        .then(setSuggestions)
+        .catch(() => setSuggestions([]));
+    }, 120);
+    return () => {
+      window.clearTimeout(timer);
+      controller.abort();
+    };
+  }, [searchTerm]);
+
   useEffect(() => {
     if (!query || isSearchNavigation) {
       return;
@@ -362,7 +382,15 @@ export default function Home({ loaderData }: Route.ComponentProps) {
                 placeholder="Try GST-DRC-01, ASMT-10, Scrutiny, Section 143"
                 className="h-13 w-full rounded-2xl border border-slate-200 bg-slate-50 pl-12 pr-4 text-[15px] font-medium text-slate-900 outline-none transition focus:border-indigo-300 focus:bg-white focus:ring-4 focus:ring-indigo-100"
                 autoComplete="off"
+                list="notice-suggestions"
               />
+              <datalist id="notice-suggestions">
+                {suggestions.map((item) => (
+                  <option key={item.code} value={item.code}>
+                    {item.title}
+                  </option>
+                ))}
+              </datalist>
             </label>
 
             <button
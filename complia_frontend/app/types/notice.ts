@@ -19,6 +19,8 @@ export interface NoticeType {
     updated_at: string;
 }
 
+export type NoticeSuggestion = Pick<NoticeType, 'code' | 'title' | 'severity'>;
+
 export interface SearchResponse {
     results: NoticeType[];
 }